@@ -0,0 +1,53 @@
+## Wall-clock time to read the AHT20, APDS9960 and encoder, before and after
+## pipelining: one after another through the drivers, then with acquisition.py
+## cycles that hold the bus once and leave the AHT20 converting between cycles.
+import time
+import board
+import busio
+from adafruit_apds9960.apds9960 import APDS9960
+from adafruit_seesaw.seesaw import Seesaw
+from aht20_reader import AHT20Reader
+from encoder_service import EncoderService
+from acquisition import Acquisition
+
+ROUNDS = 20
+CYCLE_INTERVAL = 0.1       # Time left to the other tasks between cycles
+
+i2c = busio.I2C(board.SCL, board.SDA)
+sensor = AHT20Reader(i2c)
+apds = APDS9960(i2c)
+apds.enable_color = True
+seesaw = Seesaw(i2c, addr=0x36)
+knob = EncoderService(seesaw)      # No INT pin: the encoder is read every cycle
+
+def ms(seconds):
+    return f"{seconds * 1000:6.1f} ms"
+
+# === Before: one sensor after the other ===
+worst = total = 0.0
+for i in range(ROUNDS):
+    start = time.monotonic()
+    sensor.measure()
+    apds.color_data
+    seesaw.encoder_delta()
+    elapsed = time.monotonic() - start
+    total += elapsed
+    worst = max(worst, elapsed)
+print(f"Sequential: mean {ms(total / ROUNDS)}  max {ms(worst)} per round, blocking")
+
+# === After: pipelined cycles ===
+acquisition = Acquisition(i2c, sensor, knob)
+worst = total = 0.0
+frames = 0
+for i in range(ROUNDS):
+    start = time.monotonic()
+    snapshot = acquisition.cycle(start, climate=True, light=True)
+    elapsed = time.monotonic() - start
+    total += elapsed
+    worst = max(worst, elapsed)
+    if snapshot is not None and snapshot.climate_fresh:
+        frames += 1
+    time.sleep(CYCLE_INTERVAL)
+print(f"Pipelined:  mean {ms(total / ROUNDS)}  max {ms(worst)} per cycle, "
+      f"{frames} AHT20 frames in {ROUNDS} cycles")
+print(acquisition.report())
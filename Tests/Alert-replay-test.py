@@ -0,0 +1,146 @@
+## Host test for alert_machine: recorded sessions (time, temperature, setpoint)
+## are replayed through the old stateless rule and through AlertMachine.
+## The machine must change state far less often on the hunting thermostat,
+## always be DANGEROUS at 95 °C and never step down before a state's hold time.
+## Losing the sensor while DANGEROUS must keep the danger alarm playing.
+## Then PatternDriver is stepped on fake LEDs: the danger pattern must toggle red every 0.2 s.
+## More traces: tools/saunalog.py sauna.log --csv trace.csv, and add the file to TRACES.
+## Run on the PC: python sim/run.py Tests/Alert-replay-test.py
+import csv
+import os
+from alert_machine import (AlertMachine, PatternDriver, PATTERNS, STATES, SAFE, WARNING,
+                           DANGEROUS, STATE_NAMES, CRITICAL_TEMPERATURE, RED, NO_READING)
+
+HERE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "traces")
+TRACES = [os.path.join(HERE, "thermostat_hunting.csv"),
+          os.path.join(HERE, "evening_session.csv")]
+HUNTING_RATIO = 10         # The machine must change state at least 10x less often
+
+
+def load(path):
+    with open(path, newline="") as f:
+        return [(float(row["time"]), float(row["temperature"]), float(row["setpoint"]))
+                for row in csv.DictReader(f)]
+
+
+def stateless(temperature, target):
+    """The rule AlertMachine replaced: every sample decides the state on its own."""
+    if temperature >= CRITICAL_TEMPERATURE:
+        return DANGEROUS
+    if temperature - target > 10:
+        return WARNING
+    return SAFE
+
+
+def replay(samples):
+    """Returns (old changes, machine changes, list of problems)."""
+    problems = []
+    machine = AlertMachine()
+    old = None
+    old_changes = 0
+    for now, temperature, target in samples:
+        state = stateless(temperature, target)
+        if old is not None and state != old:
+            old_changes += 1
+        old = state
+        before, entered = machine.state, machine.entered_at
+        machine.update(now, temperature, target)
+        if temperature >= CRITICAL_TEMPERATURE and machine.state != DANGEROUS:
+            problems.append(f"{now:.0f} s: {temperature} °C but {STATE_NAMES[machine.state]}")
+        if machine.state < before and now - entered < STATES[before][1]:
+            problems.append(f"{now:.0f} s: left {STATE_NAMES[before]} after "
+                            f"{now - entered:.0f} s, before its hold")
+    return old_changes, machine.changes, problems
+
+
+def check_lost_reading(samples):
+    """Replays up to the first DANGEROUS sample, then the sensor stops answering for 2 minutes."""
+    problems = []
+    machine = AlertMachine()
+    player = FakePlayer()
+    driver = PatternDriver(FakeLed(), FakeLed(), FakeLed(), player,
+                           {name: name for name in ("warning_beep", "danger_alarm")})
+    for now, temperature, target in samples:
+        machine.update(now, temperature, target)
+        driver.show(machine.pattern(now), now)
+        if machine.state == DANGEROUS:
+            break
+    else:
+        return ["the trace never gets DANGEROUS"]
+    for second in range(1, 121):
+        machine.lost_reading(now + second)
+        driver.show(machine.pattern(now + second), now + second)
+        if machine.state != DANGEROUS or player.playing != "danger_alarm":
+            problems.append(f"{second} s without a reading: {STATE_NAMES[machine.state]}, "
+                            f"{driver.name!r} playing {player.playing!r}")
+            break
+    machine = AlertMachine()
+    machine.lost_reading(0.0)
+    if machine.state != WARNING or machine.pattern(0.0) != NO_READING:
+        problems.append(f"lost reading while SAFE: {STATE_NAMES[machine.state]}, "
+                        f"{machine.pattern(0.0)!r}")
+    return problems
+
+
+class FakeLed:
+    def __init__(self):
+        self.value = False
+
+
+class FakePlayer:
+    def __init__(self):
+        self.playing = None
+
+    def play(self, melody, priority, loop=False, volume=None):
+        self.playing = melody
+
+    def stop(self, min_priority=None):
+        self.playing = None
+
+
+def check_driver():
+    """Steps the danger pattern by hand; tick() must return the 0.2 s steps."""
+    problems = []
+    red = FakeLed()
+    player = FakePlayer()
+    melodies = {name: name for name in ("warning_beep", "danger_alarm")}
+    driver = PatternDriver(FakeLed(), FakeLed(), red, player, melodies)
+    driver.show("danger", 0.0)
+    if player.playing != "danger_alarm":
+        problems.append(f"danger plays {player.playing!r}")
+    now = 0.0
+    last = None
+    for _ in range(10):
+        delay = driver.tick(now)
+        if red.value == last:
+            problems.append(f"{now:.1f} s: red did not toggle")
+        if abs(delay - PATTERNS["danger"][0][0][0]) > 1e-6:
+            problems.append(f"{now:.1f} s: next step in {delay:.3f} s")
+        last = red.value
+        now += delay
+    driver.band = RED
+    driver.show("safe", now)
+    if player.playing is not None or driver.tick(now) <= 0:
+        problems.append("safe did not stop the alarm")
+    return problems
+
+
+ok = True
+for path in TRACES:
+    old_changes, changes, problems = replay(load(path))
+    name = os.path.basename(path)
+    print(f"{name}: stateless rule {old_changes} state changes, AlertMachine {changes}")
+    if "hunting" in name and changes * HUNTING_RATIO > old_changes:
+        problems.append(f"only {old_changes / max(changes, 1):.1f}x fewer changes")
+    for problem in problems[:5]:
+        print("  ", problem)
+    ok = ok and not problems
+
+problems = check_lost_reading(load(TRACES[0]))
+print(f"Lost reading while DANGEROUS: {'ok' if not problems else problems}")
+ok = ok and not problems
+
+problems = check_driver()
+print(f"PatternDriver: {'ok' if not problems else problems}")
+ok = ok and not problems
+print("PASS" if ok else "FAIL")
@@ -0,0 +1,107 @@
+## Heap test for the display path: 10,000 refreshes through display_format and
+## ShadowDisplay.print_bytes(), timed by the profiler like display_task(), must not
+## allocate. The f-string path is shown for comparison.
+## On the PC (python sim/run.py Tests/Display-heap-test.py) tracemalloc stands in for
+## gc.mem_alloc(). CPython boxes every int and float it computes, so there only what the
+## refresh path keeps is counted: a leak fails, a short-lived object does not.
+import gc
+import os
+import time
+import board
+import busio
+import adafruit_ht16k33
+from adafruit_ht16k33.segments import Seg14x4
+from segment_display import ShadowDisplay
+from profiler import Profiler
+import display_format
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+REFRESHES = 10000
+HOST_SLACK = 256           # Bytes: counters replaced by bigger ints, not a per-refresh leak
+KIND = "allocated" if hasattr(gc, "mem_alloc") else "kept"
+F_STRING_REFRESHES = 200   # With the GC off, 10,000 of these would run out of heap
+
+i2c = busio.I2C(board.SCL, board.SDA)
+display = ShadowDisplay(Seg14x4(i2c, auto_write=False))
+text = display_format.new_buffer()
+profiler = Profiler(dump_every=0)
+PROFILE_DISPLAY = profiler.stage("display")
+
+ON_DEVICE = hasattr(gc, "mem_alloc")
+if not ON_DEVICE and tracemalloc is None:
+    print("Needs gc.mem_alloc() (CircuitPython) or tracemalloc (CPython)")
+    raise SystemExit
+
+def allocated(refresh, count):
+    """Bytes allocated by count calls of refresh(i), with the GC off."""
+    if not ON_DEVICE:
+        return retained(refresh, count)
+    gc.collect()
+    gc.disable()
+    before = gc.mem_alloc()
+    for i in range(count):
+        refresh(i)
+    after = gc.mem_alloc()
+    gc.enable()
+    return after - before
+
+def retained(refresh, count):
+    """
+    CPython: bytes still held after count calls of refresh(i), allocated
+    in the display modules and the HT16K33 driver (not the simulator).
+    """
+    filters = [tracemalloc.Filter(True, os.path.dirname(display_format.__file__) + "/*"),
+               tracemalloc.Filter(True, os.path.dirname(adafruit_ht16k33.__file__) + "/*")]
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot().filter_traces(filters)
+    for i in range(count):
+        refresh(i)
+    gc.collect()
+    after = tracemalloc.take_snapshot().filter_traces(filters)
+    tracemalloc.stop()
+    return sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+def formatted(i):
+    start = profiler.start()
+    mode = i % 4
+    if mode == 0:
+        display_format.write_label(text, 0x54, 60 + i % 40)
+    elif mode == 1:
+        display_format.write_label(text, 0x48, i % 100)
+    elif mode == 2:
+        display_format.write_minutes_seconds(text, i)
+    else:
+        display_format.write_label(text, 0x53, 80)
+    display.print_bytes(text)
+    profiler.stop(PROFILE_DISPLAY, start)
+
+def f_strings(i):
+    mode = i % 4
+    if mode == 0:
+        display.print(f"T{60 + i % 40:>3}")
+    elif mode == 1:
+        display.print(f"H{i % 100:>3}")
+    elif mode == 2:
+        display.print(f"{i // 60:>2}{i % 60:02}")
+    else:
+        display.print(f"S{80:>3}")
+
+formatted(0)   # Warm up the I2C path once
+start = time.monotonic()
+growth = allocated(formatted, REFRESHES)
+seconds = time.monotonic() - start
+print(f"display_format: {growth} bytes {KIND} in {REFRESHES} refreshes ({seconds:.1f} s)")
+
+growth_f = allocated(f_strings, F_STRING_REFRESHES)
+print(f"f-strings:      {growth_f} bytes {KIND} in {F_STRING_REFRESHES} refreshes "
+      f"(~{growth_f * REFRESHES // F_STRING_REFRESHES} bytes per {REFRESHES})")
+
+if ON_DEVICE:
+    print("PASS" if growth == 0 else "FAIL: the display path allocates")
+else:
+    print("PASS" if growth <= HOST_SLACK else "FAIL: the display path keeps allocations")
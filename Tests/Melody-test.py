@@ -0,0 +1,72 @@
+## Compares the tuple melodies in melodies.py with the packed tables in melodies.bin:
+## heap used to hold them, and time spent per note (plays silently, duty cycle 0).
+## Rebuild melodies.bin with tools/compile_melodies.py after changing melodies.py
+import gc
+import time
+import board
+import pwmio
+from melody import MelodyPlayer
+from melody_table import MelodyTable
+
+buzzer = pwmio.PWMOut(board.A1, duty_cycle=0, frequency=440, variable_frequency=True)
+
+def mem_free():
+    gc.collect()
+    return gc.mem_free() if hasattr(gc, "mem_free") else 0
+
+# === Heap used by the melody data ===
+free = mem_free()
+import melodies
+tuple_bytes = free - mem_free()
+
+free = mem_free()
+table = MelodyTable()
+packed_bytes = free - mem_free()
+
+print(f"Heap: tuples {tuple_bytes} bytes, packed {packed_bytes} bytes")
+
+# === Time per note ===
+def report(label, costs, allocated):
+    costs.sort()
+    mean = sum(costs) / len(costs)
+    print(f"{label}: {len(costs)} notes, mean {mean / 1000:.0f} us, "
+          f"median {costs[len(costs) // 2] / 1000:.0f} us, max {costs[-1] / 1000:.0f} us, "
+          f"heap used {allocated} bytes")
+
+# Old way: dict lookup per (str, float) tuple
+costs = [0] * len(melodies.levels)
+free = mem_free()
+for i, (note, duration) in enumerate(melodies.levels):
+    start = time.monotonic_ns()
+    if note != "R":
+        buzzer.frequency = melodies.notes[note]
+    buzzer.duty_cycle = 0
+    costs[i] = time.monotonic_ns() - start
+report("Tuples", costs, free - mem_free())
+
+# Packed: index into the uint16 tables
+levels = table["levels"]
+costs = [0] * len(levels)
+free = mem_free()
+for i in range(len(levels)):
+    start = time.monotonic_ns()
+    frequency = levels.frequencies[levels.start + i]
+    if frequency:
+        buzzer.frequency = frequency
+    buzzer.duty_cycle = 0
+    costs[i] = time.monotonic_ns() - start
+report("Packed", costs, free - mem_free())
+
+# The whole MelodyPlayer.tick(), woken exactly when the next note is due
+costs = [0] * (len(levels) + 1)
+player = MelodyPlayer(buzzer, gap=0)
+player.play(levels, volume=0)
+free = mem_free()
+i = 0
+while player.playing:
+    start = time.monotonic_ns()
+    delay = player.tick()
+    costs[i] = time.monotonic_ns() - start
+    i += 1
+    time.sleep(delay)
+report("Player", costs[:i], free - mem_free())
@@ -0,0 +1,57 @@
+## Host test for session_stats: a simulated session with irregular sample times
+## is fed to SessionStats and the results are compared with NumPy on the whole arrays.
+## Run on the PC: python sim/run.py Tests/Session-stats-test.py (needs numpy)
+import math
+import random
+import numpy as np
+from session_stats import SessionStats
+
+SAMPLES = 20000
+TARGET = 80
+HUMID = 40
+
+random.seed(2)
+times = []
+temperatures = []
+humidities = []
+now = 0.0
+temperature = 20.0
+humidity = 50.0
+for i in range(SAMPLES):
+    now += random.choice((0.5, 0.5, 1.0, 3.0, 7.5, 30.0))
+    temperature += (85 - temperature) * 0.002 + random.gauss(0, 0.2)
+    humidity = max(0.0, humidity + random.gauss(-0.01, 0.8))
+    times.append(now)
+    temperatures.append(temperature)
+    humidities.append(humidity)
+
+stats = SessionStats(TARGET - 3, HUMID)
+for t, temperature, humidity in zip(times, temperatures, humidities):
+    stats.update(t, temperature, humidity)
+print(stats.report())
+
+def expected(values, threshold):
+    """Batch results: each value holds until the next sample."""
+    t = np.array(times)
+    v = np.array(values)
+    held = np.diff(t)
+    return {
+        "mean": v.mean(),
+        "variance": v.var(ddof=1),
+        "minimum": v.min(),
+        "maximum": v.max(),
+        "time_weighted_mean": (v[:-1] * held).sum() / held.sum(),
+        "time_above": held[v[:-1] > threshold].sum(),
+    }
+
+failures = 0
+for name, running, values, threshold in (
+        ("temperature", stats.temperature, temperatures, TARGET - 3),
+        ("humidity", stats.humidity, humidities, HUMID)):
+    for key, value in expected(values, threshold).items():
+        got = getattr(running, key)
+        ok = math.isclose(got, value, rel_tol=1e-9, abs_tol=1e-9)
+        failures += not ok
+        print(f"{name:12} {key:18} {got:14.6f} numpy {value:14.6f} {'ok' if ok else 'MISMATCH'}")
+
+print("PASS" if failures == 0 else f"FAIL: {failures} mismatches")
@@ -0,0 +1,33 @@
+## Watchdog supervisor test. First boot: two tasks check in, "stuck" stops after
+## 5 s, the supervisor records it in NVM and stops feeding, the board resets.
+## After the watchdog reset: prints the record, which must name "stuck".
+## On the board this really resets it. Run on the PC: python sim/run.py Tests/Watchdog-test.py --virtual
+import time
+import asyncio
+import microcontroller
+from watchdog_supervisor import WatchdogSupervisor, CAUSE_MISSED
+
+supervisor = WatchdogSupervisor(nvm_offset=64)   # Not the firmware's record
+print(supervisor.report())
+
+if supervisor.reset_reason == microcontroller.ResetReason.WATCHDOG:
+    ok = supervisor.cause == CAUSE_MISSED and supervisor.task == "stuck"
+    print("PASS" if ok else "FAIL", f"- recorded task {supervisor.task!r}")
+else:
+    ALIVE = supervisor.register("alive", 1.0)
+    STUCK = supervisor.register("stuck", 2.0)
+
+    async def worker(handle, stop_after):
+        start = time.monotonic()
+        while True:
+            now = time.monotonic()
+            if now - start < stop_after:
+                supervisor.checkin(handle, now)
+            await asyncio.sleep(0.1)
+
+    async def main():
+        supervisor.start(time.monotonic())
+        print(f"Watchdog armed, {supervisor.timeout:.0f} s; waiting for the reset")
+        await asyncio.gather(supervisor.run(), worker(ALIVE, 1e9), worker(STUCK, 5.0))
+
+    asyncio.run(main())
@@ -0,0 +1,237 @@
+## This is the fifth test. Same jobs as the fourth test, but the RP2040 light-sleeps between them
+## and the stopwatch button and encoder INT (D5) wake it up
+
+## Changed how warning mode works
+import board
+import busio
+import digitalio
+import pwmio
+from aht20_reader import AHT20Reader
+from adaptive_sampler import AdaptiveSampler
+from encoder_service import EncoderService
+from power_manager import PowerManager
+from adafruit_ht16k33.segments import Seg14x4
+from segment_display import ShadowDisplay
+from adafruit_apds9960.apds9960 import APDS9960
+from adafruit_seesaw.seesaw import Seesaw
+
+# === I2C Bus Setup ===
+i2c = busio.I2C(board.SCL, board.SDA)
+
+# === Sensor Initialization ===
+sensor = AHT20Reader(i2c)                    # Temperature and humidity
+apds = APDS9960(i2c)                         # Light sensor (APDS9960)
+apds.enable_color = True                     # Enable color readings
+
+# === Rotary Encoder Setup (Seesaw I2C, INT on D5) ===
+encoder = Seesaw(i2c, addr=0x36)
+knob = EncoderService(encoder, board.D5)
+
+# === Display Setup (HT16K33) ===
+display = ShadowDisplay(Seg14x4(i2c, auto_write=False))  # Only sends changed bytes
+display.fill(0)
+
+# === LED Setup ===
+green_led = digitalio.DigitalInOut(board.A2)
+green_led.direction = digitalio.Direction.OUTPUT
+yellow_led = digitalio.DigitalInOut(board.A3)
+yellow_led.direction = digitalio.Direction.OUTPUT
+red_led = digitalio.DigitalInOut(board.TX)
+red_led.direction = digitalio.Direction.OUTPUT
+
+# === Buzzer Setup (PWM-controlled passive buzzer) ===
+buzzer = pwmio.PWMOut(board.A1, frequency=400, duty_cycle=0)
+
+# === Stopwatch Button (External button on A0) ===
+# Not claimed here: the PinAlarm watches it while the board sleeps. It wakes
+# on the low level, not the edge, so a press made while awake still wakes the
+# next sleep; while the button is held it is polled instead of armed.
+DEBOUNCE = 0.05            # Level changes closer together than this are contact bounce
+BUTTON_POLL = 0.02
+button_down = False
+last_button_edge = -DEBOUNCE
+
+# === Configuration Parameters ===
+target_temp = 80           # Initial preferred temperature (adjustable via encoder)
+critical_temp = 95         # Absolute upper threshold for "danger"
+STATE_SAFE = 0
+STATE_WARNING = 1
+STATE_DANGEROUS = 2
+current_state = STATE_SAFE
+
+# === Stopwatch State ===
+stopwatch_running = False
+stopwatch_start_time = 0
+stopwatch_elapsed = 0
+
+# === Display Mode State ===
+display_mode = 0           # 0=temp, 1=humidity, 2=stopwatch, 3=set temp
+temperature = None
+humidity = None
+
+# === Helper Functions ===
+
+def get_ambient_light():
+    """Returns ambient light level based on green channel."""
+    try:
+        _, g, _, _ = apds.color_data
+        return g
+    except Exception:
+        return 100  # Fallback value in case of read failure
+
+def set_display_brightness(ambient):
+    """
+    Adjusts display brightness based on ambient light.
+    Maps green channel (0–300) to display brightness (0.1–1.0).
+    """
+    clamped = min(max(ambient, 0), 300)
+    normalized = clamped / 300
+    display.brightness = 0.1 + (normalized * 0.9)
+
+def update_leds(current_temp):
+    """
+    Sets LED color based on how close the current temperature is to the target.
+    Green = optimal range (±3°C)
+    Yellow = within ±10°C
+    Red = further than ±10°C
+    """
+    diff = abs(current_temp - target_temp)
+    green_led.value = yellow_led.value = red_led.value = False
+    if diff <= 3:
+        green_led.value = True
+    elif diff <= 10:
+        yellow_led.value = True
+    else:
+        red_led.value = True
+
+def determine_state(temp):
+    """
+    Returns one of the defined system states:
+    - SAFE: within tolerance
+    - WARNING: more than 10°C above target
+    - DANGEROUS: above critical threshold
+    """
+    if temp >= critical_temp:
+        return STATE_DANGEROUS
+    elif temp - target_temp > 10:
+        return STATE_WARNING
+    else:
+        return STATE_SAFE
+
+def format_seconds(seconds):
+    """Formats a time in seconds as MMSS for the stopwatch display."""
+    mins = int(seconds) // 60
+    secs = int(seconds) % 60
+    return f"{mins:>2}{secs:02}"
+
+
+# === Jobs ===
+power = PowerManager()
+sampler = AdaptiveSampler(min_interval=0.5, max_interval=30.0)  # Decides when to read
+
+def sensor_job(now):
+    """Reads all sensors, returns the delay until the next read."""
+    global temperature, humidity, current_state
+    temperature = sensor.temperature
+    humidity = sensor.relative_humidity
+    set_display_brightness(get_ambient_light())
+    current_state = determine_state(temperature)
+    return sampler.update(now, temperature, humidity)
+
+def display_job(now):
+    """Updates LEDs and display; once per second is enough for the stopwatch."""
+    update_leds(temperature)
+    if display_mode == 0:
+        display.print(f"T{int(temperature):>3}")
+    elif display_mode == 1:
+        display.print(f"H{int(humidity):>3}")
+    elif display_mode == 2:
+        if stopwatch_running:
+            elapsed = stopwatch_elapsed + (now - stopwatch_start_time)
+        else:
+            elapsed = stopwatch_elapsed
+        display.print(format_seconds(elapsed))
+    elif display_mode == 3:
+        display.print(f"S{int(target_temp):>3}")
+    if display_mode == 2 and stopwatch_running:
+        return 1.0 - (now - stopwatch_start_time) % 1.0     # Next full second
+    return None
+
+alert_step = 0
+
+def alert_job(now):
+    """Beeps 0.1 s per second in WARNING and DANGEROUS, sleeps otherwise."""
+    global alert_step
+    if current_state == STATE_SAFE:
+        buzzer.duty_cycle = 0
+        alert_step = 0
+        return None
+    buzzer.duty_cycle = 3000 if alert_step == 0 else 0
+    alert_step = (alert_step + 1) % 10
+    return 0.1 if alert_step == 1 else 0.9
+
+def report_job(now):
+    """Prints the awake/asleep ratio and the reads saved."""
+    print(power.report())
+    print(f"{sampler.reads_saved(now)} sensor reads saved")
+
+power.add_job("sensor", 30.0, sensor_job)
+display_updates = power.add_job("display", 10.0, display_job)   # Redrawn after every input
+power.add_job("alert", 1.0, alert_job)
+power.add_job("report", 60.0, report_job)
+
+# === Wake Pins ===
+
+def button_pressed():
+    """Reads A0 while no alarm holds it; the button pulls it to GND."""
+    pin = digitalio.DigitalInOut(board.A0)
+    pin.switch_to_input(pull=digitalio.Pull.UP)
+    pressed = not pin.value
+    pin.deinit()
+    return pressed
+
+def on_button(now):
+    """Stopwatch button pressed: start or stop, then poll for the release."""
+    global stopwatch_running, stopwatch_start_time, stopwatch_elapsed
+    global button_down, last_button_edge
+    if now - last_button_edge < DEBOUNCE or not button_pressed():
+        return                                  # Bounce of the last release, or a glitch
+    button_down = True
+    last_button_edge = now
+    button_wake.enabled = False                 # The held level would wake it at once
+    power.wake(button_poll)
+    if stopwatch_running:
+        stopwatch_elapsed += now - stopwatch_start_time
+        stopwatch_running = False
+    else:
+        stopwatch_start_time = now
+        stopwatch_running = True
+    power.wake(display_updates)
+
+def button_job(now):
+    """Polls a held button until it has been released for good, then re-arms the wake pin."""
+    global button_down, last_button_edge
+    if not button_down:
+        return None
+    if button_pressed() or now - last_button_edge < DEBOUNCE:
+        return BUTTON_POLL
+    button_down = False
+    last_button_edge = now
+    button_wake.enabled = True
+    return None
+
+def on_encoder(now):
+    """Encoder INT: turn adjusts the set temperature, button cycles the display mode."""
+    global target_temp, display_mode
+    if knob.poll():
+        if knob.delta:
+            target_temp = max(0, min(100, target_temp + knob.delta))
+        if knob.button_changed and knob.pressed:
+            display_mode = (display_mode + 1) % 4
+        power.wake(display_updates)
+
+button_poll = power.add_job("button", 3600.0, button_job)         # Woken by on_button
+button_wake = power.add_wake_pin(board.A0, on_button, value=False, pull=True)
+power.add_wake_pin(board.D5, on_encoder, value=False, pull=True, release=knob.release_int)
+
+power.run()
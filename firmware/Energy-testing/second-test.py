@@ -6,8 +6,9 @@ import board
 import busio
 import digitalio
 import pwmio
-import adafruit_ahtx0
+from aht20_reader import AHT20Reader
 from adafruit_ht16k33.segments import Seg14x4
+from segment_display import ShadowDisplay
 from adafruit_apds9960.apds9960 import APDS9960
 from adafruit_seesaw.seesaw import Seesaw
 import adafruit_seesaw.rotaryio as rotaryio
@@ -16,7 +17,7 @@ import adafruit_seesaw.rotaryio as rotaryio
 i2c = busio.I2C(board.SCL, board.SDA)
 
 # === Sensor Initialization ===
-sensor = adafruit_ahtx0.AHTx0(i2c)           # Temperature and humidity
+sensor = AHT20Reader(i2c)                    # Temperature and humidity
 apds = APDS9960(i2c)                         # Light sensor (APDS9960)
 apds.enable_color = True                     # Enable color readings
 
@@ -28,7 +29,7 @@ encoder.pin_mode(24, encoder.INPUT_PULLUP)   # Enable built-in encoder button
 last_encoder_button = True                   # Previous state of encoder button
 
 # === Display Setup (HT16K33) ===
-display = Seg14x4(i2c)
+display = ShadowDisplay(Seg14x4(i2c, auto_write=False))  # Only sends changed bytes
 display.fill(0)
 
 # === LED Setup ===
@@ -0,0 +1,198 @@
+"""
+Pipelined acquisition cycle for the AHT20, APDS9960 and seesaw encoder.
+
+Read one after another, every AHT20 sample waits ~80 ms for its
+conversion and every seesaw register waits 8 ms between request and
+read. cycle() overlaps them instead, with the bus locked once:
+
+    1. ask the seesaw for the encoder delta (only if its INT is low)
+    2. collect the AHT20 frame triggered by an earlier cycle
+    3. trigger the next AHT20 conversion, if the caller wants a sample
+    4. the same for the zone AHT20s behind the mux, if there are any
+    5. read the APDS9960 clear/red/green/blue registers
+    6. read the encoder delta, its 8 ms mostly spent on 2-5 already
+
+The AHT20 converts between cycles, so nothing waits for it. With zones
+(zone_sensors.py) the climate comes from the reference zone and aht20
+is None. The result
+is one timestamped Snapshot per cycle; the same object is reused, so
+it is only valid until the next cycle.
+
+A failed transfer only costs its own step. Given resilient.Device
+objects, a step is skipped while its device is backing off or being
+re-initialised, and reports ok/failed to it; an AHT20 frame without the
+calibration bit or a conversion that never ends counts as a failure.
+"""
+import time
+from aht20_reader import CONVERSION_TIME, STATUS_CALIBRATED
+
+APDS9960_ADDRESS = 0x39
+APDS9960_CDATAL = 0x94         # clear, red, green, blue, 16 bits each
+BUSY_TIMEOUT = 0.5             # An AHT20 conversion still running after this is a failure
+
+
+class Snapshot:
+    """What one cycle read. *_fresh tells which parts are new."""
+
+    def __init__(self):
+        self.time = 0.0                # time.monotonic() at the start of the cycle
+        self.cycle = 0
+        self.climate_fresh = False
+        self.temperature = None
+        self.humidity = None
+        self.light_fresh = False
+        self.clear = 0
+        self.red = 0
+        self.green = 0
+        self.blue = 0
+        self.encoder_fresh = False     # encoder.delta / button_changed are new
+        self.cycle_us = 0              # Time the bus was held
+
+
+class Acquisition:
+    """
+    One locked bus cycle over the sensors.
+    aht20 is an AHT20Reader or None, encoder an EncoderService or None,
+    zones a ZoneSensors or None. The *_device arguments are the
+    resilient.Device of each, or None to use it unguarded.
+    """
+
+    def __init__(self, i2c, aht20, encoder=None, apds_address=APDS9960_ADDRESS, zones=None,
+                 aht20_device=None, light_device=None, encoder_device=None):
+        self.i2c = i2c
+        self.aht20 = aht20
+        self.encoder = encoder
+        self.zones = zones
+        self.apds_address = apds_address
+        self.aht20_device = aht20_device
+        self.light_device = light_device
+        self.encoder_device = encoder_device
+        self.errors = 0                # Failed steps
+        self.snapshot = Snapshot()
+        self.cycles = 0
+        self.busy = 0                  # Cycles skipped because the bus was locked
+        self.cycle_us_max = 0
+        self._cycle_us_total = 0
+        self._register = bytearray((APDS9960_CDATAL,))
+        self._light = bytearray(8)
+
+    def cycle(self, now, climate=False, light=False):
+        """
+        Runs one cycle: climate=True triggers an AHT20 conversion (read by
+        a later cycle), light=True reads the APDS9960. Returns the Snapshot,
+        or None if there was nothing to do or the bus was busy.
+        """
+        aht20 = self.aht20
+        encoder = self.encoder
+        zones = self.zones
+        collect = trigger = False
+        if aht20 is not None and _available(self.aht20_device, now):
+            collect = aht20.pending and now - aht20.triggered_at >= CONVERSION_TIME
+            trigger = climate and not aht20.pending
+        ask_encoder = (encoder is not None and _available(self.encoder_device, now)
+                       and encoder.pending)
+        light = light and _available(self.light_device, now)
+        ask_zones = zones is not None and zones.due(now, climate)
+        if not (collect or trigger or light or ask_encoder or ask_zones):
+            return None
+        bus = self.i2c
+        try:
+            locked = bus.try_lock()
+        except OSError:                # A ResilientI2C that is down
+            locked = False
+        if not locked:
+            self.busy += 1
+            return None
+        snapshot = self.snapshot
+        snapshot.climate_fresh = False
+        snapshot.light_fresh = False
+        snapshot.encoder_fresh = False
+        start = time.monotonic_ns()
+        try:
+            if ask_encoder:
+                try:
+                    ask_encoder = encoder.request(bus)
+                except OSError as e:
+                    ask_encoder = False
+                    self._failed(self.encoder_device, now, e)
+            if collect or trigger:
+                try:
+                    if collect:
+                        self._collect(aht20, snapshot, now)
+                    if trigger and not aht20.pending:
+                        aht20.trigger(bus)
+                except OSError as e:
+                    aht20.pending = False
+                    self._failed(self.aht20_device, now, e)
+            if ask_zones and zones.cycle(bus, now, climate):
+                reference = zones.reference
+                snapshot.climate_fresh = True
+                snapshot.temperature = reference.temperature
+                snapshot.humidity = reference.humidity
+            if light:
+                try:
+                    bus.writeto_then_readfrom(self.apds_address, self._register, self._light)
+                except OSError as e:
+                    self._failed(self.light_device, now, e)
+                else:
+                    data = self._light
+                    snapshot.clear = data[0] | data[1] << 8
+                    snapshot.red = data[2] | data[3] << 8
+                    snapshot.green = data[4] | data[5] << 8
+                    snapshot.blue = data[6] | data[7] << 8
+                    snapshot.light_fresh = True
+                    _ok(self.light_device, now)
+            if ask_encoder:
+                try:
+                    snapshot.encoder_fresh = encoder.collect(bus)
+                except OSError as e:
+                    self._failed(self.encoder_device, now, e)
+                else:
+                    _ok(self.encoder_device, now)
+        finally:
+            bus.unlock()
+        elapsed = (time.monotonic_ns() - start) // 1000
+        self.cycles += 1
+        snapshot.cycle = self.cycles
+        snapshot.time = now
+        snapshot.cycle_us = elapsed
+        self._cycle_us_total += elapsed
+        if elapsed > self.cycle_us_max:
+            self.cycle_us_max = elapsed
+        return snapshot
+
+    def _collect(self, aht20, snapshot, now):
+        """Reads the pending AHT20 frame into the snapshot if the conversion is done."""
+        bus = self.i2c
+        if not aht20.poll(bus):
+            if now - aht20.triggered_at > BUSY_TIMEOUT:
+                aht20.pending = False
+                self._failed(self.aht20_device, now, "busy")
+            return
+        if not aht20.last_status & STATUS_CALIBRATED:
+            self._failed(self.aht20_device, now, "not calibrated")
+            return
+        snapshot.climate_fresh = True
+        snapshot.temperature = aht20.last_temperature
+        snapshot.humidity = aht20.last_relative_humidity
+        _ok(self.aht20_device, now)
+
+    def _failed(self, device, now, error):
+        self.errors += 1
+        if device is not None:
+            device.failed(now, error)
+
+    def report(self):
+        """One line for the serial console."""
+        mean = self._cycle_us_total // self.cycles if self.cycles else 0
+        return (f"acquisition: {self.cycles} cycles, bus held mean {mean} us "
+                f"max {self.cycle_us_max} us, {self.busy} skipped (bus busy), {self.errors} failed steps")
+
+
+def _available(device, now):
+    return device is None or device.available(now)
+
+
+def _ok(device, now):
+    if device is not None:
+        device.ok(now)
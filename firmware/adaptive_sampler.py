@@ -0,0 +1,83 @@
+"""
+Adaptive sensor cadence driven by how fast the sauna is changing.
+
+A fixed 5 s interval is too slow while the heater ramps or water hits
+the stones, and wasteful once the room has settled. AdaptiveSampler
+tracks the smoothed temperature and humidity slopes and picks the
+interval in which the faster of the two is expected to move by one
+`resolution` step, clamped between min_interval and max_interval.
+"""
+
+
+class AdaptiveSampler:
+    """
+    Decides when the next AHT20 read is due.
+    Shrinks at once on a transient, grows at most `growth` times per sample.
+    """
+
+    def __init__(self, min_interval=0.5, max_interval=30.0,
+                 temp_resolution=0.25, humidity_resolution=1.0,
+                 temp_noise=0.1, humidity_noise=0.5,
+                 growth=1.5, smoothing=0.5, baseline_interval=5.0):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.temp_resolution = temp_resolution            # °C per sample
+        self.humidity_resolution = humidity_resolution    # %RH per sample
+        self.temp_noise = temp_noise                      # Steps below these count as flat
+        self.humidity_noise = humidity_noise
+        self.growth = growth
+        self.smoothing = smoothing                        # EMA weight of the newest slope
+        self.baseline_interval = baseline_interval        # Fixed cadence to compare with
+        self.interval = min_interval
+        self.temp_rate = 0.0          # °C/s, smoothed
+        self.humidity_rate = 0.0      # %RH/s, smoothed
+        self.reads = 0
+        self.first_time = None
+        self.last_time = None
+        self._last_temp = None
+        self._last_humidity = None
+
+    def due(self, now):
+        """True when the next read is due."""
+        return self.last_time is None or now - self.last_time >= self.interval
+
+    def update(self, now, temperature, humidity):
+        """Records a sample and returns the interval until the next one."""
+        self.reads += 1
+        if self.last_time is None:
+            self.first_time = now
+        else:
+            dt = now - self.last_time
+            if dt > 0:
+                d_temp = temperature - self._last_temp
+                d_humidity = humidity - self._last_humidity
+                if abs(d_temp) < self.temp_noise:
+                    d_temp = 0.0
+                if abs(d_humidity) < self.humidity_noise:
+                    d_humidity = 0.0
+                a = self.smoothing
+                self.temp_rate += a * (d_temp / dt - self.temp_rate)
+                self.humidity_rate += a * (d_humidity / dt - self.humidity_rate)
+            self.interval = self._next_interval()
+        self.last_time = now
+        self._last_temp = temperature
+        self._last_humidity = humidity
+        return self.interval
+
+    def _next_interval(self):
+        interval = self.max_interval
+        if self.temp_rate:
+            interval = min(interval, self.temp_resolution / abs(self.temp_rate))
+        if self.humidity_rate:
+            interval = min(interval, self.humidity_resolution / abs(self.humidity_rate))
+        interval = min(interval, self.interval * self.growth)
+        return max(self.min_interval, interval)
+
+    def reads_saved(self, now=None):
+        """Reads avoided compared with a fixed baseline_interval cadence."""
+        if self.first_time is None:
+            return 0
+        if now is None:
+            now = self.last_time
+        fixed = int((now - self.first_time) / self.baseline_interval) + 1
+        return fixed - self.reads
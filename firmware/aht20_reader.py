@@ -0,0 +1,163 @@
+"""
+Split-phase AHT20 reader.
+
+adafruit_ahtx0 triggers a conversion and busy-waits ~80 ms for every
+`temperature` or `relative_humidity` access. This reader separates the
+two halves: `trigger()` starts a conversion and returns immediately,
+`poll()` collects temperature and humidity together from one 6-byte
+frame once the sensor is done.
+
+Both take an optional `bus`, a busio.I2C the caller has already
+locked, so a pipelined cycle (acquisition.py) can batch them with other
+devices' transfers under one lock.
+
+The `temperature` and `relative_humidity` properties keep the AHTx0
+behaviour, so the class is a drop-in replacement in the polling loops.
+Reading both values one after the other costs a single conversion.
+"""
+import time
+from adafruit_bus_device.i2c_device import I2CDevice
+
+AHT20_ADDRESS = 0x38
+CMD_CALIBRATE = 0xBE
+CMD_TRIGGER = 0xAC
+CMD_SOFTRESET = 0xBA
+STATUS_BUSY = 0x80
+STATUS_CALIBRATED = 0x08
+
+CONVERSION_TIME = 0.08     # Datasheet: measurement takes ~80 ms
+
+
+class AHT20Reader:
+    """Non-blocking AHT20 temperature and humidity reader."""
+
+    def __init__(self, i2c, address=AHT20_ADDRESS):
+        time.sleep(0.02)  # 20ms delay to wake up
+        self.i2c_device = I2CDevice(i2c, address)
+        self.address = address
+        self._buf = bytearray(6)
+        self._temp = None
+        self._humidity = None
+        self._temp_fresh = False
+        self._humidity_fresh = False
+        self.pending = False          # A conversion has been triggered
+        self.triggered_at = 0         # time.monotonic() of the last trigger
+        self.measured_at = None       # time.monotonic() of the last frame
+        self.last_status = 0          # Status byte of the last frame
+        self.reset()
+        self.calibrate()
+
+    def reset(self):
+        """Perform a soft-reset of the AHT20."""
+        self._buf[0] = CMD_SOFTRESET
+        with self.i2c_device as i2c:
+            i2c.write(self._buf, start=0, end=1)
+        time.sleep(0.02)
+        self.pending = False
+
+    def calibrate(self):
+        """Load the calibration coefficients, raises RuntimeError on failure."""
+        self._buf[0] = CMD_CALIBRATE
+        self._buf[1] = 0x08
+        self._buf[2] = 0x00
+        with self.i2c_device as i2c:
+            i2c.write(self._buf, start=0, end=3)
+        start = time.monotonic()
+        while self.status & STATUS_BUSY:
+            if time.monotonic() - start > 3.0:
+                raise RuntimeError("AHT20 remained busy 3 seconds")
+            time.sleep(0.01)
+        if not self.status & STATUS_CALIBRATED:
+            raise RuntimeError("Could not calibrate AHT20")
+
+    @property
+    def status(self):
+        """The status byte of the sensor."""
+        with self.i2c_device as i2c:
+            i2c.readinto(self._buf, start=0, end=1)
+        return self._buf[0]
+
+    def trigger(self, bus=None):
+        """Starts a conversion and returns without waiting for it."""
+        self._buf[0] = CMD_TRIGGER
+        self._buf[1] = 0x33
+        self._buf[2] = 0x00
+        if bus is not None:
+            bus.writeto(self.address, self._buf, start=0, end=3)
+        else:
+            with self.i2c_device as i2c:
+                i2c.write(self._buf, start=0, end=3)
+        self.pending = True
+        self.triggered_at = time.monotonic()
+
+    def poll(self, bus=None):
+        """
+        Collects the pending conversion if the sensor has finished it.
+        Returns True when a new frame was read, False while still busy.
+        A single 6-byte read returns the status byte and both values.
+        """
+        if not self.pending:
+            return False
+        if bus is not None:
+            bus.readfrom_into(self.address, self._buf)
+        else:
+            with self.i2c_device as i2c:
+                i2c.readinto(self._buf)
+        if self._buf[0] & STATUS_BUSY:
+            return False
+        self.pending = False
+        self.measured_at = time.monotonic()
+        self.last_status = self._buf[0]
+        self._decode()
+        return True
+
+    def measure(self):
+        """Triggers a conversion and waits for it, like AHTx0 does."""
+        if not self.pending:
+            self.trigger()
+        time.sleep(CONVERSION_TIME)
+        while not self.poll():
+            time.sleep(0.01)
+
+    def _decode(self):
+        buf = self._buf
+        humidity = (buf[1] << 12) | (buf[2] << 4) | (buf[3] >> 4)
+        self._humidity = (humidity * 100) / 0x100000
+        temp = ((buf[3] & 0xF) << 16) | (buf[4] << 8) | buf[5]
+        self._temp = ((temp * 200.0) / 0x100000) - 50
+        self._temp_fresh = True
+        self._humidity_fresh = True
+
+    @property
+    def last_temperature(self):
+        """Temperature of the last collected frame, None before the first."""
+        return self._temp
+
+    @property
+    def last_relative_humidity(self):
+        """Relative humidity of the last collected frame, None before the first."""
+        return self._humidity
+
+    @property
+    def temperature(self):
+        """
+        The measured temperature in degrees Celsius.
+        Uses the latest frame if its temperature has not been read yet,
+        otherwise measures a new one.
+        """
+        if not self._temp_fresh and not self.poll():
+            self.measure()
+        self._temp_fresh = False
+        return self._temp
+
+    @property
+    def relative_humidity(self):
+        """
+        The measured relative humidity in percent.
+        Uses the latest frame if its humidity has not been read yet,
+        otherwise measures a new one.
+        """
+        if not self._humidity_fresh and not self.poll():
+            self.measure()
+        self._humidity_fresh = False
+        return self._humidity
@@ -0,0 +1,196 @@
+"""
+Table-driven alert state machine and its LED/buzzer patterns.
+
+determine_state() used to map every sample straight to a state, so a
+room hovering at target + 10 °C or at the critical temperature flipped
+between SAFE and WARNING on every read. AlertMachine moves only along
+the TRANSITIONS table: each row has its own threshold, so entering and
+leaving a state happen at different temperatures (hysteresis), and a
+condition must hold for `dwell` seconds before the machine moves. A
+state is also kept for at least its `hold` time before it steps down
+to a milder one (never before it gets worse). A state that lasts
+longer than `escalate_after` switches to its escalated pattern.
+
+Each state names a pattern from PATTERNS: LED steps repeated on a
+timer plus the melody the buzzer loops. PatternDriver runs them from
+tick() without ever sleeping, like MelodyPlayer, which plays the sound.
+"""
+import time
+from melody import PRIORITY_WARNING, PRIORITY_DANGER, VOLUME
+
+# === States (the values stored in the session log), mildest first ===
+SAFE = 0
+WARNING = 1
+DANGEROUS = 2
+STATE_NAMES = ("SAFE", "WARNING", "DANGEROUS")
+
+# === Conditions ===
+ABOVE = 0                  # temperature >= threshold
+BELOW = 1                  # temperature < threshold
+ABSOLUTE = False
+RELATIVE = True            # threshold is added to the target temperature
+
+CRITICAL_TEMPERATURE = 95
+
+# Checked in order for the current state; the first one that has held
+# for `dwell` seconds wins. Exits sit 2-3 °C inside the entries.
+#   (from,      to,        test,  threshold,            relative, dwell)
+TRANSITIONS = (
+    (SAFE,      DANGEROUS, ABOVE, CRITICAL_TEMPERATURE, ABSOLUTE, 0.0),
+    (SAFE,      WARNING,   ABOVE, 10,                   RELATIVE, 10.0),
+    (WARNING,   DANGEROUS, ABOVE, CRITICAL_TEMPERATURE, ABSOLUTE, 0.0),
+    (WARNING,   SAFE,      BELOW, 8,                    RELATIVE, 30.0),
+    (DANGEROUS, WARNING,   BELOW, CRITICAL_TEMPERATURE - 3, ABSOLUTE, 30.0),
+)
+
+#   state:     (pattern,   hold, escalate_after, escalated pattern)
+STATES = {
+    SAFE:      ("safe",    0.0,  None,  None),
+    WARNING:   ("warning", 30.0, 300.0, "warning escalated"),
+    DANGEROUS: ("danger",  60.0, None,  None),
+}
+
+# === Patterns ===
+GREEN = 1
+YELLOW = 2
+RED = 4
+IDLE = 0.1                 # tick() interval of a pattern without LED steps
+
+# name: (LED steps ((seconds, LED mask), ...) repeated, or None to show the
+#        target band; melody name, priority and volume (duty cycle, None = full))
+PATTERNS = {
+    "safe":              (None, None, None, None),
+    "warning":           (None, "warning_beep", PRIORITY_WARNING, 3000),
+    "warning escalated": (((0.5, YELLOW | RED), (0.5, RED)), "warning_beep", PRIORITY_WARNING, None),
+    "danger":            (((0.2, RED), (0.2, 0)), "danger_alarm", PRIORITY_DANGER, None),
+    "no reading":        (((0.5, YELLOW), (0.5, 0)), "warning_beep", PRIORITY_WARNING, 3000),
+}
+NO_READING = "no reading"
+
+
+class AlertMachine:
+    """Current state plus the dwell timers of the transitions out of it."""
+
+    def __init__(self, transitions=TRANSITIONS, states=STATES, initial=SAFE):
+        self.transitions = transitions
+        self.states = states
+        self.state = initial
+        self.entered_at = None         # time of the sample that entered the state
+        self.no_reading = False        # Forced to WARNING by lost_reading()
+        self.changes = 0
+        self._since = [None] * len(transitions)   # When each condition started to hold
+
+    def update(self, now, temperature, target):
+        """Feeds one sample, returns the (possibly new) state."""
+        self.no_reading = False
+        if self.entered_at is None:
+            self.entered_at = now
+        hold = self.states[self.state][1]
+        for index, row in enumerate(self.transitions):
+            source, destination, test, threshold, relative, dwell = row
+            if source != self.state:
+                continue
+            if relative:
+                threshold += target
+            holds = temperature >= threshold if test == ABOVE else temperature < threshold
+            if not holds:
+                self._since[index] = None
+                continue
+            if self._since[index] is None:
+                self._since[index] = now
+            if now - self._since[index] < dwell:
+                continue
+            if destination > self.state or now - self.entered_at >= hold:
+                self._enter(destination, now)
+                break
+        return self.state
+
+    def lost_reading(self, now):
+        """
+        No temperature to go on: WARNING at once, with its own pattern.
+        DANGEROUS stays, and so does its alarm: the sensor may be failing from the heat.
+        """
+        self.no_reading = True
+        if self.state == SAFE:
+            self._enter(WARNING, now)
+        return self.state
+
+    def _enter(self, state, now):
+        self.state = state
+        self.entered_at = now
+        self.changes += 1
+        for index in range(len(self._since)):
+            self._since[index] = None
+
+    def pattern(self, now):
+        """Name of the pattern the outputs should show now."""
+        name, hold, escalate_after, escalated = self.states[self.state]
+        if escalate_after is not None and now - self.entered_at >= escalate_after:
+            return escalated
+        if self.no_reading and self.state < DANGEROUS:
+            return NO_READING          # Never quieter than the state's own alarm
+        return name
+
+
+class PatternDriver:
+    """
+    Shows a pattern on the three LEDs and MelodyPlayer. tick() returns
+    the seconds until the next LED step; call it from a timer or task.
+    band is the LED mask shown by patterns without LED steps.
+    """
+
+    def __init__(self, green, yellow, red, player, melodies):
+        self.leds = (green, yellow, red)
+        self.player = player
+        self.melodies = melodies
+        self.band = 0
+        self.name = None
+        self._steps = None
+        self._index = 0
+        self._next_time = 0.0
+        self._priority = None
+
+    def show(self, name, now):
+        """Switches to the named pattern; the same name keeps it running."""
+        if name == self.name:
+            return
+        self.name = name
+        steps, melody, priority, volume = PATTERNS[name]
+        if melody is None:
+            if self._priority is not None:
+                self.player.stop(self._priority)   # Alarms end, a jingle plays on
+        else:
+            if self._priority is not None and self._priority > priority:
+                self.player.stop(self._priority)
+            self.player.play(self.melodies[melody], priority, loop=True,
+                             volume=VOLUME if volume is None else volume)
+        self._priority = priority
+        self._steps = steps
+        self._index = -1               # The first tick() shows step 0
+        self._next_time = now
+
+    def tick(self, now):
+        """Sets the LEDs for the current step, returns seconds until the next one."""
+        steps = self._steps
+        if steps is None:
+            self._set(self.band)
+            return IDLE
+        while now >= self._next_time:
+            self._index = (self._index + 1) % len(steps)
+            self._next_time += steps[self._index][0]
+            if self._next_time < now - 1.0:
+                self._next_time = now      # Far behind: resynchronise, do not race through
+        self._set(steps[self._index][1])
+        return self._next_time - now
+
+    async def run(self):
+        """asyncio task that steps the LEDs."""
+        import asyncio
+        while True:
+            await asyncio.sleep(self.tick(time.monotonic()))
+
+    def _set(self, mask):
+        green, yellow, red = self.leds
+        green.value = bool(mask & GREEN)
+        yellow.value = bool(mask & YELLOW)
+        red.value = bool(mask & RED)
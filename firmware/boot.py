@@ -0,0 +1,14 @@
+## Runs once before code.py. Makes CIRCUITPY writable for the session
+## log (sauna.log); the USB drive is then read-only for the computer.
+## Hold the stopwatch button (A0) while resetting to keep editing over USB.
+import board
+import digitalio
+import storage
+
+button = digitalio.DigitalInOut(board.A0)
+button.switch_to_input(pull=digitalio.Pull.UP)
+usb_edit = not button.value      # Pressed pulls A0 low
+button.deinit()
+
+if not usb_edit:
+    storage.remount("/", readonly=False)
@@ -1,122 +1,465 @@
+## Main firmware. Every job runs as its own asyncio task so a sounding
+## alarm never blocks the button, encoder, display or sensors. The AHT20,
+## APDS9960 and encoder are read together in one pipelined bus cycle.
+## Bus errors never end a task: see resilient.py.
 import time
 import board
 import digitalio
-import analogio
 import pwmio
-import adafruit_ahtx0
-import adafruit_apds9960.apds9960
-import adafruit_ht16k33.segments
-
+import asyncio
+from aht20_reader import AHT20Reader, STATUS_CALIBRATED
+from resilient import ResilientI2C
+from acquisition import Acquisition
+import zone_sensors
+from zone_sensors import ZoneSensors
+from adaptive_sampler import AdaptiveSampler
+from adafruit_ht16k33.segments import Seg14x4
+from segment_display import ShadowDisplay
+import display_format
 from adafruit_apds9960.apds9960 import APDS9960
-from adafruit_ht16k33.segments import BigSegment
+from adafruit_seesaw.seesaw import Seesaw
+from encoder_service import EncoderService
+from melody import MelodyPlayer, PRIORITY_JINGLE
+from melody_table import MelodyTable
+from profiler import Profiler
+from memory_telemetry import MemoryTelemetry
+from session_logger import SessionLogger
+from session_stats import SessionStats
+from heatup_predictor import HeatupPredictor
+from watchdog_supervisor import WatchdogSupervisor
+import alert_machine
+from alert_machine import AlertMachine, PatternDriver
+import input_events
+from input_events import InputEvents
 
-# === I2C setup ===
-i2c = board.I2C()
-aht20 = adafruit_ahtx0.AHTx0(i2c)
-apds = adafruit_apds9960.apds9960.APDS9960(i2c)
-apds.enable_light_sensor = True
-display = BigSegment(i2c)
+# === I2C Bus Setup ===
+i2c = ResilientI2C(board.SCL, board.SDA)     # Recovers a stuck bus, see Device Initialization
 
-# === Display Setup ===
-display.fill(0)
+# === Sensor Initialization ===
+# With a TCA9548A at 0x71 every AHT20 sits on a mux channel, one per zone;
+# the reference zone drives the state. Otherwise one AHT20 on the bus.
+ZONES = ((ord("B"), 0), (ord("C"), 1))       # Bench, ceiling: label, mux channel
+ZONE_REFERENCE = 0
+if zone_sensors.mux_present(i2c):
+    zones = ZoneSensors(i2c, ZONES, ZONE_REFERENCE)
+else:
+    zones = None
+sensor = None                                # Temperature and humidity, init_aht20()
+apds = None                                  # Light sensor (APDS9960), init_apds()
 
-# === GPIO setup ===
-button = digitalio.DigitalInOut(board.A0)
-button.direction = digitalio.Direction.INPUT
-button.pull = digitalio.Pull.UP
+# === Rotary Encoder Setup (Seesaw I2C) ===
+knob = None                                  # EncoderService, init_encoder()
 
-led = digitalio.DigitalInOut(board.A2)
-led.direction = digitalio.Direction.OUTPUT
+# === Display Setup (HT16K33) ===
+display = None                               # ShadowDisplay, init_display()
+display_text = display_format.new_buffer()  # Reused by every refresh, no new strings
 
-buzzer = pwmio.PWMOut(board.A1, duty_cycle=0, frequency=440, variable_frequency=True)
+# === LED Setup ===
+green_led = digitalio.DigitalInOut(board.A2)
+green_led.direction = digitalio.Direction.OUTPUT
+yellow_led = digitalio.DigitalInOut(board.A3)
+yellow_led.direction = digitalio.Direction.OUTPUT
+red_led = digitalio.DigitalInOut(board.TX)
+red_led.direction = digitalio.Direction.OUTPUT
 
-# === Potentiometer ===
-pot = analogio.AnalogIn(board.A0)
-def get_target_temp():
-    return 40 + ((pot.value / 65535) * 60)  # Range: 40–100°C
+# === Buzzer Setup (PWM-controlled passive buzzer) ===
+buzzer = pwmio.PWMOut(board.A1, frequency=880, duty_cycle=0, variable_frequency=True)
+player = MelodyPlayer(buzzer)                # Alarms and jingles without blocking
+melodies = MelodyTable()                     # Packed tables from melodies.bin
+leds = PatternDriver(green_led, yellow_led, red_led, player, melodies)  # Alert patterns
 
-# === Stopwatch ===
-start_time = None
+# === Input Events (stopwatch button on A0 scanned by keypad, encoder) ===
+inputs = InputEvents(board.A0)               # init_encoder() plugs the knob in
 
-# === Display Modes ===
-modes = ["TEMP", "HUMI", "TIME"]
-current_mode = 0
-last_button_state = True
-last_button_press_time = 0
+# === Acquisition (AHT20, APDS9960 and encoder under one bus lock) ===
+acquisition = Acquisition(i2c, None, zones=zones)   # init_*() plug the devices in
 
-# === Constants ===
-CRITICAL_TEMP = 90  # Red blinking + buzzer
-LED_TOLERANCES = [3, 10]  # Green: ±3, Yellow: ±10, Red: >10
+# === Device Initialization ===
+# Each init function runs at startup, and again when i2c has recovered
+# the bus or the device failed MAX_FAILURES times in a row; until then
+# the device is skipped with exponential backoff instead of raising.
 
-# === Helper Functions ===
-def update_led(temp, target):
-    diff = abs(temp - target)
-    if diff <= LED_TOLERANCES[0]:
-        led.value = True  # Green (placeholder for multi-color)
-    elif diff <= LED_TOLERANCES[1]:
-        led.value = True  # Yellow (also true for now)
+def init_aht20():
+    """Creates the AHT20 reader, or soft-resets and recalibrates it."""
+    global sensor
+    if sensor is None:
+        sensor = AHT20Reader(i2c)
+        acquisition.aht20 = sensor
+    else:
+        sensor.reset()
+        sensor.calibrate()
+
+def check_aht20():
+    """The AHT20 still reports calibrated: a power-on reset clears it."""
+    return bool(sensor.status & STATUS_CALIBRATED)
+
+def init_apds():
+    """Creates the light sensor driver, which resets its registers."""
+    global apds
+    apds = APDS9960(i2c)
+    apds.enable_color = True                 # Enable color readings
+
+def check_apds():
+    """ENABLE still has the power and colour bits set: a power-on reset clears them."""
+    return apds.enable and apds.enable_color
+
+def init_encoder():
+    """Creates the encoder service, or sets the seesaw up again."""
+    global knob
+    if knob is None:
+        knob = EncoderService(Seesaw(i2c, addr=0x36), board.D5)  # INT on D5, button on pin 24
+        acquisition.encoder = knob
+        inputs.encoder = knob
+    else:
+        knob.configure()
+
+def check_encoder():
+    return knob.configured()
+
+def init_display():
+    """
+    Creates the display, which switches the HT16K33 oscillator on and clears it.
+    On a re-init the shadow is stale: restart() sets the chip up and sends everything.
+    """
+    global display
+    if display is None:
+        display = ShadowDisplay(Seg14x4(i2c, auto_write=False))  # Only sends changed bytes
+        display.fill(0)
     else:
-        led.value = True  # Red
-    if temp > CRITICAL_TEMP:
-        blink_led()
-        sound_buzzer()
-
-def blink_led():
-    for _ in range(3):
-        led.value = True
-        time.sleep(0.2)
-        led.value = False
-        time.sleep(0.2)
-
-def sound_buzzer():
-    buzzer.duty_cycle = 32768  # 50%
-    buzzer.frequency = 880
-    time.sleep(1)
-    buzzer.duty_cycle = 0
-
-def read_button():
-    global last_button_state, last_button_press_time, current_mode, start_time
-    current_state = button.value
+        display.restart()
+
+def check_display():
+    return display.verify()
+
+# Each device's setup is read back every resilient.CHECK_INTERVAL: a brownout resets them silently
+if zones is None:
+    acquisition.aht20_device = i2c.add("AHT20", init_aht20, check_aht20)
+acquisition.light_device = i2c.add("APDS9960", init_apds, check_apds)
+acquisition.encoder_device = i2c.add("encoder", init_encoder, check_encoder)
+display_device = i2c.add("display", init_display, check_display)
+
+# === Task Periods (seconds) ===
+SENSOR_MIN_INTERVAL = 0.5  # AHT20 during fast transients (heat-up, loyly)
+SENSOR_MAX_INTERVAL = 30.0 # AHT20 once the room is stable
+CLIMATE_STALE_AFTER = 75.0 # No reading for this long: fall back to WARNING
+INPUT_INTERVAL = 0.05      # Acquisition cycle: encoder INT check, due sensors; buttons queue in the background
+DISPLAY_INTERVAL = 0.5     # Segment display refresh
+ALERT_INTERVAL = 0.1       # Alert pattern choice
+BRIGHTNESS_INTERVAL = 2.0  # Ambient light -> display brightness
+MEMORY_INTERVAL = 1.0      # Idle check for the scheduled gc.collect()
+MEMORY_SAMPLE_INTERVAL = 60.0  # Heap sample and trend update
+IDLE_AFTER_INPUT = 2.0     # No collection this soon after a button or the knob
+LOG_INTERVAL = 1.0         # Session log flush check
+LOG_FLUSH_INTERVAL = 60.0  # Flash written at most once a minute
+ACQUIRE_DEADLINE = 5.0     # Watchdog: sensors and input must run at least this often
+DISPLAY_DEADLINE = 5.0
+ALERT_DEADLINE = 2.0       # LEDs and buzzer
+
+DISPLAY_MODES = 8          # 0=temp, 1=humidity, 2=stopwatch, 3=set temp,
+                           # 4=session average temp, 5=minutes at temperature,
+                           # 6=minutes until the set temperature,
+                           # 7=zones in turn (only with zone sensors)
+AT_TEMPERATURE_MARGIN = 3  # "At temperature" = within 3°C of the target or above
+HUMIDITY_HIGH = 40         # %RH counted as a humid (löyly) stretch
+ZONE_DISPLAY_INTERVAL = 2.0  # Seconds each zone is shown in the zone mode
+display_modes = DISPLAY_MODES if zones is not None else DISPLAY_MODES - 1
+PROFILE_DUMP_INTERVAL = 600  # Seconds between profile dumps, or type "p" on the console
+
+# === Profiler Stages ===
+profiler = Profiler(dump_every=PROFILE_DUMP_INTERVAL)
+PROFILE_ACQUIRE = profiler.stage("acquire")       # Bus cycles that read something
+PROFILE_DISPLAY = profiler.stage("display")
+PROFILE_ALERT_PERIOD = profiler.stage("alert 10Hz", ALERT_INTERVAL)
+PROFILE_LOG_FLUSH = profiler.stage("log flush")
+
+
+class SaunaState:
+    """Values shared between the tasks."""
+
+    def __init__(self):
+        self.temperature = None
+        self.humidity = None
+        self.target_temp = 80          # Adjustable via encoder
+        self.state = alert_machine.SAFE
+        self.display_mode = 0
+        self.stopwatch_running = False
+        self.stopwatch_start_time = 0
+        self.stopwatch_elapsed = 0
+        self.last_input = 0.0          # time.monotonic() of the last input event
+        self.climate_time = time.monotonic()  # Of the last climate reading
+        self.climate_stale = False     # No reading for CLIMATE_STALE_AFTER
+
+    def stopwatch_time(self, now):
+        """Returns the stopwatch time in seconds."""
+        if self.stopwatch_running:
+            return self.stopwatch_elapsed + (now - self.stopwatch_start_time)
+        return self.stopwatch_elapsed
+
+
+sauna = SaunaState()
+memory = MemoryTelemetry()                   # Heap trend and idle-time gc.collect()
+sampler = AdaptiveSampler(SENSOR_MIN_INTERVAL, SENSOR_MAX_INTERVAL)
+session = SessionStats(humidity_threshold=HUMIDITY_HIGH)  # Running means, no sample arrays
+heatup = HeatupPredictor()                   # Fitted heat-up curve -> time to target
+alerts = AlertMachine()                      # SAFE/WARNING/DANGEROUS with hysteresis, see alert_machine.py
+log = SessionLogger(flush_interval=LOG_FLUSH_INTERVAL, compress=True)  # Ring file, see boot.py
+
+# === Watchdog (fed only while every task checks in) ===
+watchdog = WatchdogSupervisor()
+print(watchdog.report())                     # Why the board last reset
+WATCH_ACQUIRE = watchdog.register("acquire", ACQUIRE_DEADLINE)   # Sensors and input
+WATCH_DISPLAY = watchdog.register("display", DISPLAY_DEADLINE)
+WATCH_ALERT = watchdog.register("alert", ALERT_DEADLINE)
+
+# === Helper Functions ===
+
+def set_display_brightness(ambient):
+    """
+    Adjusts display brightness based on ambient light.
+    Maps green channel (0–300) to display brightness (0.1–1.0).
+    """
     now = time.monotonic()
-    if last_button_state and not current_state:
-        last_button_press_time = now
-    elif not last_button_state and current_state:
-        press_duration = now - last_button_press_time
-        if press_duration > 1:
-            # Long press: reset stopwatch
-            start_time = time.monotonic()
+    if not display_device.available(now):
+        return
+    clamped = min(max(ambient, 0), 300)
+    normalized = clamped / 300
+    try:
+        display.brightness = 0.1 + (normalized * 0.9)
+    except OSError as e:
+        display_device.failed(now, e)
+
+def led_band(current_temp):
+    """
+    LED mask for how close the current temperature is to the target,
+    shown while the alert pattern has no LED steps of its own.
+    Green = optimal range (±3°C)
+    Yellow = within ±10°C
+    Red = further than ±10°C
+    """
+    diff = abs(current_temp - sauna.target_temp)
+    if diff <= 3:
+        return alert_machine.GREEN
+    if diff <= 10:
+        return alert_machine.YELLOW
+    return alert_machine.RED
+
+# === Tasks ===
+
+def handle_climate(snapshot):
+    """
+    Re-evaluates the system state from a new AHT20 frame and feeds the
+    statistics, predictor, log and sampler.
+    """
+    now = snapshot.time
+    if sauna.climate_stale:
+        print("Climate readings are back")
+    sauna.climate_time = now
+    sauna.climate_stale = False
+    sauna.temperature = snapshot.temperature
+    sauna.humidity = snapshot.humidity
+    sauna.state = alerts.update(now, sauna.temperature, sauna.target_temp)
+    session.temperature.threshold = sauna.target_temp - AT_TEMPERATURE_MARGIN
+    session.update(now, sauna.temperature, sauna.humidity)
+    heatup.update(now, sauna.temperature)
+    log.log(now, sauna.temperature, sauna.humidity, sauna.state, sauna.target_temp)
+    interval = sampler.update(now, sauna.temperature, sauna.humidity)
+    if sampler.reads % 100 == 0:
+        print(f"Sensor interval {interval:.1f} s, {sampler.reads_saved()} reads saved")
+        print(session.report())
+        print(acquisition.report())
+        print(i2c.report())
+        if zones is not None:
+            print(zones.report(now))
+
+def check_climate(now):
+    """
+    Without a climate reading for CLIMATE_STALE_AFTER the last one is no
+    longer trusted: no temperature is shown and the state falls back to
+    WARNING (the "no reading" pattern) until the sensor answers again.
+    """
+    if not sauna.climate_stale and now - sauna.climate_time > CLIMATE_STALE_AFTER:
+        print(f"No climate reading for {now - sauna.climate_time:.0f} s, falling back to WARNING")
+        sauna.climate_stale = True
+        sauna.temperature = None
+        sauna.humidity = None
+        sauna.state = alerts.lost_reading(now)
+
+def handle_input(event):
+    """
+    Applies one input event:
+    stopwatch button starts/stops the stopwatch, encoder button cycles
+    the display mode, turning the encoder adjusts the target temperature.
+    """
+    sauna.last_input = event.timestamp
+    if event.kind == input_events.PRESS:
+        if event.source == input_events.STOPWATCH_BUTTON:
+            if sauna.stopwatch_running:
+                sauna.stopwatch_elapsed += event.timestamp - sauna.stopwatch_start_time
+                sauna.stopwatch_running = False
+            else:
+                sauna.stopwatch_start_time = event.timestamp
+                sauna.stopwatch_running = True
+        elif event.source == input_events.ENCODER_BUTTON:
+            sauna.display_mode = (sauna.display_mode + 1) % display_modes
+    elif event.kind == input_events.TURN:
+        target = sauna.target_temp + event.value
+        sauna.target_temp = max(0, min(100, target))  # Clamp between 0 and 100°C
+
+async def acquisition_task():
+    """
+    Runs one acquisition cycle per INPUT_INTERVAL: the encoder when its
+    INT is low, the AHT20 when the sampler says so (the conversion runs
+    until a later cycle), the light sensor every BRIGHTNESS_INTERVAL.
+    Then handles every queued input event.
+    """
+    next_light = 0.0
+    while True:
+        now = time.monotonic()
+        watchdog.checkin(WATCH_ACQUIRE, now)
+        i2c.service(now)                     # Bus recovery and re-inits, outside the cycle
+        if zones is not None:
+            zones.retry(now)                 # Failed zones, outside the bus cycle
+        check_climate(now)
+        light = now >= next_light
+        start = profiler.start()
+        snapshot = acquisition.cycle(now, sampler.due(now), light)
+        if snapshot is not None:
+            profiler.stop(PROFILE_ACQUIRE, start)
+            if snapshot.encoder_fresh:
+                inputs.queue_encoder()
+            if snapshot.climate_fresh:
+                handle_climate(snapshot)
+            if snapshot.light_fresh:
+                set_display_brightness(snapshot.green)
+                next_light = now + BRIGHTNESS_INTERVAL
+                profiler.poll()
+        event = inputs.get()
+        while event is not None:
+            handle_input(event)
+            event = inputs.get()
+        await asyncio.sleep(INPUT_INTERVAL)
+
+def show_zone(text, now):
+    """Zone label and temperature, a different zone every ZONE_DISPLAY_INTERVAL."""
+    zone = zones.zones[int(now / ZONE_DISPLAY_INTERVAL) % len(zones.zones)]
+    if zone.temperature is None or zones.state(zone, now) == zone_sensors.ZONE_FAILED:
+        display_format.write_text(text, b"  --")
+        text[0] = zone.label
+    else:
+        display_format.write_label(text, zone.label, zone.temperature)
+
+async def display_task():
+    """Shows the value selected by the current display mode, without allocating."""
+    text = display_text
+    while True:
+        start = profiler.start()
+        mode = sauna.display_mode
+        if mode <= 1 and sauna.temperature is None:
+            display_format.write_text(text, b"----")   # No reading; the other modes don't need one
+        elif mode == 0:
+            display_format.write_label(text, 0x54, sauna.temperature)   # T: current temperature
+        elif mode == 1:
+            display_format.write_label(text, 0x48, sauna.humidity)      # H: current humidity
+        elif mode == 2:
+            display_format.write_minutes_seconds(text, sauna.stopwatch_time(time.monotonic()))
+        elif mode == 3:
+            display_format.write_label(text, 0x53, sauna.target_temp)   # S: set temperature
+        elif mode == 4:
+            display_format.write_label(text, 0x41, session.temperature.time_weighted_mean)  # A: average
+        elif mode == 5:
+            display_format.write_label(text, 0x4D, session.temperature.time_above // 60)    # M: minutes hot
+        elif mode == 6:
+            eta = None
+            if sauna.temperature is not None:
+                eta = heatup.eta(sauna.target_temp, sauna.temperature)
+            if eta is None:
+                display_format.write_text(text, b"E --")                 # No reading, or not heating towards it
+            else:
+                display_format.write_label(text, 0x45, (eta + 59) // 60)  # E: minutes to go
+        elif mode == 7:
+            show_zone(text, time.monotonic())
+        now = time.monotonic()
+        watchdog.checkin(WATCH_DISPLAY, now)
+        if display_device.available(now):
+            try:
+                display.print_bytes(text)
+            except OSError as e:
+                display_device.failed(now, e)
+            else:
+                display_device.ok(now)
+        profiler.stop(PROFILE_DISPLAY, start)
+        await asyncio.sleep(DISPLAY_INTERVAL)
+
+async def alert_task():
+    """
+    Picks the alert machine's pattern and the LED band; leds.run() and
+    player.run() play them. Reaching the target temperature plays a
+    short jingle.
+    """
+    ready = False
+    while True:
+        profiler.mark(PROFILE_ALERT_PERIOD)
+        now = time.monotonic()
+        watchdog.checkin(WATCH_ALERT, now)
+        if sauna.temperature is not None:
+            leds.band = led_band(sauna.temperature)
+            diff = abs(sauna.temperature - sauna.target_temp)
+            if diff <= 3 and not ready:
+                player.play(melodies["ready_jingle"], PRIORITY_JINGLE)
+                ready = True
+            elif diff > 10:
+                ready = False
+        leds.show(alerts.pattern(now), now)
+        await asyncio.sleep(ALERT_INTERVAL)
+
+async def memory_task():
+    """
+    Collects garbage while nobody is using the knob or buttons and no
+    melody plays, and samples the heap once a minute.
+    """
+    last_sample = time.monotonic()
+    while True:
+        now = time.monotonic()
+        idle = now - sauna.last_input >= IDLE_AFTER_INPUT and not player.playing
+        if idle and now - last_sample >= MEMORY_SAMPLE_INTERVAL:
+            last_sample = now
+            memory.collect()
+            memory.sample(now)
+            if memory.samples and memory.samples % 10 == 0:
+                print(memory.report())
         else:
-            # Short press: change mode
-            current_mode = (current_mode + 1) % len(modes)
-    last_button_state = current_state
-
-def update_display(mode, temp, humi, elapsed):
-    if mode == "TEMP":
-        display.print(f"{temp:4.0f}")
-    elif mode == "HUMI":
-        display.print(f"{humi:4.0f}")
-    elif mode == "TIME":
-        display.print(f"{int(elapsed):4d}")
-
-def adjust_brightness():
-    # Brightness from ambient light: 0–255
-    brightness = apds.ambient_light
-    if brightness is not None:
-        level = max(1, min(int(brightness / 100), 15))  # Clamp to 1–15
-        display.brightness = level
-
-# === Main Loop ===
-start_time = time.monotonic()
-while True:
-    adjust_brightness()
-    read_button()
-
-    temp = aht20.temperature
-    humi = aht20.relative_humidity
-    target_temp = get_target_temp()
-    elapsed = time.monotonic() - start_time
-
-    update_led(temp, target_temp)
-    update_display(modes[current_mode], temp, humi, elapsed)
-
-    time.sleep(0.5)
+            memory.collect_if_idle(idle, now)
+        await asyncio.sleep(MEMORY_INTERVAL)
+
+async def log_task():
+    """Writes the batched session log records to flash once a minute."""
+    while True:
+        start = profiler.start()
+        if log.flush(time.monotonic()):
+            profiler.stop(PROFILE_LOG_FLUSH, start)
+        await asyncio.sleep(LOG_INTERVAL)
+
+# === Main ===
+
+async def main():
+    watchdog.start(time.monotonic())
+    await asyncio.gather(
+        asyncio.create_task(watchdog.run()),
+        asyncio.create_task(acquisition_task()),
+        asyncio.create_task(display_task()),
+        asyncio.create_task(alert_task()),
+        asyncio.create_task(player.run()),
+        asyncio.create_task(leds.run()),
+        asyncio.create_task(memory_task()),
+        asyncio.create_task(log_task()),
+    )
+
+try:
+    asyncio.run(main())
+except KeyboardInterrupt:
+    watchdog.stop()                          # Ctrl-C: stay in the REPL, no reset
+    log.close()                              # With the page still filling
+    raise
+except Exception as e:
+    watchdog.record_crash(e)                 # The watchdog resets the board
+    raise
@@ -0,0 +1,72 @@
+"""
+Allocation-free formatting for the 4-character display.
+
+f"T{int(temperature):>3}" and format_seconds() build new strings on
+every refresh. These functions write ASCII codes into a reusable
+bytearray instead; ShadowDisplay.print_bytes() turns the buffer into
+segments in place. Nothing here creates an object, so a refresh never
+grows the heap.
+"""
+
+_SPACE = 0x20
+_MINUS = 0x2D
+_ZERO = 0x30
+
+
+def new_buffer():
+    """A 4-character text buffer to reuse for every refresh."""
+    return bytearray(b"    ")
+
+
+def write_label(buf, label, value):
+    """
+    Label character and the value right-aligned in 3 places, like
+    f"{label}{int(value):>3}". label is a character code, e.g. ord("T").
+    Values outside -99 ... 999 are clamped.
+    """
+    buf[0] = label
+    _write_int(buf, 1, 3, int(value))
+
+
+def write_minutes_seconds(buf, seconds):
+    """
+    MMSS like format_seconds(): minutes right-aligned, seconds zero-padded.
+    From 100 minutes on it stays at 9959 instead of showing a wrong time.
+    """
+    seconds = int(seconds)
+    if seconds > 99 * 60 + 59:
+        seconds = 99 * 60 + 59
+    minutes = seconds // 60
+    _write_int(buf, 0, 2, minutes)
+    seconds %= 60
+    buf[2] = _ZERO + seconds // 10
+    buf[3] = _ZERO + seconds % 10
+
+
+def write_text(buf, text):
+    """Copies a bytes constant, e.g. b"----"."""
+    for i in range(len(buf)):
+        buf[i] = text[i] if i < len(text) else _SPACE
+
+
+def _write_int(buf, start, width, value):
+    """value right-aligned in buf[start:start + width], minus sign included."""
+    negative = value < 0
+    if negative:
+        value = -value
+    limit = 10 ** (width - 1) - 1 if negative else 10 ** width - 1
+    if value > limit:
+        value = limit
+    i = start + width - 1
+    while True:
+        buf[i] = _ZERO + value % 10
+        value //= 10
+        i -= 1
+        if value == 0 or i < start:
+            break
+    if negative and i >= start:
+        buf[i] = _MINUS
+        i -= 1
+    while i >= start:
+        buf[i] = _SPACE
+        i -= 1
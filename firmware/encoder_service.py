@@ -0,0 +1,170 @@
+"""
+Rotary encoder service for the seesaw breakout.
+
+The seesaw pulls its INT line low when the knob turns (encoder
+interrupt) or the button changes (GPIO interrupt on pin 24). With INT
+wired to a GPIO, poll() costs no I2C traffic until something actually
+happened; then it reads the encoder delta, the interrupt flags (which
+releases INT) and, only if the button changed, the button level with
+one bulk GPIO read.
+
+request() and collect() split poll() for a caller that holds the bus
+lock itself (acquisition.py): the seesaw needs READ_DELAY between a
+register request and the read, which other devices' transfers can fill.
+"""
+import struct
+import time
+import digitalio
+
+BUTTON_PIN = 24
+READ_DELAY = 0.008         # Same as adafruit_seesaw, request -> read
+
+_GPIO_BASE = 0x01
+_GPIO_BULK = 0x04
+_GPIO_INTFLAG = 0x0A
+_ENCODER_BASE = 0x11
+_ENCODER_INTENSET = 0x10
+_ENCODER_DELTA = 0x40
+
+
+class EncoderService:
+    """
+    Knob and button changes of one seesaw rotary encoder.
+    int_pin is the GPIO wired to the seesaw INT line, or None to poll.
+    """
+
+    def __init__(self, seesaw, int_pin=None, button_pin=BUTTON_PIN):
+        self.seesaw = seesaw
+        self.button_pin = button_pin
+        self.button_mask = 1 << button_pin
+        self.int_pin = int_pin
+        self.int_line = None
+        if int_pin is not None:
+            self._claim_int()
+        self.delta = 0                 # Detents turned, from the last poll()
+        self.button_changed = False    # Button pressed or released, from the last poll()
+        self.pressed = False
+        self.reads = 0                 # I2C reads issued by poll()
+        self.polls = 0
+        self.address = seesaw.i2c_device.device_address
+        self._command = bytearray(2)
+        self._data = bytearray(4)
+        self._requested_at = 0.0
+        self.configure()
+
+    def configure(self):
+        """Sets up the button pin and interrupts; again after the seesaw was reset."""
+        seesaw = self.seesaw
+        seesaw.pin_mode(self.button_pin, seesaw.INPUT_PULLUP)
+        if self.int_pin is not None:
+            seesaw.set_GPIO_interrupts(self.button_mask, True)
+            seesaw.enable_encoder_interrupt()
+            seesaw.get_GPIO_interrupt_flag()                        # Release a stale INT
+        seesaw.encoder_delta()                                      # Start from zero
+        self.pressed = not seesaw.digital_read_bulk(self.button_mask)
+
+    def configured(self):
+        """
+        False once the seesaw lost its setup: a power-on reset clears the
+        encoder interrupt, INT stays high and the knob looks idle.
+        """
+        if self.int_pin is None:
+            return True
+        return bool(self.seesaw.read8(_ENCODER_BASE, _ENCODER_INTENSET) & 0x01)
+
+    def _claim_int(self):
+        self.int_line = digitalio.DigitalInOut(self.int_pin)
+        self.int_line.switch_to_input(pull=digitalio.Pull.UP)   # INT is open drain
+
+    def release_int(self):
+        """Frees the INT pin, e.g. for a PinAlarm. The next poll() claims it again."""
+        if self.int_line is not None:
+            self.int_line.deinit()
+            self.int_line = None
+
+    @property
+    def pending(self):
+        """True if the INT line reports a change (always True without INT)."""
+        if self.int_pin is None:
+            return True
+        if self.int_line is None:
+            self._claim_int()
+        return not self.int_line.value
+
+    def poll(self):
+        """Reads what changed since the last call, returns True if anything did."""
+        self.polls += 1
+        self.delta = 0
+        self.button_changed = False
+        if not self.pending:
+            return False
+        seesaw = self.seesaw
+        self.delta = seesaw.encoder_delta()
+        self.reads += 1
+        if self.int_pin is not None:
+            flags = seesaw.get_GPIO_interrupt_flag()
+            self.reads += 1
+            if not flags & self.button_mask:
+                return self.delta != 0
+        pressed = not seesaw.digital_read_bulk(self.button_mask)
+        self.reads += 1
+        if pressed != self.pressed:
+            self.pressed = pressed
+            self.button_changed = True
+        return self.delta != 0 or self.button_changed
+
+    def deinit(self):
+        if self.int_pin is not None:
+            self.seesaw.disable_encoder_interrupt()
+            self.seesaw.set_GPIO_interrupts(self.button_mask, False)
+            self.release_int()
+            self.int_pin = None
+
+    # === Split Poll On A Locked Bus ===
+
+    def request(self, bus):
+        """
+        First half of poll() on a locked busio.I2C: asks for the encoder
+        delta if INT reports a change. Returns True if collect() must follow.
+        """
+        self.polls += 1
+        self.delta = 0
+        self.button_changed = False
+        if not self.pending:
+            return False
+        self._request(bus, _ENCODER_BASE, _ENCODER_DELTA)
+        return True
+
+    def collect(self, bus):
+        """Second half: the delta, then flags and button like poll(). Returns True if anything changed."""
+        self.delta = struct.unpack(">i", self._read(bus))[0]
+        if self.int_pin is not None:
+            self._request(bus, _GPIO_BASE, _GPIO_INTFLAG)
+            if not self._read_mask(bus):
+                return self.delta != 0
+        self._request(bus, _GPIO_BASE, _GPIO_BULK)
+        pressed = not self._read_mask(bus)
+        if pressed != self.pressed:
+            self.pressed = pressed
+            self.button_changed = True
+        return self.delta != 0 or self.button_changed
+
+    def _request(self, bus, base, register):
+        self._command[0] = base
+        self._command[1] = register
+        bus.writeto(self.address, self._command)
+        self._requested_at = time.monotonic()
+
+    def _read_mask(self, bus):
+        """The button bit of a 32-bit GPIO register, without struct's overflow on bit 31."""
+        data = self._read(bus)
+        return (data[0] << 24 | data[1] << 16 | data[2] << 8 | data[3]) & self.button_mask
+
+    def _read(self, bus):
+        """Waits what is left of READ_DELAY since the request, reads 4 bytes."""
+        wait = READ_DELAY - (time.monotonic() - self._requested_at)
+        if wait > 0:
+            time.sleep(wait)
+        bus.readfrom_into(self.address, self._data)
+        self.reads += 1
+        return self._data
@@ -0,0 +1,106 @@
+"""
+Time-to-target prediction for the heat-up.
+
+A sauna heats like a first-order system, dT/dt = k * (T_max - T), which
+is a straight line in T: dT/dt = c0 + c1 * T with c1 = -k and
+c0 = k * T_max. HeatupPredictor fits that line by exponentially weighted
+least squares over (temperature, slope) points; the slope is measured
+over at least min_span seconds so sensor noise does not swamp it. Old
+points fade with time constant tau, so the fit follows the stove being
+turned up or the door being opened. Each update is a few multiplications
+on seven floats.
+
+From the fit, the time to go from T to the target is
+    ln((T_max - T) / (T_max - target)) / k
+"""
+import math
+
+
+class HeatupPredictor:
+    """Streaming fit of the heat-up curve, see eta()."""
+
+    def __init__(self, tau=600.0, min_span=20.0, min_points=5, min_spread=2.0):
+        self.tau = tau
+        self.min_span = min_span
+        self.min_points = min_points
+        self.min_spread = min_spread   # °C of temperature range before the fit is trusted
+        self.reset()
+
+    def reset(self):
+        self.points = 0
+        self._anchor_time = None
+        self._anchor_temp = 0.0
+        self._last_time = None
+        self._w = 0.0                  # Exponentially weighted sums of 1, x, y, x*x, x*y
+        self._x = 0.0
+        self._y = 0.0
+        self._xx = 0.0
+        self._xy = 0.0
+
+    def update(self, now, temperature):
+        """Adds one sample; a fit point is made once min_span has passed since the last one."""
+        if self._anchor_time is None:
+            self._anchor_time = now
+            self._anchor_temp = temperature
+            return
+        span = now - self._anchor_time
+        if span < self.min_span:
+            return
+        x = (temperature + self._anchor_temp) / 2
+        y = (temperature - self._anchor_temp) / span
+        if self._last_time is not None:
+            fade = math.exp(-(now - self._last_time) / self.tau)
+            self._w *= fade
+            self._x *= fade
+            self._y *= fade
+            self._xx *= fade
+            self._xy *= fade
+        self._w += 1.0
+        self._x += x
+        self._y += y
+        self._xx += x * x
+        self._xy += x * y
+        self._last_time = now
+        self._anchor_time = now
+        self._anchor_temp = temperature
+        self.points += 1
+
+    def coefficients(self):
+        """(c0, c1) of dT/dt = c0 + c1 * T, or None while the fit is not trustworthy."""
+        if self.points < self.min_points or self._w <= 0:
+            return None
+        mean_x = self._x / self._w
+        mean_y = self._y / self._w
+        variance = self._xx / self._w - mean_x * mean_x
+        if variance < (self.min_spread / 2) ** 2:
+            return None                # Temperature hardly moved, the slope says nothing
+        c1 = (self._xy / self._w - mean_x * mean_y) / variance
+        return mean_y - c1 * mean_x, c1
+
+    @property
+    def asymptote(self):
+        """The temperature the sauna is heading for, None if unknown or not heating."""
+        fit = self.coefficients()
+        if fit is None or fit[1] >= 0:
+            return None
+        return -fit[0] / fit[1]
+
+    def eta(self, target, temperature):
+        """
+        Seconds until temperature reaches target: 0 once there, None when
+        it is unknown or the sauna will not get there at the current rate.
+        """
+        if temperature >= target:
+            return 0.0
+        fit = self.coefficients()
+        if fit is None:
+            return None
+        c0, c1 = fit
+        if c1 >= 0:
+            # Not settling: fall back to the current straight-line rate
+            rate = c0 + c1 * temperature
+            return (target - temperature) / rate if rate > 0 else None
+        t_max = -c0 / c1
+        if t_max <= target:
+            return None
+        return math.log((t_max - temperature) / (t_max - target)) / -c1
@@ -0,0 +1,94 @@
+"""
+Input events for the display modes.
+
+The stopwatch button is scanned and debounced in the background by
+CircuitPython's `keypad` module, so a press is queued even while the
+main loop is busy or sleeping. The encoder knob and its button sit on
+the seesaw breakout; poll() asks the EncoderService, which only talks
+I2C when the seesaw INT line reports a change, and turns what it read
+into the same events.
+"""
+import time
+import keypad
+from adafruit_ticks import ticks_ms, ticks_diff
+
+# === Event Sources ===
+STOPWATCH_BUTTON = 0
+ENCODER_BUTTON = 1
+ENCODER = 2
+
+# === Event Kinds ===
+PRESS = 0
+RELEASE = 1
+TURN = 2       # value = detents turned since the last event
+
+
+class InputEvent:
+    """One input event, reused by InputEvents.get() to avoid allocations."""
+
+    def __init__(self):
+        self.source = STOPWATCH_BUTTON
+        self.kind = PRESS
+        self.value = 0
+        self.timestamp = 0.0   # time.monotonic() seconds when it happened
+
+    def __repr__(self):
+        return f"<InputEvent source={self.source} kind={self.kind} value={self.value}>"
+
+
+class InputEvents:
+    """
+    Collects stopwatch button and encoder events into one queue.
+    button is the GPIO pin of the stopwatch button, wired to GND.
+    """
+
+    def __init__(self, button, encoder=None, max_events=16):
+        self.keys = keypad.Keys((button,), value_when_pressed=False, pull=True,
+                                max_events=max_events)
+        self.encoder = encoder        # EncoderService or None
+        self._key_event = keypad.Event()
+        self._event = InputEvent()
+        self._pending = []            # (source, kind, value, timestamp) from the encoder
+
+    @property
+    def overflowed(self):
+        """True if button events were lost because the queue was full."""
+        return self.keys.events.overflowed
+
+    def poll(self):
+        """Queues the encoder changes. The button needs no polling."""
+        if self.encoder is not None and self.encoder.poll():
+            self.queue_encoder()
+
+    def queue_encoder(self):
+        """Queues what the encoder's last poll() or collect() found."""
+        encoder = self.encoder
+        if encoder.delta:
+            self._queue(ENCODER, TURN, encoder.delta)
+        if encoder.button_changed:
+            self._queue(ENCODER_BUTTON, PRESS if encoder.pressed else RELEASE, 0)
+
+    def _queue(self, source, kind, value):
+        self._pending.append((source, kind, value, time.monotonic()))
+
+    def get(self):
+        """
+        Returns the next event or None.
+        The event is only valid until the next call.
+        """
+        event = self._event
+        if self.keys.events.get_into(self._key_event):
+            event.source = STOPWATCH_BUTTON
+            event.kind = PRESS if self._key_event.pressed else RELEASE
+            event.value = 0
+            # keypad stamped it in supervisor ticks (ms) when it was scanned
+            age = ticks_diff(ticks_ms(), self._key_event.timestamp)
+            event.timestamp = time.monotonic() - age / 1000
+            return event
+        if self._pending:
+            event.source, event.kind, event.value, event.timestamp = self._pending.pop(0)
+            return event
+        return None
+
+    def deinit(self):
+        self.keys.deinit()
@@ -0,0 +1,113 @@
+"""
+Melody sources for the passive buzzer.
+
+A melody is a list of (note, seconds) tuples; "R" is a rest. Melodies
+in RTTTL go into `rtttl`. tools/compile_melodies.py packs all of them
+into melodies.bin, which melody_table.MelodyTable loads on the device,
+so this file is not needed at run time.
+"""
+
+noteLength = 0.2
+beat = 0.5
+
+# Full chromatic scale frequency map (4th and 5th octave)
+notes = {
+    "B3": 247,
+    "C4": 262,  "C#4": 277, "Db4": 277,
+    "D4": 294,  "D#4": 311, "Eb4": 311,
+    "E4": 330,
+    "F4": 349,  "F#4": 370, "Gb4": 370,
+    "G4": 392,  "G#4": 415, "Ab4": 415,
+    "A4": 440,  "A#4": 466, "Bb4": 466,
+    "B4": 494,
+
+    "C5": 523,  "C#5": 554, "Db5": 554,
+    "D5": 587,  "D#5": 622, "Eb5": 622,
+    "E5": 659,
+    "F5": 698,  "F#5": 740, "Gb5": 740,
+    "G5": 784,  "G#5": 831, "Ab5": 831,
+    "A5": 880,  "A#5": 932, "Bb5": 932,
+    "B5": 988,
+
+    "C6": 1047,
+    "R": 0  # Rest
+}
+
+# 📝 Write your melody with sharps and flats
+levels = [
+    ("C#5", noteLength), ("B4", noteLength), ("G#4", noteLength), ("F#4", noteLength),
+    ("E4", noteLength), ("E4", noteLength), ("R", noteLength), ("E4", noteLength),
+    ("E4", noteLength), ("E4", noteLength), ("E4", noteLength), ("D#4", noteLength),
+    ("D#4", noteLength), ("E4", noteLength), ("E4", noteLength),
+    
+    ("R", noteLength),
+    
+    ("C#5", noteLength), ("B4", noteLength), ("G#4", noteLength), ("F#4", noteLength),
+    ("E4", noteLength), ("E4", noteLength), ("R", noteLength), ("E4", noteLength),
+    ("E4", noteLength), ("E4", noteLength), ("E4", noteLength), ("C#4", noteLength),
+    ("C#4", noteLength), ("B3", noteLength), ("B3", noteLength),
+    
+    ("R", noteLength),
+]
+
+bastu = [
+    ("A4", beat/2), ("E5", beat/2),
+    ("R", beat/2),
+    ("F5", beat/2),("C5", beat/2),
+    ("R", beat/2),
+    ("E5", beat/2),("B4", beat/2),
+    ("R", beat/2),
+    ("E5", beat/2),("B4", beat/2),
+    ("R", beat/2),
+    ("D5", beat/2),("B4", beat/2),
+    ("C5", beat/2),("B4", beat/2),
+    
+    ("A4", beat/2), ("E5", beat/2),
+    ("R", beat/2),
+    ("F5", beat/2),("C5", beat/2),
+    ("R", beat/2),
+    ("E5", beat/2),("B4", beat/2),
+    ("R", beat/2),
+    ("E5", beat/2),("B4", beat/2),
+    ("R", beat/2),
+    ("D5", beat/2),("B4", beat/2),
+    ("C5", beat/2),("B4", beat/2),
+    
+    ("R", beat),
+    
+    ("C5", beat/4),("C5", beat/4),("C5", beat/4),("D5", beat/4),
+    ("E5", beat/2),("A4", beat/2),
+    ("E5", beat/2),("A4", beat/2),
+    ("R", beat/4),
+    ("F5", beat/2),("F5", beat/4),
+    ("F5", beat/2),("E5", beat/2),("B4", beat/2),("B4", beat/2),
+    ("C5", beat/2),("D5", beat/2),("E5", beat/2),
+    ("R", beat*3/2),
+    ("A4", beat/2),("A4", beat/4),("A4", beat/2),("A4", beat/4),("A4", beat/2),
+    ("C5", beat/4),("C5", beat/2),("C5", beat/2),("C5", beat/4),("C5", beat/2),
+    ("B4", beat/2),("C5", beat/2),("B4", beat/2),("C5", beat/2),("B4", beat/2),
+    ("R", beat/2),
+    
+    ("C5", beat/4),("C5", beat/4),("C5", beat/4),("D5", beat/4),
+    ("E5", beat/2),("A4", beat/2),
+    ("E5", beat/2),("A4", beat/2),
+    ("R", beat/4),
+    ("F5", beat/2),("F5", beat/4),
+    ("F5", beat/2),("E5", beat/2),("B4", beat/2),("B4", beat/2),
+    ("C5", beat/2),("D5", beat/2),("E5", beat/2),
+    ("R", beat),("A4", beat/2),
+    ("F5", beat*3/4),("E5", beat/4),("D5", beat*3/4),("C5", beat/4),
+    ("B4", beat*2),
+    ("B4", beat/2),("C5", beat/2),("B4", beat/2),("G#4", beat/2),("A4", beat/2),
+    
+]
+
+# === Alert Melodies (buzzer at 880 Hz was the original alarm tone) ===
+warning_beep = [("A5", 0.1), ("R", 0.8)]                     # One short beep per second
+danger_alarm = [("A5", 0.15), ("R", 0.15)]                   # 2.5 Hz, as loud as the buzzer goes
+ready_jingle = [("C5", beat/4), ("E5", beat/4), ("G5", beat/4), ("C6", beat/2)]  # Target reached
+
+# === RTTTL Melodies (name: RTTTL string, as played by adafruit_rtttl) ===
+rtttl = {
+    "timer_done": "timer_done:d=8,o=5,b=180:g,e,c,p,g,e,c,p,4c6",
+}
@@ -0,0 +1,107 @@
+"""
+Non-blocking melody sequencer for the passive buzzer.
+
+Melodies are melody_table.PackedMelody windows into the uint16 tables
+of melodies.bin. MelodyPlayer never sleeps: tick() sets the buzzer for the current
+note and returns how long until the next change, so it can be driven
+from a timer, a job scheduler or the run() asyncio task while the
+sensors and the display keep going. A melody with a higher priority
+preempts the one playing (a danger alarm overrides a jingle); a lower
+one is refused until the buzzer is free.
+"""
+import time
+
+# === Priorities ===
+PRIORITY_JINGLE = 0
+PRIORITY_WARNING = 1
+PRIORITY_DANGER = 2
+
+GAP = 0.05            # Silence after every note
+VOLUME = 65535 // 2   # 50 % duty, loudest for a passive buzzer
+IDLE = 0.1            # tick() interval while nothing plays
+
+
+class MelodyPlayer:
+    """Plays one melody at a time on a PWMOut created with variable_frequency=True."""
+
+    def __init__(self, buzzer, gap=GAP):
+        self.buzzer = buzzer
+        self.gap = gap
+        self.melody = None
+        self.priority = -1
+        self.loop = False
+        self.volume = VOLUME
+        self._index = -1
+        self._in_gap = True
+        self._next_time = 0.0
+
+    @property
+    def playing(self):
+        return self.melody is not None
+
+    def play(self, melody, priority=PRIORITY_JINGLE, loop=False, volume=VOLUME):
+        """
+        Starts melody from its first note. Returns False if a melody with
+        a higher priority is playing. Asking for the melody that already
+        plays keeps it going at the new volume instead of restarting it.
+        """
+        if self.melody is not None:
+            if priority < self.priority:
+                return False
+            if melody is self.melody:
+                self.priority = priority
+                self.loop = loop
+                self.volume = volume
+                return True
+        self.melody = melody
+        self.priority = priority
+        self.loop = loop
+        self.volume = volume
+        self._index = -1          # The first tick() starts note 0
+        self._in_gap = True
+        self._next_time = time.monotonic()
+        return True
+
+    def stop(self, min_priority=None):
+        """Stops the melody, or only if its priority is at least min_priority."""
+        if self.melody is None or (min_priority is not None and self.priority < min_priority):
+            return
+        self.melody = None
+        self.priority = -1
+        self.buzzer.duty_cycle = 0
+
+    def tick(self, now=None):
+        """Advances the melody if a note is due, returns seconds until the next change."""
+        if self.melody is None:
+            return IDLE
+        if now is None:
+            now = time.monotonic()
+        while now >= self._next_time:
+            if self._in_gap:
+                self._index += 1
+                self._in_gap = False
+                if self._index >= self.melody.length:
+                    if not self.loop:
+                        self.stop()
+                        return IDLE
+                    self._index = 0
+                melody = self.melody
+                note = melody.start + self._index
+                frequency = melody.frequencies[note]
+                if frequency:
+                    self.buzzer.frequency = frequency
+                    self.buzzer.duty_cycle = self.volume
+                else:
+                    self.buzzer.duty_cycle = 0      # Rest
+                self._next_time += melody.durations[note] / 1000
+            else:
+                self.buzzer.duty_cycle = 0
+                self._in_gap = True
+                self._next_time += self.gap
+        return self._next_time - now
+
+    async def run(self):
+        """asyncio task that keeps the melodies going."""
+        import asyncio
+        while True:
+            await asyncio.sleep(self.tick())
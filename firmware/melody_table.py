@@ -0,0 +1,68 @@
+"""
+Loads melodies.bin, the packed melody tables built by
+tools/compile_melodies.py.
+
+All notes of all melodies sit in two array('H') tables, frequencies in
+Hz (0 = rest) and durations in milliseconds, read from the file once at
+start-up. A melody is only a (start, length) window into them, so
+playing one allocates nothing per note.
+"""
+import struct
+from array import array
+
+MAGIC = b"SMEL"
+VERSION = 1
+HEADER_SIZE = 10
+ENTRY_SIZE = 16
+
+
+def _default_path():
+    folder = __file__.rsplit("/", 1)[0] if "/" in __file__ else "."
+    return folder + "/melodies.bin"
+
+
+class PackedMelody:
+    """One melody: notes start ... start + length - 1 of the tables."""
+
+    def __init__(self, name, frequencies, durations, start, length):
+        self.name = name
+        self.frequencies = frequencies
+        self.durations = durations      # Milliseconds
+        self.start = start
+        self.length = length
+
+    def __len__(self):
+        return self.length
+
+    def __repr__(self):
+        return f"<PackedMelody {self.name} ({self.length} notes)>"
+
+
+class MelodyTable:
+    """The melodies of a melodies.bin, by name."""
+
+    def __init__(self, path=None):
+        self.melodies = {}
+        with open(path or _default_path(), "rb") as file:
+            magic, version, count, notes = struct.unpack("<4sHHH", file.read(HEADER_SIZE))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("Not a melodies.bin v1 file")
+            index = file.read(count * ENTRY_SIZE)
+            self.frequencies = array("H", bytearray(2 * notes))
+            self.durations = array("H", bytearray(2 * notes))
+            file.readinto(self.frequencies)
+            file.readinto(self.durations)
+        for i in range(count):
+            raw, start, length = struct.unpack_from("<12sHH", index, i * ENTRY_SIZE)
+            name = raw.rstrip(b"\0").decode()
+            self.melodies[name] = PackedMelody(name, self.frequencies, self.durations,
+                                               start, length)
+
+    def __getitem__(self, name):
+        return self.melodies[name]
+
+    def __contains__(self, name):
+        return name in self.melodies
+
+    def names(self):
+        return list(self.melodies)
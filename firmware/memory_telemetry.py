@@ -0,0 +1,146 @@
+"""
+Heap telemetry for long sessions.
+
+MemoryTelemetry samples gc.mem_free()/gc.mem_alloc() into a ring of
+fixed arrays, probes the largest block that can still be allocated
+(fragmentation), and runs gc.collect() itself at idle moments, timing
+each pause, so the automatic collection rarely lands in the input path.
+A least-squares fit over the samples predicts when free memory runs
+out; if that is less than session_length away, a warning is raised
+once through on_warning(message). The horizon rolls with the clock, so
+a session that runs longer than planned is still covered.
+
+On a host Python without gc.mem_free() it records nothing.
+"""
+import gc
+import time
+from array import array
+
+AVAILABLE = hasattr(gc, "mem_free")
+MIN_TREND_SAMPLES = 8      # Before that a few allocations look like a leak
+
+
+class MemoryTelemetry:
+    """Samples and collects on the caller's schedule, see sample() and collect_if_idle()."""
+
+    def __init__(self, session_length=3 * 3600, history=60, collect_every=30.0,
+                 probe_limit=64 * 1024, on_warning=print):
+        self.session_length = session_length
+        self.epoch = time.monotonic()
+        self.collect_every = collect_every
+        self.probe_limit = probe_limit
+        self.on_warning = on_warning
+        self.times = array("f", [0.0] * history)
+        self.free = array("L", [0] * history)
+        self.samples = 0
+        self.largest_block = 0
+        self.lowest_free = 0xFFFFFFFF
+        self.collections = 0
+        self.pause_total_us = 0
+        self.pause_max_us = 0
+        self.last_collect = time.monotonic()
+        self.slope = 0.0               # Bytes per second, negative while leaking
+        self.exhaustion_in = None      # Seconds until no memory is left, if shrinking
+        self.warned = False
+        if AVAILABLE and hasattr(gc, "threshold"):
+            gc.threshold(-1)           # No allocation-count trigger, collect() does the work
+
+    # === Sampling ===
+
+    def sample(self, now=None, probe=True):
+        """
+        Records free memory, optionally the largest free block, updates the
+        trend. Call it right after collect() so garbage does not count as used.
+        """
+        if not AVAILABLE:
+            return
+        if now is None:
+            now = time.monotonic()
+        free = gc.mem_free()
+        index = self.samples % len(self.free)
+        self.times[index] = now - self.epoch    # Small floats keep array('f') precise
+        self.free[index] = free
+        self.samples += 1
+        if free < self.lowest_free:
+            self.lowest_free = free
+        if probe:
+            self.largest_block = self._largest_block(free)
+        self._update_trend(free)
+
+    def _largest_block(self, free):
+        """Binary search for the biggest bytearray that can still be allocated."""
+        low = 0
+        high = min(free, self.probe_limit)
+        while high - low > 64:
+            size = (low + high) // 2
+            try:
+                block = bytearray(size)
+                del block
+                low = size
+            except MemoryError:
+                high = size
+        return low
+
+    def _update_trend(self, free):
+        count = min(self.samples, len(self.free))
+        if count < MIN_TREND_SAMPLES:
+            return
+        mean_t = mean_f = 0.0
+        for i in range(count):
+            mean_t += self.times[i]
+            mean_f += self.free[i]
+        mean_t /= count
+        mean_f /= count
+        covariance = variance = 0.0
+        for i in range(count):
+            dt = self.times[i] - mean_t
+            covariance += dt * (self.free[i] - mean_f)
+            variance += dt * dt
+        if variance <= 0:
+            return
+        self.slope = covariance / variance
+        if self.slope < 0:
+            self.exhaustion_in = free / -self.slope
+            if not self.warned and self.exhaustion_in < self.session_length:
+                self.warned = True
+                self.on_warning(f"Memory warning: {free} bytes free, losing "
+                                f"{-self.slope:.1f} bytes/s, out of memory in "
+                                f"{self.exhaustion_in / 60:.0f} min")
+        else:
+            self.exhaustion_in = None
+
+    # === Scheduled Collection ===
+
+    def collect(self):
+        """Runs gc.collect() and records how long it paused."""
+        start = time.monotonic_ns()
+        gc.collect()
+        pause = (time.monotonic_ns() - start) // 1000
+        self.collections += 1
+        self.pause_total_us += pause
+        if pause > self.pause_max_us:
+            self.pause_max_us = pause
+        self.last_collect = time.monotonic()
+        return pause
+
+    def collect_if_idle(self, idle, now=None):
+        """Collects when the caller is idle and collect_every seconds have passed."""
+        if now is None:
+            now = time.monotonic()
+        if idle and now - self.last_collect >= self.collect_every:
+            self.collect()
+            return True
+        return False
+
+    def report(self):
+        """One line for the serial console."""
+        if not AVAILABLE:
+            return "memory: gc.mem_free() not available"
+        free = self.free[(self.samples - 1) % len(self.free)] if self.samples else 0
+        mean_pause = self.pause_total_us // self.collections if self.collections else 0
+        line = (f"memory: {free} free (lowest {self.lowest_free}), largest block "
+                f"{self.largest_block}, trend {self.slope:+.1f} B/s, "
+                f"{self.collections} collects, pause mean {mean_pause} us max {self.pause_max_us} us")
+        if self.exhaustion_in is not None:
+            line += f", exhausted in {self.exhaustion_in / 60:.0f} min"
+        return line
@@ -0,0 +1,131 @@
+"""
+Job scheduler that light-sleeps between jobs.
+
+Every periodic job (sensor, display, alert pattern, ...) is registered
+with its period. run() executes the jobs that are due, then puts the
+RP2040 into light sleep until the earliest next deadline with a
+TimeAlarm, plus a PinAlarm for every wake pin (stopwatch button,
+encoder INT) so input still wakes it at once. The time spent asleep is
+measured, so the awake/asleep ratio of a firmware variant can be read
+off the serial console.
+"""
+import time
+import alarm
+
+MIN_SLEEP = 0.005          # Shorter gaps are not worth the sleep/wake overhead
+
+
+class Job:
+    """A periodic job. callback(now) may return the delay until its next run."""
+
+    def __init__(self, name, period, callback):
+        self.name = name
+        self.period = period
+        self.callback = callback
+        self.next_time = 0.0
+        self.runs = 0
+
+
+class WakePin:
+    """A pin that ends the sleep, with the callback that handles it."""
+
+    def __init__(self, pin, value, edge, pull, callback, release):
+        self.pin = pin
+        self.value = value
+        self.edge = edge
+        self.pull = pull
+        self.callback = callback
+        self.release = release
+        self.enabled = True        # False: not armed, e.g. while a held button is polled
+        self.wakes = 0
+
+
+class PowerManager:
+    """Runs the jobs and sleeps in between."""
+
+    def __init__(self):
+        self.jobs = []
+        self.wake_pins = []
+        self.started = None
+        self.asleep = 0.0          # Seconds spent in light sleep
+        self.sleeps = 0
+        self.time_wakes = 0
+
+    def add_job(self, name, period, callback):
+        """Registers callback(now) to run every period seconds, first run at once."""
+        job = Job(name, period, callback)
+        self.jobs.append(job)
+        return job
+
+    def add_wake_pin(self, pin, callback, value=False, edge=False, pull=True, release=None):
+        """
+        Wakes up when pin reaches value (edge=True: changes to value)
+        and calls callback(now). release() is called before each sleep
+        to free the pin if something else has claimed it while awake.
+        """
+        wake = WakePin(pin, value, edge, pull, callback, release)
+        self.wake_pins.append(wake)
+        return wake
+
+    def wake(self, job):
+        """Makes a job due now, e.g. redraw the display after an input."""
+        job.next_time = 0.0
+
+    def run_due(self, now):
+        """Runs every job whose deadline has passed."""
+        for job in self.jobs:
+            if now >= job.next_time:
+                delay = job.callback(now)
+                job.runs += 1
+                job.next_time = now + (job.period if delay is None else delay)
+
+    def next_deadline(self):
+        return min(job.next_time for job in self.jobs)
+
+    def sleep_until(self, deadline):
+        """Light-sleeps until deadline or a wake pin, then handles the pin."""
+        alarms = [alarm.time.TimeAlarm(monotonic_time=deadline)]
+        for wake in self.wake_pins:
+            if not wake.enabled:
+                continue
+            if wake.release is not None:
+                wake.release()
+            alarms.append(alarm.pin.PinAlarm(wake.pin, value=wake.value,
+                                             edge=wake.edge, pull=wake.pull))
+        start = time.monotonic()
+        woken_by = alarm.light_sleep_until_alarms(*alarms)
+        now = time.monotonic()
+        self.asleep += now - start
+        self.sleeps += 1
+        for wake in self.wake_pins:
+            if wake.enabled and woken_by is not None and getattr(woken_by, "pin", None) == wake.pin:
+                wake.wakes += 1
+                wake.callback(now)
+                return
+        self.time_wakes += 1
+
+    def run(self):
+        """Runs the jobs forever."""
+        self.started = time.monotonic()
+        while True:
+            self.run_due(time.monotonic())
+            deadline = self.next_deadline()
+            if deadline - time.monotonic() >= MIN_SLEEP:
+                self.sleep_until(deadline)
+
+    @property
+    def awake_ratio(self):
+        """Fraction of the time since run() started spent awake."""
+        if self.started is None:
+            return 1.0
+        total = time.monotonic() - self.started
+        return 1.0 - self.asleep / total if total > 0 else 1.0
+
+    def report(self):
+        """One line for the serial console."""
+        total = time.monotonic() - self.started if self.started is not None else 0.0
+        awake = total - self.asleep
+        pins = ", ".join(f"{wake.pin} {wake.wakes}" for wake in self.wake_pins)
+        return (f"awake {awake:.1f} s / asleep {self.asleep:.1f} s "
+                f"({100 * self.awake_ratio:.1f} % awake), {self.sleeps} sleeps, "
+                f"wakes: time {self.time_wakes}, {pins}")
@@ -0,0 +1,185 @@
+"""
+Loop-timing profiler with per-stage histograms.
+
+Each stage (AHT20 read, seesaw poll, display print, ...) gets a row
+in preallocated arrays: count, min, max, total and a fixed-bucket
+histogram of its duration in microseconds. Times are taken with
+supervisor.ticks_ms() and adafruit_ticks.ticks_diff(), which stay small
+ints; time.monotonic_ns() would allocate a long int on every call.
+Recording a sample only updates those arrays, so start(), stop() and
+mark() do not grow the heap while the firmware runs. The price is 1 ms
+resolution: a single sample is off by up to a tick, so stages shorter
+than a millisecond only show up in the mean of many samples. Period
+stages record the time between two mark() calls instead, which shows
+how far a 10 Hz task drifts from its target.
+
+    PROFILE_DISPLAY = profiler.stage("display")
+    start = profiler.start()
+    display.print(text)
+    profiler.stop(PROFILE_DISPLAY, start)
+
+dump() prints the table over USB serial; poll() does that every
+dump_every seconds or when "p" is typed on the serial console.
+"""
+import sys
+import time
+from array import array
+from adafruit_ticks import ticks_ms, ticks_diff
+
+try:
+    import supervisor
+except ImportError:
+    supervisor = None
+
+# Histogram bucket upper edges in microseconds (whole ticks), the last bucket is open
+BUCKETS = (1000, 2000, 5000, 10000, 20000, 50000, 100000, 200000, 500000)
+MAX_STAGES = 12
+
+
+def _format_us(us):
+    if abs(us) >= 1000:
+        if us % 1000 == 0:
+            return f"{us // 1000}ms"
+        return f"{us / 1000:.1f}ms"
+    return f"{us}us"
+
+
+class Profiler:
+    """Per-stage timing statistics in fixed arrays."""
+
+    def __init__(self, dump_every=600, max_stages=MAX_STAGES, buckets=BUCKETS):
+        self.dump_every = dump_every
+        self.buckets = buckets
+        self.names = []
+        self.targets = []                # Target period in us for period stages, else 0
+        size = max_stages
+        self.count = array("L", [0] * size)
+        self.minimum = array("L", [0xFFFFFFFF] * size)
+        self.maximum = array("L", [0] * size)
+        self.total_us = array("L", [0] * size)        # Below one second, carried into total_s
+        self.total_s = array("L", [0] * size)
+        self.histogram = array("L", [0] * (size * (len(buckets) + 1)))
+        self.last_mark = [-1] * size     # ticks_ms() of the last mark(), -1 = none yet
+        self.samples = 0
+        self.started = time.monotonic()
+        self.last_dump = self.started
+        self.cost_us = self._calibrate()
+
+    # === Setup ===
+
+    def stage(self, name, period=None):
+        """
+        Adds a stage and returns its index. With period (seconds) it is a
+        period stage: mark() records the interval and the drift from period.
+        """
+        if len(self.names) >= len(self.count):
+            raise ValueError("Too many profiler stages")
+        self.names.append(name)
+        self.targets.append(int(period * 1000000) if period else 0)
+        return len(self.names) - 1
+
+    def _calibrate(self):
+        """Average cost of one start()/stop() pair in microseconds."""
+        rounds = 50
+        spare = len(self.count) - 1
+        begin = time.monotonic_ns()
+        for _ in range(rounds):
+            self.stop(spare, self.start())
+        cost = (time.monotonic_ns() - begin) / rounds / 1000
+        self.reset()
+        return cost
+
+    def reset(self):
+        """Clears all statistics, keeps the stages."""
+        for i in range(len(self.count)):
+            self.count[i] = 0
+            self.minimum[i] = 0xFFFFFFFF
+            self.maximum[i] = 0
+            self.total_us[i] = 0
+            self.total_s[i] = 0
+        for i in range(len(self.histogram)):
+            self.histogram[i] = 0
+        self.samples = 0
+        self.started = time.monotonic()
+
+    # === Recording ===
+
+    def start(self):
+        return ticks_ms()
+
+    def stop(self, stage, start):
+        """Records the time since start() for stage."""
+        self._record(stage, ticks_diff(ticks_ms(), start) * 1000)
+
+    def mark(self, stage):
+        """Records the interval since the previous mark() of a period stage."""
+        now = ticks_ms()
+        last = self.last_mark[stage]
+        self.last_mark[stage] = now
+        if last >= 0:
+            self._record(stage, ticks_diff(now, last) * 1000)
+
+    def _record(self, stage, us):
+        self.samples += 1
+        self.count[stage] += 1
+        if us < self.minimum[stage]:
+            self.minimum[stage] = us
+        if us > self.maximum[stage]:
+            self.maximum[stage] = us
+        total = self.total_us[stage] + us
+        if total >= 1000000:
+            self.total_s[stage] += total // 1000000
+            total %= 1000000
+        self.total_us[stage] = total
+        bucket = 0
+        for edge in self.buckets:
+            if us <= edge:
+                break
+            bucket += 1
+        self.histogram[stage * (len(self.buckets) + 1) + bucket] += 1
+
+    # === Output ===
+
+    def mean_us(self, stage):
+        count = self.count[stage]
+        if not count:
+            return 0
+        return (self.total_s[stage] * 1000000 + self.total_us[stage]) // count
+
+    def overhead(self):
+        """Share of the run time spent recording samples."""
+        elapsed = time.monotonic() - self.started
+        if elapsed <= 0:
+            return 0.0
+        return self.samples * self.cost_us / 1000000 / elapsed
+
+    def dump(self, out=print):
+        """Prints min/mean/max and the histogram of every stage."""
+        elapsed = time.monotonic() - self.started
+        out(f"--- profile after {elapsed:.0f} s, overhead {100 * self.overhead():.2f} % ---")
+        edges = " ".join(f"{'<=' + _format_us(edge):>8}" for edge in self.buckets)
+        out(f"{'stage':<12} {'n':>7} {'min':>8} {'mean':>8} {'max':>8}  {edges} {'more':>8}")
+        width = len(self.buckets) + 1
+        for stage, name in enumerate(self.names):
+            count = self.count[stage]
+            if not count:
+                out(f"{name:<12} {0:>7}")
+                continue
+            bins = " ".join(f"{self.histogram[stage * width + i]:>8}" for i in range(width))
+            line = (f"{name:<12} {count:>7} {_format_us(self.minimum[stage]):>8} "
+                    f"{_format_us(self.mean_us(stage)):>8} {_format_us(self.maximum[stage]):>8}  {bins}")
+            target = self.targets[stage]
+            if target:
+                line += f"  drift {_format_us(self.mean_us(stage) - target)}"
+            out(line)
+
+    def poll(self, now=None):
+        """Dumps every dump_every seconds, or when "p" arrives on the serial console."""
+        if now is None:
+            now = time.monotonic()
+        requested = False
+        if supervisor is not None and supervisor.runtime.serial_bytes_available:
+            requested = sys.stdin.read(1) in ("p", "P")
+        if requested or (self.dump_every and now - self.last_dump >= self.dump_every):
+            self.last_dump = now
+            self.dump()
@@ -0,0 +1,293 @@
+"""
+Fault tolerance for the I2C devices.
+
+In the hot, humid cabin the bus glitches: a transfer fails with
+OSError, or a device that browned out halfway through a byte holds SDA
+low and every transfer after it times out. Without a guard either one
+ends the task that made the transfer.
+
+ResilientI2C stands in for busio.I2C. The drivers are created on it,
+so they keep working when recover() replaces the busio.I2C underneath:
+after RECOVER_AFTER bus errors in a row (a missing device, ENODEV, does
+not count) it releases the pins, clocks SCL until SDA is let go, sends
+a STOP and opens the bus again, then re-initialises every device.
+
+Device is the health of one device: after a failure its next attempt
+waits base_delay, doubling with every failure in a row up to
+max_delay; after max_failures in a row it is re-initialised with its
+init function, on the same backoff. The caller checks available(now)
+before talking to it and reports ok() or failed().
+
+A brownout that resets a device without a failed transfer goes
+unnoticed otherwise: the device answers, only in its power-on state
+(sensor off, no encoder interrupt, display oscillator off). A device
+with a check function has it called every check_interval; when the
+check finds the setup gone, the device is re-initialised at once.
+
+service(now) runs the recovery, the re-initialisations and the checks
+that are due. They block for a few ms and need the bus unlocked, so
+call it between acquisition cycles.
+"""
+import time
+import busio
+import digitalio
+
+ENODEV = 19                # Nothing acknowledged: the device, not the bus
+RECOVER_AFTER = 5          # Bus errors in a row before the bus is recovered
+BASE_DELAY = 0.1           # First backoff after a failure, seconds
+MAX_DELAY = 30.0
+MAX_FAILURES = 3           # Failures in a row before a device is re-initialised
+CHECK_INTERVAL = 10.0      # Setup read-back of a device with a check function
+RECOVERY_DELAY = 1.0       # First backoff after a recovery that did not help
+MAX_RECOVERY_DELAY = 60.0
+CLEAR_PULSES = 9           # A stuck slave lets go of SDA within one byte + ACK
+HALF_CLOCK = 0.00001       # 50 kHz while bit-banging
+
+
+def clear_bus(scl, sda, pulses=CLEAR_PULSES):
+    """
+    Clocks SCL until a device holding SDA low releases it, then sends
+    START and STOP so every device sees an idle bus. The pins must be
+    free. Returns True if SDA is high afterwards.
+    """
+    clock = digitalio.DigitalInOut(scl)
+    data = digitalio.DigitalInOut(sda)
+    try:
+        clock.switch_to_output(True, digitalio.DriveMode.OPEN_DRAIN)
+        data.switch_to_input()                 # The bus pull-ups hold it high
+        for _ in range(pulses):
+            if data.value:
+                break
+            clock.value = False
+            time.sleep(HALF_CLOCK)
+            clock.value = True
+            time.sleep(HALF_CLOCK)
+        data.switch_to_output(False, digitalio.DriveMode.OPEN_DRAIN)   # START
+        time.sleep(HALF_CLOCK)
+        data.value = True                                               # STOP
+        time.sleep(HALF_CLOCK)
+        data.switch_to_input()
+        return data.value
+    finally:
+        clock.deinit()
+        data.deinit()
+
+
+class Device:
+    """Health and backoff of one device, see ResilientI2C.add()."""
+
+    def __init__(self, bus, name, init=None, check=None, base_delay=BASE_DELAY,
+                 max_delay=MAX_DELAY, max_failures=MAX_FAILURES, check_interval=CHECK_INTERVAL):
+        self.bus = bus
+        self.name = name
+        self.init = init               # Called to (re-)initialise the device, may raise
+        self.check = check             # Returns False if the device lost its setup, may raise
+        self.check_interval = check_interval
+        self.next_check = 0.0
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_failures = max_failures
+        self.ready = False             # Initialised and not given up on since
+        self.failures = 0              # In a row
+        self.errors = 0                # In total
+        self.next_attempt = 0.0
+        self.good_at = None            # time.monotonic() of the last success
+
+    def available(self, now):
+        """True if the device may be used now: initialised, not backing off, bus up."""
+        return self.ready and now >= self.next_attempt and self.bus.up
+
+    def ok(self, now):
+        """Reports a successful transfer or reading."""
+        self.failures = 0
+        self.good_at = now
+
+    def failed(self, now, error=None):
+        """Reports a failure: backs off, and after max_failures queues a re-initialisation."""
+        self.failures += 1
+        self.errors += 1
+        self.next_attempt = now + min(self.base_delay * 2 ** (self.failures - 1), self.max_delay)
+        if self.ready and self.failures >= self.max_failures:
+            self.ready = False
+            print(f"{self.name}: {self.failures} failures in a row ({error}), re-initialising")
+
+    def start(self, now):
+        """Runs init on a free bus. Returns True if the device is ready."""
+        try:
+            if self.init is not None:
+                self.init()
+        except (OSError, ValueError, RuntimeError) as e:
+            self.bus.unlock()          # A failed `with` or mux try_lock can leave it held
+            print(f"{self.name}: {e}")
+            self.failed(now, e)
+            self.ready = False
+            return False
+        if self.errors:
+            print(f"{self.name}: ready again")
+        self.ready = True
+        self.failures = 0
+        self.next_check = now + self.check_interval
+        return True
+
+    def verify(self, now):
+        """Runs check on a free bus and re-initialises the device if its setup is gone."""
+        self.next_check = now + self.check_interval
+        try:
+            kept = self.check()
+        except (OSError, ValueError, RuntimeError) as e:
+            self.bus.unlock()
+            self.failed(now, e)
+            return
+        if kept:
+            self.ok(now)
+            return
+        print(f"{self.name}: setup lost (power-on reset), re-initialising")
+        self.errors += 1
+        self.ready = False
+        self.start(now)
+
+
+class ResilientI2C:
+    """
+    busio.I2C that recovers a stuck bus and re-initialises its devices.
+    Forwards try_lock/unlock/scan and the three transfers.
+    """
+
+    def __init__(self, scl, sda, frequency=100000, recover_after=RECOVER_AFTER):
+        self.scl = scl
+        self.sda = sda
+        self.frequency = frequency
+        self.recover_after = recover_after
+        self.devices = []
+        self.failures = 0              # Bus errors in a row
+        self.errors = 0
+        self.recoveries = 0
+        self.recover_pending = False
+        self.next_recovery = 0.0
+        self._recovery_delay = RECOVERY_DELAY
+        self.i2c = busio.I2C(scl, sda, frequency=frequency)
+
+    @property
+    def up(self):
+        """False while a recovery could not open the bus again."""
+        return self.i2c is not None
+
+    def add(self, name, init=None, check=None, **kwargs):
+        """Registers a device, runs its init once and returns its Device."""
+        device = Device(self, name, init, check, **kwargs)
+        self.devices.append(device)
+        device.start(time.monotonic())
+        return device
+
+    # === Recovery ===
+
+    def service(self, now):
+        """
+        Recovers the bus, re-initialises and checks devices when due. The
+        bus must be unlocked.
+        """
+        if self.recover_pending and now >= self.next_recovery:
+            self.recover(now)
+        if not self.up:
+            return
+        for device in self.devices:
+            if not device.ready:
+                if now >= device.next_attempt:
+                    device.start(now)
+            elif device.check is not None and now >= device.next_check \
+                    and now >= device.next_attempt:
+                device.verify(now)
+
+    def recover(self, now):
+        """Clears and reopens the bus, then queues every device for re-initialisation."""
+        self.recoveries += 1
+        if self.i2c is not None:
+            self.i2c.deinit()
+            self.i2c = None
+        released = clear_bus(self.scl, self.sda)
+        try:
+            self.i2c = busio.I2C(self.scl, self.sda, frequency=self.frequency)
+        except (RuntimeError, ValueError) as e:
+            print(f"I2C recovery {self.recoveries} failed: {e}")
+            self.next_recovery = now + self._recovery_delay
+            self._recovery_delay = min(self._recovery_delay * 2, MAX_RECOVERY_DELAY)
+            return
+        print(f"I2C recovery {self.recoveries}: SDA {'released' if released else 'still low'}")
+        self.failures = 0
+        self.recover_pending = False
+        self.next_recovery = now + self._recovery_delay   # Back-to-back recoveries back off
+        self._recovery_delay = min(self._recovery_delay * 2, MAX_RECOVERY_DELAY)
+        for device in self.devices:
+            device.ready = False
+            device.next_attempt = now
+
+    def _failed(self, error):
+        self.errors += 1
+        if error.errno == ENODEV:
+            return
+        self.failures += 1
+        if self.failures >= self.recover_after:
+            self.recover_pending = True
+
+    def _ok(self):
+        if self.failures:
+            self.failures = 0
+        if not self.recover_pending:
+            self._recovery_delay = RECOVERY_DELAY
+
+    # === busio.I2C ===
+
+    def try_lock(self):
+        """Claims the bus. Raises OSError while it is down, so a spinning `with` ends."""
+        if self.i2c is None:
+            raise OSError(5, "I2C bus down")
+        return self.i2c.try_lock()
+
+    def unlock(self):
+        if self.i2c is not None:
+            self.i2c.unlock()
+
+    def scan(self):
+        if self.i2c is None:
+            raise OSError(5, "I2C bus down")
+        return self.i2c.scan()
+
+    def writeto(self, address, buffer, *, start=0, end=None):
+        if end is None:
+            end = len(buffer)
+        try:
+            self.i2c.writeto(address, buffer, start=start, end=end)
+        except OSError as e:
+            self._failed(e)
+            raise
+        self._ok()
+
+    def readfrom_into(self, address, buffer, *, start=0, end=None):
+        if end is None:
+            end = len(buffer)
+        try:
+            self.i2c.readfrom_into(address, buffer, start=start, end=end)
+        except OSError as e:
+            self._failed(e)
+            raise
+        self._ok()
+
+    def writeto_then_readfrom(self, address, buffer_out, buffer_in, *,
+                              out_start=0, out_end=None, in_start=0, in_end=None):
+        if out_end is None:
+            out_end = len(buffer_out)
+        if in_end is None:
+            in_end = len(buffer_in)
+        try:
+            self.i2c.writeto_then_readfrom(address, buffer_out, buffer_in, out_start=out_start,
+                                           out_end=out_end, in_start=in_start, in_end=in_end)
+        except OSError as e:
+            self._failed(e)
+            raise
+        self._ok()
+
+    def report(self):
+        """One line for the serial console."""
+        parts = [f"{device.name} {device.errors}" for device in self.devices]
+        return (f"i2c: {self.errors} errors, {self.recoveries} recoveries; "
+                f"device errors: {', '.join(parts)}")
@@ -0,0 +1,150 @@
+"""
+Dirty-checking front-end for the HT16K33 segment displays.
+
+Seg14x4.print() and the brightness setter each send a full I2C write,
+even when nothing changed. ShadowDisplay keeps a copy of what the
+HT16K33 RAM and brightness register already hold, and only sends the
+span of bytes that differs, or nothing at all.
+
+print_bytes() is the allocation-free path for 14-segment displays: it
+looks the character codes of a bytearray up in the driver's CHARS
+table and writes the segments straight into the display buffer.
+"""
+from adafruit_ht16k33.segments import CHARS
+
+_RAM_SIZE = 16                     # Display RAM bytes per HT16K33
+_FRAME_SIZE = _RAM_SIZE + 1        # Address byte + RAM
+_CMD_BRIGHTNESS = 0xE0
+_CMD_OSCILLATOR_ON = 0x21
+
+
+class ShadowDisplay:
+    """
+    Wraps a Seg14x4/BigSeg7x4 created with auto_write=False.
+    bytes_written counts bytes sent on the bus, bytes_saved counts the
+    bytes a plain auto_write display would have sent on top of that.
+    """
+
+    def __init__(self, display):
+        display.auto_write = False
+        self.display = display
+        devices = display.i2c_device
+        if not isinstance(devices, list):
+            devices = [devices]
+        self._devices = devices
+        self._shadow = bytearray(_RAM_SIZE * len(devices))
+        self._synced = False
+        self._level = None
+        self._out = bytearray(_FRAME_SIZE)
+        self._address = bytearray(1)       # RAM address 0, for verify()
+        self._ram = bytearray(_RAM_SIZE)
+        self.bytes_written = 0
+        self.bytes_saved = 0
+
+    def print(self, value, decimal=0):
+        """Prints the value and sends only the segments that changed."""
+        self.display.print(value, decimal)
+        self.show()
+
+    def print_bytes(self, text):
+        """
+        Shows a bytearray of character codes (see display_format) on a
+        Seg14x4 without creating strings, then sends the change.
+        """
+        display = self.display
+        for index in range(len(text)):
+            code = text[index]
+            if not 32 <= code <= 127:
+                code = 32
+            character = code * 2 - 64
+            display._set_buffer(display._adjusted_index(index * 2), CHARS[1 + character])
+            display._set_buffer(display._adjusted_index(index * 2 + 1), CHARS[character])
+        self.show()
+
+    def fill(self, color):
+        """Fills the whole display and sends the change."""
+        self.display.fill(color)
+        self.show()
+
+    def show(self):
+        """Sends the changed part of the segment buffer to the display."""
+        buffer = self.display._buffer
+        shadow = self._shadow
+        out = self._out
+        devices = self._devices
+        for index in range(len(devices)):   # enumerate() would allocate on every refresh
+            device = devices[index]
+            offset = index * _FRAME_SIZE + 1
+            base = index * _RAM_SIZE
+            first = -1
+            last = -1
+            for i in range(_RAM_SIZE):
+                if not self._synced or buffer[offset + i] != shadow[base + i]:
+                    if first < 0:
+                        first = i
+                    last = i
+            if first < 0:
+                self.bytes_saved += _FRAME_SIZE
+                continue
+            out[0] = first  # HT16K33 RAM address, auto-increments
+            for i in range(first, last + 1):
+                out[i - first + 1] = buffer[offset + i]
+                shadow[base + i] = buffer[offset + i]
+            length = last - first + 2
+            with device:
+                device.write(out, end=length)
+            self.bytes_written += length
+            self.bytes_saved += _FRAME_SIZE - length
+        self._synced = True
+
+    def invalidate(self):
+        """Forgets what the HT16K33 holds: the next show() and brightness are sent in full."""
+        self._synced = False
+        self._level = None
+
+    def restart(self):
+        """
+        Sets a reset HT16K33 up again (oscillator, display on, brightness)
+        and resends the whole segment buffer.
+        """
+        self.invalidate()
+        display = self.display
+        for index in range(len(self._devices)):
+            display._write_cmd(_CMD_OSCILLATOR_ON, index)
+        display.blink_rate = display.blink_rate
+        self.brightness = display.brightness
+        self.show()
+
+    def verify(self):
+        """
+        Reads the HT16K33 RAM back: False if it no longer holds what was
+        sent, as after a power-on reset (which also stops the oscillator).
+        """
+        if not self._synced:
+            return True
+        shadow = self._shadow
+        ram = self._ram
+        devices = self._devices
+        for index in range(len(devices)):
+            with devices[index] as device:
+                device.write_then_readinto(self._address, ram)
+            base = index * _RAM_SIZE
+            for i in range(_RAM_SIZE):
+                if ram[i] != shadow[base + i]:
+                    return False
+        return True
+
+    @property
+    def brightness(self):
+        """The brightness. Range 0.0-1.0"""
+        return self.display.brightness
+
+    @brightness.setter
+    def brightness(self, brightness):
+        level = round(15 * brightness) & 0x0F
+        if level == self._level:
+            self.bytes_saved += len(self._devices)
+            return
+        self._level = level
+        self.display.brightness = brightness
+        self.bytes_written += len(self._devices)
@@ -0,0 +1,270 @@
+"""
+Session logger: fixed-size slots in a preallocated ring file.
+
+Raw (version 1), every slot is one 10-byte record, struct "<HHhHBB":
+    seq          u16  running number, wraps at 65536
+    dt           u16  tenths of a second since the previous record (saturates)
+    temperature  i16  °C x 10
+    humidity     u16  %RH x 10
+    state        u8   STATE_SAFE/WARNING/DANGEROUS, | 0x80 on a session's first record
+    setpoint     u8   target temperature in °C
+
+Compressed (version 3, compress=True), every slot is a tscodec page
+of about 200 readings stored as delta-of-delta times and zig-zag varint
+value changes, 5-10x fewer bytes for the same session. Each flush also
+writes the page still filling to the slot it will end up in, its reading
+count in the page header, so a power cut loses at most the readings since
+the last flush. That slot is rewritten once a flush until the page is
+full: a handful of times at 1 Hz, more at slow sampling.
+
+The file is a 16-byte header ("SLOG", version, slot size, capacity)
+followed by `capacity` slots, created full of 0xFF (empty) so it never
+grows. Slots go round the file, so every part of it is rewritten
+equally often. log() only packs into RAM; flush() writes the batch with
+one seek per contiguous part, no more often than flush_interval.
+
+The default file is sauna.log next to the module. CIRCUITPY is
+read-only for the firmware unless boot.py remounts it; on a read-only
+filesystem the logger disables itself. mount_sd() puts the log on an
+SD card instead.
+"""
+import os
+import struct
+import time
+from tscodec import PageEncoder, PAGE_SIZE
+
+MAGIC = b"SLOG"
+VERSION = 1
+VERSION_PAGES = 3
+HEADER_SIZE = 16
+LOG_SIZE = 320 * 1024      # Bytes of slots, about 9 hours raw at 1 Hz
+RECORD = "<HHhHBB"
+RECORD_SIZE = 10
+SESSION_START = 0x80
+EMPTY_STATE = 0xFF
+
+
+def _default_path():
+    folder = __file__.rsplit("/", 1)[0] if "/" in __file__ else "."
+    return folder + "/sauna.log"
+
+
+def mount_sd(spi, cs, mount_point="/sd"):
+    """Mounts an SD card (adafruit_sdcard) and returns the mount point."""
+    import adafruit_sdcard
+    import digitalio
+    import storage
+    card = adafruit_sdcard.SDCard(spi, digitalio.DigitalInOut(cs))
+    storage.mount(storage.VfsFat(card), mount_point)
+    return mount_point
+
+
+class SessionLogger:
+    """Appends readings to a ring file, batched in RAM between flushes."""
+
+    def __init__(self, path=None, size=LOG_SIZE, batch=None, flush_interval=60.0,
+                 compress=False):
+        self.path = path or _default_path()
+        self.compress = compress
+        self.version = VERSION_PAGES if compress else VERSION
+        self.slot_size = PAGE_SIZE if compress else RECORD_SIZE
+        self.capacity = size // self.slot_size
+        self.flush_interval = flush_interval
+        self.enabled = True
+        self.error = None
+        self.head = 0                  # Slot the next flushed slot goes to
+        self.seq = 0
+        self.flushes = 0
+        self.dropped = 0               # Readings lost because the batch was full
+        if batch is None:
+            batch = 4 if compress else 128          # Over a minute at 0.5 s either way
+        self._batch = bytearray(batch * self.slot_size)
+        self._batch_slots = batch
+        self._pending = 0
+        self._encoder = PageEncoder() if compress else None
+        self._saved = 0                # Readings of the open page already on flash
+        self._last_time = None
+        self._new_session = True
+        self._last_flush = time.monotonic()
+        self._file = None
+        try:
+            self._open()
+        except OSError as e:           # Read-only CIRCUITPY, no card, full disk
+            self._disable(e)
+
+    def _disable(self, error):
+        self.enabled = False
+        self.error = error
+        print(f"Session log disabled: {error}")
+
+    # === File ===
+
+    def _open(self):
+        size = HEADER_SIZE + self.capacity * self.slot_size
+        try:
+            existing = os.stat(self.path)[6]
+        except OSError:
+            existing = -1
+        if existing == size:
+            self._file = open(self.path, "r+b")
+            header = self._file.read(HEADER_SIZE)
+            magic, version, record_size, capacity = struct.unpack_from("<4sBBxxI", header)
+            if (magic, version, record_size, capacity) == (MAGIC, self.version,
+                                                           self.slot_size, self.capacity):
+                self._find_head()
+                return
+            self._file.close()
+        self._create(size)
+
+    def _create(self, size):
+        """Writes the header and fills every slot with 0xFF; a log in another format is lost."""
+        with open(self.path, "wb") as file:
+            header = bytearray(HEADER_SIZE)
+            struct.pack_into("<4sBBxxI", header, 0, MAGIC, self.version, self.slot_size,
+                             self.capacity)
+            file.write(header)
+            chunk = b"\xff" * 512
+            left = size - HEADER_SIZE
+            while left > 0:
+                file.write(chunk if left >= 512 else chunk[:left])
+                left -= 512
+        self._file = open(self.path, "r+b")
+        self.head = 0
+        self.seq = 0
+
+    def _find_head(self):
+        """
+        The head follows the last slot whose successor is empty or out of
+        sequence. Records and page headers both start with the seq and
+        have the state byte at offset 8.
+        """
+        file = self._file
+        slot = bytearray(self.slot_size)
+        previous = None
+        self.head = 0
+        self.seq = 0
+        for index in range(self.capacity):
+            file.readinto(slot)
+            seq = slot[0] | slot[1] << 8
+            if slot[8] == EMPTY_STATE:
+                break
+            if previous is not None and seq != (previous + 1) & 0xFFFF:
+                break
+            previous = seq
+            self.head = (index + 1) % self.capacity
+            self.seq = (seq + 1) & 0xFFFF
+
+    # === Logging ===
+
+    def start_session(self):
+        """Marks the next record as the first of a new session."""
+        self._new_session = True
+
+    def log(self, now, temperature, humidity, state, setpoint):
+        """Packs one reading into RAM, no file access."""
+        if not self.enabled:
+            return
+        if self._last_time is None or self._new_session:
+            dt = 0
+        else:
+            dt = min(int((now - self._last_time) * 10 + 0.5), 0xFFFF)
+        self._last_time = now
+        temperature = max(-32768, min(32767, int(temperature * 10)))
+        humidity = max(0, min(0xFFFF, int(humidity * 10)))
+        setpoint = max(0, min(255, int(setpoint)))
+        if self._new_session:
+            state |= SESSION_START
+            self._new_session = False
+        if self.compress:
+            self._add_to_page(dt, temperature, humidity, state, setpoint)
+            return
+        if self._pending >= self._batch_slots:
+            self.dropped += 1
+            return
+        struct.pack_into(RECORD, self._batch, self._pending * RECORD_SIZE,
+                         self.seq, dt, temperature, humidity, state, setpoint)
+        self.seq = (self.seq + 1) & 0xFFFF
+        self._pending += 1
+
+    def _add_to_page(self, dt, temperature, humidity, state, setpoint):
+        encoder = self._encoder
+        if encoder.readings and not state & SESSION_START:
+            if encoder.add(dt, temperature, humidity, state, setpoint):
+                return
+        if encoder.readings:
+            self._close_page()
+        encoder.start(self.seq, dt, temperature, humidity, state, setpoint)
+        self._saved = 0
+
+    def _close_page(self):
+        """Moves the page into the batch, it is written at the next flush."""
+        encoder = self._encoder
+        if self._pending >= self._batch_slots:
+            self.dropped += encoder.readings
+        else:
+            at = self._pending * PAGE_SIZE
+            self._batch[at:at + PAGE_SIZE] = encoder.page
+            self._pending += 1
+            self.seq = (self.seq + 1) & 0xFFFF
+        encoder.readings = 0
+
+    def flush(self, now=None, force=False):
+        """
+        Writes the batch and the page still filling if flush_interval has
+        passed (or force). Returns True if written.
+        """
+        if not self.enabled:
+            return False
+        if not self._pending and not self._unsaved():
+            return False
+        if now is None:
+            now = time.monotonic()
+        if not force and now - self._last_flush < self.flush_interval:
+            return False
+        try:
+            self._write_batch()
+            if self._unsaved():
+                self._write_open_page()
+        except OSError as e:
+            self._disable(e)
+            return False
+        self._last_flush = now
+        self.flushes += 1
+        return True
+
+    def _write_batch(self):
+        if not self._pending:
+            return
+        file = self._file
+        batch = memoryview(self._batch)
+        size = self.slot_size
+        count = self._pending
+        first = min(count, self.capacity - self.head)
+        file.seek(HEADER_SIZE + self.head * size)
+        file.write(batch[:first * size])
+        if count > first:                          # Wrapped round the end of the file
+            file.seek(HEADER_SIZE)
+            file.write(batch[first * size:count * size])
+        file.flush()
+        self.head = (self.head + count) % self.capacity
+        self._pending = 0
+
+    def _unsaved(self):
+        return self.compress and self._encoder.readings > self._saved
+
+    def _write_open_page(self):
+        """Writes the page still filling at the head; the head stays, the full page goes there too."""
+        file = self._file
+        file.seek(HEADER_SIZE + self.head * PAGE_SIZE)
+        file.write(self._encoder.page)
+        file.flush()
+        self._saved = self._encoder.readings
+
+    def close(self):
+        """Writes everything, the open page too, and closes the file."""
+        if self.enabled and self.compress and self._encoder.readings:
+            self._close_page()
+        self.flush(force=True)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
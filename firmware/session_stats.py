@@ -0,0 +1,103 @@
+"""
+Streaming session statistics in constant memory.
+
+RunningStats keeps count, mean, min, max and Welford's M2 (variance
+without the cancellation of sum/sum-of-squares in 32-bit floats), plus
+the time integral of the value and the time spent above a threshold.
+Between samples the value is taken to hold until the next one, like the
+LEDs do, so the time-weighted mean does not favour the fast samples the
+adaptive sampler takes during heat-up.
+
+SessionStats pairs one for temperature and one for humidity.
+"""
+
+
+class RunningStats:
+    """One value stream, a handful of floats."""
+
+    def __init__(self, threshold=None):
+        self.threshold = threshold     # Time above it is counted, may change any time
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.mean = 0.0
+        self.minimum = None
+        self.maximum = None
+        self._m2 = 0.0
+        self._last_value = None
+        self._last_time = None
+        self._area = 0.0               # Integral of value over time
+        self.duration = 0.0
+        self.time_above = 0.0
+
+    def update(self, now, value):
+        """Adds one sample taken at time.monotonic() now."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+        if self._last_time is not None:
+            dt = now - self._last_time
+            self._area += self._last_value * dt
+            self.duration += dt
+            if self.threshold is not None and self._last_value > self.threshold:
+                self.time_above += dt
+        self._last_value = value
+        self._last_time = now
+
+    @property
+    def variance(self):
+        """Sample variance (n - 1), 0 until there are two samples."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self):
+        return self.variance ** 0.5
+
+    @property
+    def time_weighted_mean(self):
+        """Mean over time, the plain mean until time has passed."""
+        if self.duration > 0:
+            return self._area / self.duration
+        return self.mean
+
+
+class SessionStats:
+    """Temperature and humidity statistics for one session."""
+
+    def __init__(self, temperature_threshold=None, humidity_threshold=None):
+        self.temperature = RunningStats(temperature_threshold)
+        self.humidity = RunningStats(humidity_threshold)
+        self.start_time = None
+
+    def update(self, now, temperature, humidity):
+        if self.start_time is None:
+            self.start_time = now
+        self.temperature.update(now, temperature)
+        self.humidity.update(now, humidity)
+
+    def reset(self):
+        self.temperature.reset()
+        self.humidity.reset()
+        self.start_time = None
+
+    def report(self):
+        """One line for the serial console."""
+        t = self.temperature
+        h = self.humidity
+        if not t.count:
+            return "session: no samples"
+        line = (f"session: {t.count} samples over {t.duration / 60:.0f} min, "
+                f"temperature mean {t.time_weighted_mean:.1f} (min {t.minimum:.1f} max {t.maximum:.1f} "
+                f"sd {t.stdev:.2f}), humidity mean {h.time_weighted_mean:.1f} "
+                f"(min {h.minimum:.1f} max {h.maximum:.1f})")
+        if t.threshold is not None:
+            line += f", {t.time_above / 60:.0f} min above {t.threshold} C"
+        if h.threshold is not None:
+            line += f", {h.time_above / 60:.0f} min above {h.threshold} %RH"
+        return line
@@ -0,0 +1,184 @@
+"""
+Delta-of-delta / zig-zag varint pages for the session log.
+
+A page starts with a full reading, later readings are stored as changes:
+
+    header  "<HHhHBBHBB": page seq, readings, temperature x10, humidity x10,
+            state (| 0x80 when a session starts here), set-point, dt,
+            control bytes, varint bytes
+    then    one control byte per reading, or per run of unchanged readings,
+            growing up from the header
+    and     the varints, growing down from the end of the page
+
+Control byte, bit 7 clear:
+    bits 0-1  time delta-of-delta  0 = none, 1 = +1, 2 = -1, 3 = varint follows
+    bits 2-3  temperature delta    (same codes)
+    bits 4-5  humidity delta       (same codes)
+    bit 6     state and set-point varints follow
+    varints are zig-zag encoded, in the order time, temperature, humidity,
+    then state and set-point as they are; each byte of the varint area is
+    written below the one before
+Control byte, bit 7 set:
+    (byte & 0x7F) + 1 readings with no change at all, same dt as before
+
+Times are tenths of a second since the previous reading, values tenths
+of a unit, so a steady sauna sampled at a fixed rate costs a byte or
+less per reading against 10 for a raw record. Unused page bytes stay
+0xFF. Pages are independent: a lost page loses only its own readings.
+With the two counts in the header a reader finds the control bytes and
+the varints of every page without parsing them, so tools/saunalog.py
+decodes all pages at once with array operations.
+"""
+import struct
+
+PAGE_SIZE = 240
+PAGE_HEADER = "<HHhHBBHBB"
+PAGE_HEADER_SIZE = 14
+_CONTROLS_AT = 12          # Header offsets of the two counts
+_VARINTS_AT = 13
+SESSION_START = 0x80
+MAX_READINGS = 0xFFFF
+RUN = 0x80
+MAX_RUN = 128
+CHANGED = 0x40
+
+_ZERO = 0
+_PLUS_ONE = 1
+_MINUS_ONE = 2
+_VARINT = 3
+
+
+def zigzag(value):
+    """Signed to unsigned, small magnitudes stay small: 0, -1, 1, -2 ... -> 0, 1, 2, 3 ..."""
+    return (value << 1) ^ (value >> 31)
+
+
+def _varint_size(value):
+    size = 1
+    while value >= 0x80:
+        value >>= 7
+        size += 1
+    return size
+
+
+def _code(delta):
+    if delta == 0:
+        return _ZERO
+    if delta == 1:
+        return _PLUS_ONE
+    if delta == -1:
+        return _MINUS_ONE
+    return _VARINT
+
+
+class PageEncoder:
+    """
+    Streams readings into one page buffer. start() writes the header,
+    add() appends a reading and returns False when the page is full;
+    then the caller stores the page and calls start() again.
+    """
+
+    def __init__(self, page_size=PAGE_SIZE):
+        self.page = bytearray(b"\xff" * page_size)
+        self.readings = 0
+        self.used = 0              # End of the control bytes
+        self.tail = page_size      # Start of the varints
+        self._dt = 0
+        self._temperature = 0
+        self._humidity = 0
+        self._state = 0
+        self._setpoint = 0
+        self._run_at = -1          # Offset of the run byte that can still grow
+
+    def start(self, seq, dt, temperature, humidity, state, setpoint):
+        """Opens a page with a full reading; state | SESSION_START marks a new session."""
+        page = self.page
+        for i in range(len(page)):
+            page[i] = 0xFF
+        struct.pack_into(PAGE_HEADER, page, 0, seq, 1, temperature, humidity,
+                         state, setpoint, dt, 0, 0)
+        self.readings = 1
+        self.used = PAGE_HEADER_SIZE
+        self.tail = len(page)
+        self._dt = dt
+        self._temperature = temperature
+        self._humidity = humidity
+        self._state = state & ~SESSION_START
+        self._setpoint = setpoint
+        self._run_at = -1
+
+    def add(self, dt, temperature, humidity, state, setpoint):
+        """Appends one reading (integers, tenths), False if it does not fit."""
+        if self.readings >= MAX_READINGS:
+            return False
+        page = self.page
+        dod = dt - self._dt
+        dtemp = temperature - self._temperature
+        dhumi = humidity - self._humidity
+        changed = state != self._state or setpoint != self._setpoint
+        if not (dod or dtemp or dhumi or changed):
+            if self._run_at >= 0 and page[self._run_at] < RUN + MAX_RUN - 1:
+                page[self._run_at] += 1
+            elif self.used < self.tail:
+                self._run_at = self.used
+                page[self.used] = RUN
+                self.used += 1
+            else:
+                return False
+            self._count()
+            return True
+
+        dod_code = _code(dod)
+        temp_code = _code(dtemp)
+        humi_code = _code(dhumi)
+        size = 1
+        if changed:
+            size += _varint_size(state) + _varint_size(setpoint)
+        if dod_code == _VARINT:
+            size += _varint_size(zigzag(dod))
+        if temp_code == _VARINT:
+            size += _varint_size(zigzag(dtemp))
+        if humi_code == _VARINT:
+            size += _varint_size(zigzag(dhumi))
+        if self.used + size > self.tail:
+            return False
+
+        page[self.used] = dod_code | temp_code << 2 | humi_code << 4 | (CHANGED if changed else 0)
+        self.used += 1
+        if dod_code == _VARINT:
+            self._put_varint(zigzag(dod))
+        if temp_code == _VARINT:
+            self._put_varint(zigzag(dtemp))
+        if humi_code == _VARINT:
+            self._put_varint(zigzag(dhumi))
+        if changed:
+            self._put_varint(state)
+            self._put_varint(setpoint)
+        self._run_at = -1
+        self._dt = dt
+        self._temperature = temperature
+        self._humidity = humidity
+        self._state = state
+        self._setpoint = setpoint
+        self._count()
+        return True
+
+    def _count(self):
+        """One more reading: updates the counts in the header."""
+        page = self.page
+        self.readings += 1
+        struct.pack_into("<H", page, 2, self.readings)
+        page[_CONTROLS_AT] = self.used - PAGE_HEADER_SIZE
+        page[_VARINTS_AT] = len(page) - self.tail
+
+    def _put_varint(self, value):
+        """Writes a varint below the previous one, its bytes running downwards."""
+        page = self.page
+        at = self.tail
+        while value >= 0x80:
+            at -= 1
+            page[at] = (value & 0x7F) | 0x80
+            value >>= 7
+        at -= 1
+        page[at] = value
+        self.tail = at
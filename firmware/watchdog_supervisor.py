@@ -0,0 +1,160 @@
+"""
+Hardware watchdog fed only while every task is alive.
+
+The RP2040 watchdog resets the board unless it is fed within `timeout`
+(at most 8.3 s). WatchdogSupervisor feeds it from its own task, and
+only while every registered task has checked in within its deadline:
+a task that hangs, dies or is never scheduled again stops the feeding
+and the board resets, so a stuck buzzer or a silent alarm does not
+last longer than deadline + timeout.
+
+Before it stops feeding, the supervisor writes which task missed its
+deadline into microcontroller.nvm (a few bytes, once per reset, so the
+flash does not wear). A loop blocked inside a driver call cannot write
+anything: a watchdog reset without a record means the whole loop hung.
+After the reboot the record is read back together with
+microcontroller.cpu.reset_reason, see report().
+
+NVM record at nvm_offset, 24 bytes:
+    magic "SSwd", cause (0 none, 1 missed deadline, 2 crash), pad,
+    resets (uint16, watchdog resets so far), uptime (uint32 s), task (12 bytes)
+"""
+import struct
+import time
+import microcontroller
+from watchdog import WatchDogMode
+
+WATCHDOG_TIMEOUT = 8.0     # RP2040 maximum is ~8.3 s
+CHECK_INTERVAL = 1.0
+NVM_OFFSET = 0
+RECORD = "<4sBxHI12s"
+RECORD_SIZE = struct.calcsize(RECORD)
+MAGIC = b"SSwd"
+CAUSE_NONE = 0
+CAUSE_MISSED = 1
+CAUSE_CRASH = 2
+_CAUSES = ("no record", "missed its deadline", "crashed")
+
+
+class WatchdogSupervisor:
+    """Per-task heartbeats in front of microcontroller.watchdog."""
+
+    def __init__(self, timeout=WATCHDOG_TIMEOUT, check_interval=CHECK_INTERVAL,
+                 nvm_offset=NVM_OFFSET):
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self.nvm_offset = nvm_offset
+        self.names = []
+        self.deadlines = []
+        self.last = []                 # time.monotonic() of each task's last check-in
+        self.running = False
+        self.tripped = False           # Stopped feeding, the reset is coming
+        self._last_check = 0.0
+        self.reset_reason = microcontroller.cpu.reset_reason
+        # What the record said at boot: cause, task and uptime of the last recorded miss
+        self.resets, self.cause, self.task, self.uptime = self._load()
+
+    def register(self, name, deadline):
+        """Adds a task that must check in every deadline seconds. Returns its handle."""
+        self.names.append(name)
+        self.deadlines.append(deadline)
+        self.last.append(time.monotonic())
+        return len(self.names) - 1
+
+    def checkin(self, handle, now):
+        """Called by the task on every pass of its loop."""
+        self.last[handle] = now
+
+    # === Watchdog ===
+
+    def start(self, now):
+        """Arms the hardware watchdog; from here on it must be fed."""
+        for handle in range(len(self.last)):
+            self.last[handle] = now
+        self._last_check = now
+        watchdog = microcontroller.watchdog
+        watchdog.timeout = self.timeout
+        watchdog.mode = WatchDogMode.RESET
+        watchdog.feed()
+        self.running = True
+
+    def stop(self):
+        """Disarms the watchdog, e.g. before dropping to the REPL."""
+        if self.running:
+            microcontroller.watchdog.deinit()
+            self.running = False
+
+    def check(self, now):
+        """Feeds the watchdog if every task is on time. Returns True if it was fed."""
+        if not self.running or self.tripped:
+            return False
+        if now - self._last_check > 2 * self.check_interval:
+            # The whole loop stalled (and still beat the hardware timeout):
+            # not one task's fault, so every deadline starts over
+            for handle in range(len(self.last)):
+                self.last[handle] = now
+        self._last_check = now
+        for handle in range(len(self.last)):
+            if now - self.last[handle] > self.deadlines[handle]:
+                name = self.names[handle]
+                print(f"Watchdog: task {name} missed its {self.deadlines[handle]:.0f} s "
+                      f"deadline, resetting in {self.timeout:.0f} s")
+                self._store(CAUSE_MISSED, name, now)
+                self.tripped = True
+                return False
+        microcontroller.watchdog.feed()
+        return True
+
+    def record_crash(self, error):
+        """Stores an exception that ended the tasks; the watchdog resets the board."""
+        self._store(CAUSE_CRASH, type(error).__name__, time.monotonic())
+        self.tripped = True
+
+    async def run(self):
+        """asyncio task that checks and feeds every check_interval."""
+        import asyncio
+        while True:
+            self.check(time.monotonic())
+            await asyncio.sleep(self.check_interval)
+
+    # === NVM Record ===
+
+    def _load(self):
+        """Reads the record; counts and clears it after a watchdog reset."""
+        nvm = microcontroller.nvm
+        if nvm is None or len(nvm) < self.nvm_offset + RECORD_SIZE:
+            return 0, CAUSE_NONE, None, 0
+        start = self.nvm_offset
+        magic, cause, resets, uptime, task = struct.unpack(
+            RECORD, bytes(nvm[start:start + RECORD_SIZE]))
+        if magic != MAGIC:
+            magic, cause, resets, uptime, task = MAGIC, CAUSE_NONE, 0, 0, b""
+        task = task.rstrip(b"\x00").decode() or None
+        if self.reset_reason == microcontroller.ResetReason.WATCHDOG:
+            resets += 1
+            self._write(CAUSE_NONE, resets, 0, b"")    # Counted, ready for the next one
+        elif cause != CAUSE_NONE:
+            # Recorded, but the board was reset some other way before the watchdog fired
+            self._write(CAUSE_NONE, resets, 0, b"")
+        return resets, cause, task, uptime
+
+    def _store(self, cause, task, now):
+        self._write(cause, self.resets, int(now), task.encode()[:12])
+
+    def _write(self, cause, resets, uptime, task):
+        nvm = microcontroller.nvm
+        if nvm is None:
+            return
+        start = self.nvm_offset
+        nvm[start:start + RECORD_SIZE] = struct.pack(
+            RECORD, MAGIC, cause, resets & 0xFFFF, uptime & 0xFFFFFFFF, task)
+
+    def report(self):
+        """What caused the last reset, for the serial console after boot."""
+        reason = str(self.reset_reason).split(".")[-1]
+        line = f"reset: {reason}, {self.resets} watchdog resets so far"
+        if self.cause != CAUSE_NONE:
+            line += f"; task {self.task} {_CAUSES[self.cause]} after {self.uptime} s"
+        elif reason == "WATCHDOG":
+            line += "; no task missed its deadline: the whole loop hung"
+        return line
@@ -0,0 +1,209 @@
+"""
+Several AHT20s behind a TCA9548A I2C multiplexer, one per zone.
+
+All AHT20s answer at 0x38, so each sits on its own mux channel, the
+main one included: with a channel selected, an AHT20 on the main bus
+would answer together with it. The mux is at 0x71 because the HT16K33
+display has 0x70 (solder the A0 jumper on the mux).
+
+cycle() runs inside an acquisition cycle, with the bus already locked:
+for every zone that is due it selects the channel, collects the frame
+triggered by an earlier cycle and triggers the next one. All sensors
+convert at the same time between cycles, so N zones cost N short
+transfers, not N conversions. The reference zone is sampled when the
+caller asks (the adaptive sampler), the others every `interval`.
+
+Each zone keeps its own health: a failed transfer, a conversion that
+never ends, a lost calibration or an impossible value count as a
+failure. After MAX_FAILURES in a row the zone is FAILED and retry()
+re-initialises it every retry_interval. A zone without a frame for
+stale_after seconds is STALE. If the reference zone fails, the first
+healthy zone takes its place.
+"""
+import adafruit_tca9548a
+from aht20_reader import AHT20Reader, CONVERSION_TIME, STATUS_CALIBRATED
+
+MUX_ADDRESS = 0x71
+ZONE_OK = 0
+ZONE_STALE = 1
+ZONE_FAILED = 2
+MAX_FAILURES = 3
+BUSY_TIMEOUT = 0.5         # A conversion still running after this is a failure
+MIN_TEMPERATURE = -40
+MAX_TEMPERATURE = 125      # The AHT20's range; anything else is a bad frame
+_DESELECT = b"\x00"
+
+
+def mux_present(i2c, address=MUX_ADDRESS):
+    """True if a multiplexer answers at address."""
+    while not i2c.try_lock():
+        pass
+    try:
+        return address in i2c.scan()
+    finally:
+        i2c.unlock()
+
+
+class Zone:
+    """One AHT20 on one mux channel."""
+
+    def __init__(self, label, channel):
+        self.label = label             # Display character code, e.g. ord("B")
+        self.channel = channel
+        self.reader = None             # AHT20Reader, None while failed
+        self.temperature = None
+        self.humidity = None
+        self.measured_at = None
+        self.failures = 0              # In a row
+        self.errors = 0                # In total
+        self.next_time = 0.0           # Next sample (or retry, while failed)
+        self.select = bytes((1 << channel,))
+
+
+class ZoneSensors:
+    """
+    The AHT20 zones behind one mux.
+    zones is a sequence of (label, channel); reference is an index into it.
+    """
+
+    def __init__(self, i2c, zones, reference=0, mux_address=MUX_ADDRESS, interval=5.0,
+                 stale_after=30.0, retry_interval=30.0):
+        self.mux = adafruit_tca9548a.TCA9548A(i2c, mux_address)
+        self.mux_address = mux_address
+        self.interval = interval
+        self.stale_after = stale_after
+        self.retry_interval = retry_interval
+        self.zones = [Zone(label, channel) for label, channel in zones]
+        self._reference = self.zones[reference]
+        for zone in self.zones:
+            self._start(zone, 0.0)
+
+    def _start(self, zone, now):
+        """Resets and calibrates the zone's AHT20 (blocking, bus must be free)."""
+        try:
+            zone.reader = AHT20Reader(self.mux[zone.channel])
+        except (OSError, ValueError, RuntimeError) as e:
+            self.mux.i2c.unlock()      # The mux channel's try_lock keeps it if its select fails
+            print(f"Zone {chr(zone.label)} (channel {zone.channel}): {e}")
+            zone.reader = None
+            zone.errors += 1
+            zone.failures = MAX_FAILURES
+            zone.next_time = now + self.retry_interval
+            return
+        zone.failures = 0
+        zone.next_time = now
+
+    # === Health ===
+
+    def state(self, zone, now):
+        if zone.reader is None:
+            return ZONE_FAILED
+        if zone.measured_at is None or now - zone.measured_at > self.stale_after:
+            return ZONE_STALE
+        return ZONE_OK
+
+    @property
+    def reference(self):
+        """The zone that drives the sauna state: the configured one unless it failed."""
+        if self._reference.reader is not None:
+            return self._reference
+        for zone in self.zones:
+            if zone.reader is not None and zone.measured_at is not None:
+                return zone
+        return self._reference
+
+    def _fail(self, zone, now):
+        zone.failures += 1
+        zone.errors += 1
+        if zone.reader is not None:
+            zone.reader.pending = False
+        if zone.failures >= MAX_FAILURES:
+            zone.reader = None
+            zone.next_time = now + self.retry_interval
+            print(f"Zone {chr(zone.label)} (channel {zone.channel}) failed")
+
+    def retry(self, now):
+        """Re-initialises failed zones that are due; call it outside an acquisition cycle."""
+        for zone in self.zones:
+            if zone.reader is None and now >= zone.next_time:
+                self._start(zone, now)
+
+    # === Acquisition ===
+
+    def _wants(self, zone, now, climate, reference):
+        """(collect, trigger) for one zone."""
+        reader = zone.reader
+        if reader is None:
+            return False, False
+        collect = reader.pending and now - reader.triggered_at >= CONVERSION_TIME
+        if reader.pending:
+            return collect, False
+        if zone is reference:
+            return False, climate
+        return False, now >= zone.next_time
+
+    def due(self, now, climate):
+        """True if cycle() would talk to any zone."""
+        reference = self.reference
+        for zone in self.zones:
+            collect, trigger = self._wants(zone, now, climate, reference)
+            if collect or trigger:
+                return True
+        return False
+
+    def cycle(self, bus, now, climate):
+        """
+        One pass over the zones on a locked bus. climate asks for a new
+        reference sample. Returns True if the reference zone has a new frame.
+        """
+        reference = self.reference
+        fresh = False
+        selected = False
+        for zone in self.zones:
+            collect, trigger = self._wants(zone, now, climate, reference)
+            if not (collect or trigger):
+                continue
+            reader = zone.reader
+            try:
+                bus.writeto(self.mux_address, zone.select)
+                selected = True
+                if collect:
+                    if reader.poll(bus):
+                        if self._accept(zone, now):
+                            fresh = fresh or zone is reference
+                    elif now - reader.triggered_at > BUSY_TIMEOUT:
+                        self._fail(zone, now)
+                if trigger:
+                    reader.trigger(bus)
+            except OSError:
+                self._fail(zone, now)
+        if selected:
+            try:
+                bus.writeto(self.mux_address, _DESELECT)
+            except OSError:
+                pass
+        return fresh
+
+    def _accept(self, zone, now):
+        """Checks a collected frame, returns True if it is good."""
+        reader = zone.reader
+        temperature = reader.last_temperature
+        if not reader.last_status & STATUS_CALIBRATED or \
+                not MIN_TEMPERATURE <= temperature <= MAX_TEMPERATURE:
+            self._fail(zone, now)
+            return False
+        zone.temperature = temperature
+        zone.humidity = reader.last_relative_humidity
+        zone.measured_at = now
+        zone.failures = 0
+        zone.next_time = now + self.interval
+        return True
+
+    def report(self, now):
+        """One line for the serial console."""
+        parts = []
+        for zone in self.zones:
+            state = ("ok", "stale", "FAILED")[self.state(zone, now)]
+            value = "--" if zone.temperature is None else f"{zone.temperature:.1f}"
+            parts.append(f"{chr(zone.label)}={value} ({state}, {zone.errors} errors)")
+        return "zones: " + ", ".join(parts)
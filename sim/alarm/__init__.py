@@ -0,0 +1,52 @@
+"""
+Simulated `alarm` module: light sleep only.
+
+light_sleep_until_alarms() advances time in SLEEP_STEP slices until a
+TimeAlarm is due or a PinAlarm pin reaches its value, and reports the
+sleep as "sleep" events so EnergyMeter can charge light-sleep current.
+Pins given to a PinAlarm must not be claimed, as on the device.
+"""
+import time as _time
+
+from simulator import events
+from alarm import pin, time
+
+SLEEP_STEP = 0.01
+
+wake_alarm = None
+
+
+def light_sleep_until_alarms(*alarms):
+    """Sleeps until one of the alarms triggers and returns it."""
+    global wake_alarm
+    if not alarms:
+        raise ValueError("No alarms set")
+    pin_alarms = [item for item in alarms if isinstance(item, pin.PinAlarm)]
+    for item in pin_alarms:
+        if item.pin.owner is not None:
+            raise ValueError(f"{item.pin.name} in use")
+        item._arm()
+    events.emit("sleep", None, True)
+    try:
+        triggered = None
+        while triggered is None:
+            for item in alarms:
+                if item._triggered(_time.monotonic()):
+                    triggered = item
+                    break
+            else:
+                deadlines = [item.monotonic_time for item in alarms
+                             if isinstance(item, time.TimeAlarm)]
+                step = SLEEP_STEP
+                if deadlines:
+                    step = max(0.0, min(step, min(deadlines) - _time.monotonic()))
+                _time.sleep(step or 0.0001)
+    finally:
+        for item in pin_alarms:
+            item._disarm()
+        events.emit("sleep", None, False)
+    wake_alarm = triggered
+    return triggered
+
+
+__all__ = ["light_sleep_until_alarms", "pin", "time", "wake_alarm"]
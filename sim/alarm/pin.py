@@ -0,0 +1,30 @@
+"""Simulated `alarm.pin`."""
+
+
+class PinAlarm:
+    """Triggers on a pin level, or with edge=True on a change to that level."""
+
+    def __init__(self, pin, value, edge=False, pull=False):
+        self.pin = pin
+        self.value = value
+        self.edge = edge
+        self.pull = pull
+        self._armed_level = None
+
+    def _arm(self):
+        if self.pull:
+            self.pin.pull = "down" if self.value else "up"
+        self._armed_level = self.pin.value
+
+    def _disarm(self):
+        if self.pull:
+            self.pin.pull = None
+
+    def _triggered(self, now):
+        level = self.pin.value
+        if self.edge:
+            if level != self._armed_level:
+                self._armed_level = level
+                return level == self.value
+            return False
+        return level == self.value
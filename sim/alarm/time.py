@@ -0,0 +1,16 @@
+"""Simulated `alarm.time`."""
+import time as _time
+
+
+class TimeAlarm:
+    """Triggers at a time.monotonic() value or an epoch time."""
+
+    def __init__(self, *, monotonic_time=None, epoch_time=None):
+        if (monotonic_time is None) == (epoch_time is None):
+            raise ValueError("Provide exactly one of monotonic_time or epoch_time")
+        if epoch_time is not None:
+            monotonic_time = _time.monotonic() + epoch_time - _time.time()
+        self.monotonic_time = monotonic_time
+
+    def _triggered(self, now):
+        return now >= self.monotonic_time
@@ -0,0 +1,25 @@
+"""Simulated `analogio` module."""
+
+
+class AnalogIn:
+    """Reads the 16-bit value set on a simulated pin."""
+
+    def __init__(self, pin):
+        pin.claim(self)
+        self._pin = pin
+        self.reference_voltage = 3.3
+
+    def deinit(self):
+        if self._pin is not None:
+            self._pin.release()
+            self._pin = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.deinit()
+
+    @property
+    def value(self):
+        return self._pin.analog
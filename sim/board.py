@@ -0,0 +1,45 @@
+"""Simulated `board` module of the Adafruit Feather RP2040."""
+from microcontroller import pin
+
+board_id = "adafruit_feather_rp2040"
+
+A0 = pin.GPIO26
+A1 = pin.GPIO27
+A2 = pin.GPIO28
+A3 = pin.GPIO29
+D24 = pin.GPIO24
+D25 = pin.GPIO25
+SCK = pin.GPIO18
+MOSI = pin.GPIO19
+MISO = pin.GPIO20
+RX = pin.GPIO1
+TX = pin.GPIO0
+D4 = pin.GPIO6
+SDA = pin.GPIO2
+SCL = pin.GPIO3
+D5 = pin.GPIO7
+D6 = pin.GPIO8
+D9 = pin.GPIO9
+D10 = pin.GPIO10
+D11 = pin.GPIO11
+D12 = pin.GPIO12
+D13 = pin.GPIO13
+LED = pin.GPIO13
+NEOPIXEL = pin.GPIO16
+
+# Report pins by their board names
+for _name in ("A0", "A1", "A2", "A3", "D24", "D25", "SCK", "MOSI", "MISO", "RX", "TX",
+              "D4", "SDA", "SCL", "D5", "D6", "D9", "D10", "D11", "D12", "D13", "NEOPIXEL"):
+    globals()[_name].name = _name
+del _name
+
+_i2c = None
+
+
+def I2C():
+    """Returns the board's default I2C bus (SCL/SDA), creating it once."""
+    global _i2c
+    if _i2c is None:
+        import busio
+        _i2c = busio.I2C(SCL, SDA)
+    return _i2c
@@ -0,0 +1,74 @@
+"""Simulated `busio` module. Only I2C is provided."""
+from simulator.hardware import hardware
+
+
+class I2C:
+    """I2C controller connected to the simulated bus."""
+
+    def __init__(self, scl, sda, *, frequency=100000, timeout=255):
+        scl.claim(self)
+        try:
+            sda.claim(self)
+        except ValueError:
+            scl.release()
+            raise
+        self._pins = (scl, sda)
+        self._bus = hardware.bus
+        self._locked = False
+        self.frequency = frequency
+
+    def deinit(self):
+        """Releases SCL and SDA."""
+        for pin in self._pins:
+            if pin.owner is self:
+                pin.release()
+        self._bus = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.deinit()
+
+    def try_lock(self):
+        """Claims the bus, returns False if it is already locked."""
+        if self._locked:
+            return False
+        self._locked = True
+        return True
+
+    def unlock(self):
+        """Releases the bus lock."""
+        self._locked = False
+
+    def _check(self):
+        if self._bus is None:
+            raise ValueError("Object has been deinitialized and can no longer be used.")
+        if not self._locked:
+            raise RuntimeError("Function requires lock")
+
+    def scan(self):
+        """Returns the addresses of all devices that respond."""
+        self._check()
+        return self._bus.scan()
+
+    def writeto(self, address, buffer, *, start=0, end=None):
+        """Writes buffer[start:end] to the device."""
+        self._check()
+        self._bus.transfer(address, bytes(buffer[start:end]))
+
+    def readfrom_into(self, address, buffer, *, start=0, end=None):
+        """Reads into buffer[start:end] from the device."""
+        self._check()
+        if end is None:
+            end = len(buffer)
+        buffer[start:end] = self._bus.transfer(address, b"", end - start)
+
+    def writeto_then_readfrom(self, address, buffer_out, buffer_in, *,
+                              out_start=0, out_end=None, in_start=0, in_end=None):
+        """Writes then reads with a repeated start, like the device does."""
+        self._check()
+        if in_end is None:
+            in_end = len(buffer_in)
+        out_data = bytes(buffer_out[out_start:out_end])
+        buffer_in[in_start:in_end] = self._bus.transfer(address, out_data, in_end - in_start)
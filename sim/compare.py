@@ -0,0 +1,51 @@
+"""
+Ranks firmware variants by their estimated energy use.
+
+    python sim/compare.py firmware/Energy-testing/*.py --seconds 3600
+
+Each script runs in its own simulator process on the virtual clock,
+with the same sauna model and scenario, and the variants are listed
+from the lowest estimated mAh per hour up.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+RUN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "run.py")
+
+
+def measure(script, seconds, scenario=None):
+    """Runs one variant and returns its energy report."""
+    command = [sys.executable, RUN, script, "--virtual", "--seconds", str(seconds),
+               "--energy-json"]
+    if scenario:
+        command += ["--scenario", scenario]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{script} failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("scripts", nargs="+", help="firmware variants to compare")
+    parser.add_argument("--seconds", type=float, default=3600,
+                        help="virtual seconds to run each variant")
+    parser.add_argument("--scenario", help="scenario file passed to every run")
+    args = parser.parse_args(argv)
+
+    reports = [(script, measure(script, args.seconds, args.scenario))
+               for script in args.scripts]
+    reports.sort(key=lambda item: item[1]["mah_per_hour"])
+    print(f"{'variant':<40} {'mAh/h':>8} {'i2c tx':>9} {'i2c bytes':>10}")
+    for script, report in reports:
+        transactions = sum(d["transactions"] for d in report["i2c"].values())
+        transferred = sum(d["bytes"] for d in report["i2c"].values())
+        print(f"{os.path.relpath(script):<40} {report['mah_per_hour']:>8.2f} "
+              f"{transactions:>9} {transferred:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Simulated `digitalio` module."""
+
+
+class Direction:
+    """Defines the direction of a digital pin."""
+
+
+Direction.INPUT = Direction()
+Direction.OUTPUT = Direction()
+
+
+class Pull:
+    """Defines the pull of a digital input pin."""
+
+    def __init__(self, name):
+        self.name = name
+
+
+Pull.UP = Pull("up")
+Pull.DOWN = Pull("down")
+
+
+class DriveMode:
+    """Defines the drive mode of a digital output pin."""
+
+
+DriveMode.PUSH_PULL = DriveMode()
+DriveMode.OPEN_DRAIN = DriveMode()
+
+
+class DigitalInOut:
+    """Digital input and output of a simulated pin."""
+
+    def __init__(self, pin):
+        pin.claim(self)
+        self._pin = pin
+        self._direction = Direction.INPUT
+        self._pull = None
+        self.drive_mode = DriveMode.PUSH_PULL
+
+    def deinit(self):
+        if self._pin is not None:
+            self._pin.release()
+            self._pin = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.deinit()
+
+    def switch_to_output(self, value=False, drive_mode=DriveMode.PUSH_PULL):
+        self._direction = Direction.OUTPUT
+        self._pull = None
+        self._pin.pull = None
+        self.drive_mode = drive_mode
+        self._pin.drive(value)
+
+    def switch_to_input(self, pull=None):
+        self._direction = Direction.INPUT
+        self._pin.output = None
+        self.pull = pull
+
+    @property
+    def direction(self):
+        return self._direction
+
+    @direction.setter
+    def direction(self, direction):
+        if direction is Direction.OUTPUT:
+            self.switch_to_output()
+        else:
+            self.switch_to_input()
+
+    @property
+    def value(self):
+        return self._pin.value
+
+    @value.setter
+    def value(self, value):
+        if self._direction is not Direction.OUTPUT:
+            raise AttributeError("Cannot set value when direction is input.")
+        self._pin.drive(value)
+
+    @property
+    def pull(self):
+        return self._pull
+
+    @pull.setter
+    def pull(self, pull):
+        if self._direction is Direction.OUTPUT:
+            raise AttributeError("Pull not used when direction is output.")
+        self._pull = pull
+        self._pin.pull = pull.name if pull is not None else None
@@ -0,0 +1,124 @@
+"""
+Simulated `keypad` module.
+
+Keys watches its pins for changes instead of scanning them, so every
+press a scenario makes is queued, like the background scan on the
+device for presses longer than the debounce interval.
+"""
+import time
+
+from simulator import events
+
+_TICKS_PERIOD = 1 << 29
+
+
+def _ticks_ms():
+    return int(time.monotonic() * 1000) % _TICKS_PERIOD
+
+
+class Event:
+    """A key transition."""
+
+    def __init__(self, key_number=0, pressed=True, timestamp=None):
+        self.key_number = key_number
+        self.pressed = pressed
+        self.timestamp = _ticks_ms() if timestamp is None else timestamp
+
+    @property
+    def released(self):
+        return not self.pressed
+
+    def __eq__(self, other):
+        return (self.key_number, self.pressed) == (other.key_number, other.pressed)
+
+    def __hash__(self):
+        return hash((self.key_number, self.pressed))
+
+    def __repr__(self):
+        state = "pressed" if self.pressed else "released"
+        return f"<Event: key_number {self.key_number} {state}>"
+
+
+class EventQueue:
+    """A queue of Events with a fixed maximum length."""
+
+    def __init__(self, max_events):
+        self._events = []
+        self._max_events = max_events
+        self.overflowed = False
+
+    def _put(self, event):
+        if len(self._events) >= self._max_events:
+            self.overflowed = True
+            return
+        self._events.append(event)
+
+    def get(self):
+        return self._events.pop(0) if self._events else None
+
+    def get_into(self, event):
+        if not self._events:
+            return False
+        queued = self._events.pop(0)
+        event.key_number = queued.key_number
+        event.pressed = queued.pressed
+        event.timestamp = queued.timestamp
+        return True
+
+    def clear(self):
+        self._events.clear()
+        self.overflowed = False
+
+    def __len__(self):
+        return len(self._events)
+
+    def __bool__(self):
+        return bool(self._events)
+
+
+class Keys:
+    """One key per pin, each claimed like a DigitalInOut."""
+
+    def __init__(self, pins, *, value_when_pressed, pull=True, interval=0.02,
+                 max_events=64, debounce_threshold=1):
+        self._pins = list(pins)
+        for pin in self._pins:
+            pin.claim(self)
+            if pull:
+                pin.pull = "down" if value_when_pressed else "up"
+        self._value_when_pressed = value_when_pressed
+        self.events = EventQueue(max_events)
+        self._pressed = [self._is_pressed(pin) for pin in self._pins]
+        events.listen(self._on_event)
+
+    @property
+    def key_count(self):
+        return len(self._pins)
+
+    def _is_pressed(self, pin):
+        return pin.value == self._value_when_pressed
+
+    def _on_event(self, kind, source, value):
+        if kind != "input" or source not in self._pins:
+            return
+        key_number = self._pins.index(source)
+        pressed = self._is_pressed(source)
+        if pressed != self._pressed[key_number]:
+            self._pressed[key_number] = pressed
+            self.events._put(Event(key_number, pressed))
+
+    def reset(self):
+        self._pressed = [False] * len(self._pins)
+
+    def deinit(self):
+        if self._pins:
+            events.unlisten(self._on_event)
+            for pin in self._pins:
+                pin.release()
+            self._pins = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.deinit()
@@ -0,0 +1,121 @@
+"""Simulated `microcontroller` module of the RP2040."""
+import time
+from simulator import clock as _clock
+from simulator.pins import Pin, GPIO
+from simulator.reset import Reset
+
+
+class _PinNamespace:
+    """microcontroller.pin: GPIO0 ... GPIO29."""
+
+
+pin = _PinNamespace()
+for _gpio in GPIO:
+    setattr(pin, _gpio.name, _gpio)
+del _gpio
+
+
+class ResetReason:
+    """Why the board last reset."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return f"microcontroller.ResetReason.{self.name}"
+
+
+for _name in ("POWER_ON", "BROWNOUT", "SOFTWARE", "DEEP_SLEEP_ALARM", "RESET_PIN",
+              "WATCHDOG", "UNKNOWN", "RESCUE_DEBUG"):
+    setattr(ResetReason, _name, ResetReason(_name))
+del _name
+
+
+class Processor:
+    """microcontroller.cpu; run.py sets reset_reason when it restarts the script."""
+
+    def __init__(self):
+        self.reset_reason = ResetReason.POWER_ON
+        self.temperature = 27.0
+        self.frequency = 125_000_000
+
+
+cpu = Processor()
+nvm = bytearray(4096)      # Survives simulated resets, like the flash sector
+
+
+class WatchDogTimer:
+    """
+    microcontroller.watchdog. On the virtual clock it expires on time;
+    on the real clock a late feed() finds out.
+    """
+
+    MAX_TIMEOUT = 8.388    # RP2040
+
+    def __init__(self):
+        self._timeout = 0.0
+        self._mode = None
+        self._deadline = None
+        self._generation = 0
+
+    @property
+    def timeout(self):
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, seconds):
+        if not 0 < seconds <= self.MAX_TIMEOUT:
+            raise ValueError("timeout must be 8.388 or less")
+        self._timeout = seconds
+
+    @property
+    def mode(self):
+        return self._mode
+
+    @mode.setter
+    def mode(self, mode):
+        if not self._timeout:
+            raise ValueError("WatchDogTimer.timeout must be greater than 0")
+        self._mode = mode
+        self.feed()
+
+    def feed(self):
+        if self._mode is None:
+            raise ValueError("WatchDogTimer is not currently running")
+        now = time.monotonic()
+        if self._deadline is not None and now > self._deadline:
+            self._expire()
+        self._deadline = now + self._timeout
+        self._generation += 1
+        clock = _clock.current
+        if clock is not None:
+            generation = self._generation
+            clock.call_at(self._deadline - clock.start, lambda: self._check(generation))
+
+    def deinit(self):
+        self._mode = None
+        self._deadline = None
+        self._generation += 1
+
+    def _check(self, generation):
+        if generation == self._generation and self._mode is not None:
+            self._expire()
+
+    def _expire(self):
+        import watchdog
+        mode = self._mode
+        self.deinit()
+        if mode is watchdog.WatchDogMode.RAISE:
+            raise watchdog.WatchDogTimeout("Watchdog timer expired.")
+        raise Reset(ResetReason.WATCHDOG)
+
+
+watchdog = WatchDogTimer()
+
+
+def reset():
+    """Resets the board, run.py starts the script again."""
+    raise Reset(ResetReason.SOFTWARE)
+
+
+__all__ = ["Pin", "pin", "ResetReason", "cpu", "nvm", "watchdog", "reset"]
@@ -0,0 +1,5 @@
+"""Simulated `micropython` module: const() is a no-op on the host."""
+
+
+def const(value):
+    return value
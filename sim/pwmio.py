@@ -0,0 +1,48 @@
+"""Simulated `pwmio` module."""
+
+
+class PWMOut:
+    """PWM output on a simulated pin."""
+
+    def __init__(self, pin, *, duty_cycle=0, frequency=500, variable_frequency=False):
+        pin.claim(self)
+        self._pin = pin
+        self._variable_frequency = variable_frequency
+        self._frequency = frequency
+        self._duty_cycle = duty_cycle
+        pin.set_pwm(frequency, duty_cycle)
+
+    def deinit(self):
+        if self._pin is not None:
+            self._pin.set_pwm(0, 0)
+            self._pin.release()
+            self._pin = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.deinit()
+
+    @property
+    def duty_cycle(self):
+        return self._duty_cycle
+
+    @duty_cycle.setter
+    def duty_cycle(self, duty_cycle):
+        if not 0 <= duty_cycle <= 0xFFFF:
+            raise ValueError("duty_cycle must be 0-65535")
+        self._duty_cycle = duty_cycle
+        self._pin.set_pwm(self._frequency, duty_cycle)
+
+    @property
+    def frequency(self):
+        return self._frequency
+
+    @frequency.setter
+    def frequency(self, frequency):
+        if not self._variable_frequency:
+            raise AttributeError(
+                "PWM frequency not writable when variable_frequency is False.")
+        self._frequency = frequency
+        self._pin.set_pwm(frequency, self._duty_cycle)
@@ -0,0 +1,128 @@
+"""
+Runs a SaunaSense firmware or test script on the host against the
+simulated hardware.
+
+    python sim/run.py firmware/code.py --seconds 10
+    python sim/run.py firmware/code.py --virtual --seconds 10800 --trace
+
+The simulated core modules in sim/ (board, busio, digitalio, analogio,
+pwmio, keypad, alarm, microcontroller, micropython) shadow the real ones. The Adafruit
+drivers are the CPython builds of the versions vendored in lib/, see
+sim/requirements.txt. Press Ctrl-C, or pass --seconds, to stop.
+
+With --virtual the script runs on a virtual clock fed by a thermal
+model of the sauna, so a multi-hour session replays in seconds.
+--speed paces it at a multiple of real time instead, and --scenario
+runs a Python file that schedules events on `clock`, `sauna` and
+`hardware` (see sim/scenarios/). --energy prints the I2C traffic and
+the estimated charge drawn, see simulator/energy.py.
+"""
+import argparse
+import json
+import os
+import runpy
+import sys
+import threading
+import _thread
+
+SIM_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(SIM_DIR)
+FIRMWARE_DIR = os.path.join(REPO_DIR, "firmware")
+
+
+def setup_path(script):
+    """Puts the simulated core modules and the firmware modules first."""
+    script_dir = os.path.dirname(os.path.abspath(script))
+    for path in (FIRMWARE_DIR, script_dir, SIM_DIR):
+        if path in sys.path:
+            sys.path.remove(path)
+        sys.path.insert(0, path)
+
+
+def run_script(script):
+    """
+    Runs script as __main__, returns when it ends or is interrupted.
+    A simulated reset (watchdog, microcontroller.reset()) starts it again.
+    """
+    import microcontroller
+    from simulator.clock import SimulationEnd
+    from simulator.hardware import hardware
+    from simulator.reset import Reset
+    while True:
+        try:
+            runpy.run_path(script, run_name="__main__")
+        except (KeyboardInterrupt, SimulationEnd):
+            pass
+        except Reset as reset:
+            print(f"--- reset: {reset.reason} ---")
+            hardware.reboot()
+            microcontroller.cpu.reset_reason = reset.reason
+            continue
+        return
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("script", help="firmware or test script to run")
+    parser.add_argument("--seconds", type=float, default=None,
+                        help="stop after this many (virtual) seconds")
+    parser.add_argument("--virtual", action="store_true",
+                        help="run on the virtual clock with the sauna thermal model")
+    parser.add_argument("--speed", type=float, default=0,
+                        help="virtual clock pace as a multiple of real time, 0 = flat out")
+    parser.add_argument("--scenario", help="Python file scheduling events on the clock")
+    parser.add_argument("--trace", action="store_true",
+                        help="print every LED, buzzer and display change")
+    parser.add_argument("--energy", action="store_true",
+                        help="print I2C accounting and the energy estimate")
+    parser.add_argument("--energy-json", action="store_true",
+                        help="print the energy report as JSON on the last line")
+    args = parser.parse_args(argv)
+
+    setup_path(args.script)
+    from simulator.hardware import hardware
+    from simulator.trace import Trace
+
+    virtual = args.virtual or args.speed or args.scenario
+    if virtual:
+        from simulator.clock import VirtualClock
+        from simulator.thermal import SaunaModel
+        clock = VirtualClock(speed=args.speed, end=args.seconds)
+        clock.install()
+        sauna = SaunaModel()
+        sauna.attach(clock, hardware.aht20)
+        if args.scenario:
+            runpy.run_path(args.scenario, init_globals={
+                "clock": clock, "sauna": sauna, "hardware": hardware})
+    elif args.seconds is not None:
+        timer = threading.Timer(args.seconds, _thread.interrupt_main)
+        timer.daemon = True
+        timer.start()
+
+    trace = Trace(hardware, echo=args.trace)
+    meter = None
+    if args.energy or args.energy_json:
+        import board
+        from simulator.energy import EnergyMeter
+        meter = EnergyMeter(hardware, led_pins=(board.A2, board.A3, board.TX),
+                            buzzer_pins=(board.A1,))
+    run_script(args.script)
+    trace.close()
+    if meter is not None:
+        meter.close()
+
+    if virtual:
+        from simulator.trace import format_time
+        print(f"virtual time: {format_time(clock.elapsed)}, "
+              f"room {sauna.temperature:.1f} °C, {sauna.relative_humidity:.0f} %RH")
+    for line in hardware.summary():
+        print(line)
+    if args.energy:
+        for line in meter.summary():
+            print(line)
+    if args.energy_json:
+        print(json.dumps(meter.report()))
+
+
+if __name__ == "__main__":
+    main()
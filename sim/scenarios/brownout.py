@@ -0,0 +1,37 @@
+"""
+A brownout with no bus fault.
+
+At 5 minutes the sensor supply dips: every I2C device is back in its
+power-on state, but nothing holds SDA and every transfer still succeeds.
+Only the setup checks of resilient.py notice it. At 8 minutes the knob
+is turned 10 detents down, which only reaches the firmware if the seesaw
+encoder interrupt was set up again. At 9 minutes the four devices are
+checked and PASS or FAIL is printed.
+
+    python sim/run.py firmware/code.py --scenario sim/scenarios/brownout.py --seconds 600
+"""
+APDS_ENABLE = 0x80
+
+
+def check():
+    problems = []
+    if not hardware.aht20.calibrated:
+        problems.append("AHT20 not calibrated")
+    if hardware.apds.registers[APDS_ENABLE] & 0x03 != 0x03:
+        problems.append(f"APDS9960 ENABLE {hardware.apds.registers[APDS_ENABLE]:#04x}")
+    if not hardware.encoder.encoder_interrupt:
+        problems.append("encoder interrupt off")
+    if hardware.encoder.delta:
+        problems.append(f"knob turn of {hardware.encoder.delta} never read")
+    if not (hardware.display.oscillator and hardware.display.on):
+        problems.append("display oscillator or output off")
+    if not hardware.display.text.strip():
+        problems.append("display blank")
+    for problem in problems:
+        print("  ", problem)
+    print("Brownout recovery:", "PASS" if not problems else "FAIL")
+
+
+clock.call_at(5 * 60, hardware.brownout)
+clock.call_at(8 * 60, lambda: hardware.encoder.turn(-10))
+clock.call_at(9 * 60, check)
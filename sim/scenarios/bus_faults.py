@@ -0,0 +1,22 @@
+"""
+I2C faults in a hot cabin.
+
+A few failed light-sensor reads at 5 minutes, an AHT20 that fails long
+enough to be re-initialised at 10, a brownout that resets every device
+and leaves SDA held low at 15 (bus recovery), and the AHT20 unplugged
+from 20 to 23 minutes (stale readings, WARNING fallback).
+
+    python sim/run.py firmware/code.py --scenario sim/scenarios/bus_faults.py --seconds 1800
+"""
+
+
+def glitch():
+    hardware.brownout()
+    hardware.hold_sda(5)
+
+
+clock.call_at(5 * 60, lambda: hardware.bus.fail(0x39, 2))
+clock.call_at(10 * 60, lambda: hardware.bus.fail(0x38, 4))
+clock.call_at(15 * 60, glitch)
+clock.call_at(20 * 60, lambda: hardware.bus.detach(0x38))
+clock.call_at(23 * 60, lambda: hardware.bus.attach(hardware.aht20))
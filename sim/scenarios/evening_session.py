@@ -0,0 +1,31 @@
+"""
+A two hour evening session.
+
+Heat-up from 20 °C, stopwatch started when the bathers go in, a few
+rounds of loyly, the set-point turned down (WARNING) and finally a
+heater thermostat stuck high (DANGEROUS).
+
+    python sim/run.py firmware/code.py --scenario sim/scenarios/evening_session.py --seconds 7200 --trace
+"""
+import board
+
+
+def tap(pin_or_encoder, hold=0.2):
+    """Presses a button for hold seconds."""
+    def press():
+        if pin_or_encoder is hardware.encoder:
+            hardware.encoder.press()
+            clock.call_at(clock.elapsed + hold, hardware.encoder.release)
+        else:
+            hardware.press(pin_or_encoder)
+            clock.call_at(clock.elapsed + hold, lambda: hardware.release(pin_or_encoder))
+    return press
+
+
+clock.call_at(35 * 60, tap(board.A0))                       # Start the stopwatch
+clock.call_at(36 * 60, tap(hardware.encoder))               # Show humidity
+for minute in (40, 50, 60):
+    clock.call_at(minute * 60, sauna.throw_water)
+clock.call_at(65 * 60, lambda: hardware.encoder.turn(-10))  # Set-point 80 -> 70
+clock.call_at(80 * 60, lambda: hardware.encoder.turn(10))   # Back to 80
+clock.call_at(90 * 60, lambda: setattr(sauna, "thermostat", 105))
@@ -0,0 +1,18 @@
+"""
+A driver call that never returns, one minute in.
+
+The whole asyncio loop stops, so no task checks in and the supervisor
+cannot run either: the watchdog resets the board 8 s later, and after
+the reboot the firmware reports a watchdog reset with no task recorded.
+
+    python sim/run.py firmware/code.py --scenario sim/scenarios/hung_loop.py --seconds 120
+"""
+import time
+
+
+def hang():
+    while True:
+        time.sleep(0.1)
+
+
+clock.call_at(60, hang)
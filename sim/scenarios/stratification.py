@@ -0,0 +1,23 @@
+"""
+Bench and ceiling sensors behind the TCA9548A mux.
+
+The bench AHT20 (channel 0) follows the thermal model, the ceiling one
+(channel 1) reads 15 °C hotter and a little drier. After 20 minutes the
+ceiling sensor's cable comes loose, after 30 it is plugged back in.
+
+    python sim/run.py firmware/code.py --scenario sim/scenarios/stratification.py --seconds 2700 --trace
+"""
+bench, ceiling = hardware.add_zones(2)
+
+
+def stratify(dt):
+    ceiling.temperature = bench.temperature + 15
+    ceiling.humidity = bench.humidity * 0.6
+
+
+clock.call_every(1.0, stratify)
+clock.call_at(20 * 60, lambda: hardware.mux.detach(1, ceiling.address))
+clock.call_at(30 * 60, lambda: hardware.mux.attach(1, ceiling))
+for t in range(7):      # Encoder button 7 times: the zone display mode
+    clock.call_at(60 + t, hardware.encoder.press)
+    clock.call_at(60.2 + t, hardware.encoder.release)
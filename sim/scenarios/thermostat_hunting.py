@@ -0,0 +1,17 @@
+"""
+A heater thermostat set right on the alert thresholds.
+
+With the target at 80 °C the thermostat is set to 91 °C, so the room
+cycles across target + 10 °C for 90 minutes; then to 96 °C, cycling
+across the 95 °C danger limit; after 130 minutes it is turned down to
+75 °C. The sensor is noisier than usual (0.4 °C). The stateless rule
+flipped SAFE/WARNING and WARNING/DANGEROUS with every cycle; the alert
+machine's hysteresis and dwell times hold the state.
+Tests/traces/thermostat_hunting.csv was recorded from this scenario.
+
+    python sim/run.py firmware/code.py --scenario sim/scenarios/thermostat_hunting.py --seconds 9000 --trace
+"""
+sauna.thermostat = 91
+sauna.noise = 0.4
+clock.call_at(90 * 60, lambda: setattr(sauna, "thermostat", 96))
+clock.call_at(130 * 60, lambda: setattr(sauna, "thermostat", 75))
@@ -0,0 +1,5 @@
+"""
+Host-side simulation of the SaunaSense hardware.
+
+See sim/run.py for running firmware scripts against it.
+"""
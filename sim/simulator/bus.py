@@ -0,0 +1,94 @@
+"""
+The simulated I2C bus.
+
+Devices are attached by address. A transfer is one START ... STOP
+sequence: an optional write followed by an optional read with a
+repeated start, as busio.I2C.writeto_then_readfrom does.
+
+Devices behind a multiplexer (anything with devices_at(address)) are
+reached while their channel is selected. When several devices answer
+the same address they all receive the write and the read is the
+wired-AND of their replies, as on the open-drain bus.
+
+Faults for scenarios: fail() makes the next transfers to an address
+raise OSError, and while `stuck` (a device holding SDA low, see
+Hardware.hold_sda) every transfer times out.
+"""
+from simulator import events
+
+EIO = 5
+ENODEV = 19
+ETIMEDOUT = 116
+
+
+class I2CBus:
+    """Routes I2C transfers to the virtual devices."""
+
+    def __init__(self):
+        self.devices = {}
+        self.muxes = []
+        self.transactions = 0
+        self.bytes_written = 0
+        self.bytes_read = 0
+        self.stuck = False
+        self.faults = {}               # address -> [transfers left to fail, errno]
+
+    def fail(self, address, count=1, errno=EIO):
+        """Makes the next count transfers to address raise OSError(errno)."""
+        self.faults[address] = [count, errno]
+
+    def attach(self, device):
+        """Connects a device at its address."""
+        self.devices[device.address] = device
+        if hasattr(device, "devices_at"):
+            self.muxes.append(device)
+
+    def detach(self, address):
+        """Disconnects the device at address."""
+        device = self.devices.pop(address, None)
+        if device in self.muxes:
+            self.muxes.remove(device)
+
+    def scan(self):
+        """Returns the addresses that acknowledge."""
+        addresses = set(self.devices)
+        for mux in self.muxes:
+            for channel in mux.channels:
+                addresses.update(address for address in channel if mux.devices_at(address))
+        return sorted(addresses)
+
+    def transfer(self, address, out_data=b"", in_length=0):
+        """
+        Writes out_data, then reads in_length bytes from address.
+        Raises OSError(ENODEV) when nothing acknowledges the address,
+        OSError(ETIMEDOUT) while SDA is stuck and the injected faults.
+        """
+        if self.stuck:
+            raise OSError(ETIMEDOUT, "Bus timed out")
+        fault = self.faults.get(address)
+        if fault is not None:
+            fault[0] -= 1
+            if fault[0] <= 0:
+                del self.faults[address]
+            raise OSError(fault[1], "Injected fault")
+        devices = []
+        if address in self.devices:
+            devices.append(self.devices[address])
+        for mux in self.muxes:
+            devices.extend(mux.devices_at(address))
+        if not devices:
+            raise OSError(ENODEV, "No such device")
+        self.transactions += 1
+        data = b""
+        if out_data or not in_length:
+            self.bytes_written += 1 + len(out_data)   # Address byte and data
+            for device in devices:
+                device.write(bytes(out_data))
+        if in_length:
+            self.bytes_written += 1  # Address byte of the read, after a repeated start or alone
+            data = devices[0].read(in_length)
+            for device in devices[1:]:
+                data = bytes(a & b for a, b in zip(data, device.read(in_length)))
+            self.bytes_read += in_length
+        events.emit("i2c", address, (bytes(out_data), data))
+        return data
@@ -0,0 +1,133 @@
+"""
+Deterministic virtual clock.
+
+Once installed, time.monotonic(), time.monotonic_ns() and time.sleep()
+read and advance virtual time instead of waiting, so a three hour
+sauna session replays in seconds. asyncio firmware gets an event loop
+whose selector advances the clock instead of blocking.
+"""
+import asyncio
+import heapq
+import selectors
+import time
+
+_real_monotonic = time.monotonic
+_real_sleep = time.sleep
+
+
+current = None             # The installed VirtualClock, for the watchdog
+
+
+class SimulationEnd(BaseException):
+    """Raised from sleep once the configured end time is reached."""
+
+
+class VirtualClock:
+    """
+    Virtual time in seconds. speed=0 runs as fast as possible, any other
+    value paces the simulation at that multiple of real time.
+    Every clock read costs read_cost seconds so busy-wait loops finish.
+    """
+
+    def __init__(self, start=1000.0, speed=0, end=None, read_cost=0.00001):
+        self.start = start
+        self.now = start
+        self.speed = speed
+        self.end = end
+        self.read_cost = read_cost
+        self.ended = False
+        self._timers = []
+        self._sequence = 0
+        self._real_start = None
+        self._real = {}
+
+    @property
+    def elapsed(self):
+        """Virtual seconds since the clock started."""
+        return self.now - self.start
+
+    def monotonic(self):
+        self.now += self.read_cost
+        return self.now
+
+    def monotonic_ns(self):
+        return int(self.monotonic() * 1_000_000_000)
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    def call_at(self, elapsed, callback):
+        """Runs callback() when the clock reaches elapsed seconds after start."""
+        heapq.heappush(self._timers, (self.start + elapsed, self._sequence, callback))
+        self._sequence += 1
+
+    def call_every(self, period, callback):
+        """Runs callback(dt) every period seconds."""
+        def repeat():
+            callback(period)
+            self.call_at(self.elapsed + period, repeat)
+        self.call_at(self.elapsed + period, repeat)
+
+    def advance(self, seconds):
+        """Moves time forward, running the timers that fall due on the way."""
+        if self.ended:
+            return
+        target = self.now + max(0.0, seconds)
+        if self.end is not None:
+            target = min(target, self.start + self.end)
+        while self._timers and self._timers[0][0] <= target:
+            due, _, callback = heapq.heappop(self._timers)
+            self.now = max(self.now, due)
+            callback()
+        self.now = target
+        self._pace()
+        if self.end is not None and self.elapsed >= self.end:
+            self.ended = True
+            raise SimulationEnd()
+
+    def _pace(self):
+        if not self.speed:
+            return
+        real_now = _real_monotonic()
+        if self._real_start is None:
+            self._real_start = real_now - self.elapsed / self.speed
+        ahead = self.elapsed / self.speed - (real_now - self._real_start)
+        if ahead > 0:
+            _real_sleep(ahead)
+
+    def install(self):
+        """Replaces the time functions and the asyncio event loop factory."""
+        global current
+        current = self
+        for name in ("monotonic", "monotonic_ns", "sleep"):
+            self._real[name] = getattr(time, name)
+            setattr(time, name, getattr(self, name))
+        clock = self
+
+        class VirtualTimePolicy(asyncio.DefaultEventLoopPolicy):
+            def new_event_loop(self):
+                return asyncio.SelectorEventLoop(VirtualTimeSelector(clock))
+
+        asyncio.set_event_loop_policy(VirtualTimePolicy())
+
+    def uninstall(self):
+        """Restores the real time functions."""
+        global current
+        current = None
+        for name, function in self._real.items():
+            setattr(time, name, function)
+        asyncio.set_event_loop_policy(None)
+
+
+class VirtualTimeSelector(selectors.DefaultSelector):
+    """Selector that advances the virtual clock instead of waiting."""
+
+    def __init__(self, clock):
+        super().__init__()
+        self._clock = clock
+
+    def select(self, timeout=None):
+        events = super().select(0)
+        if not events and timeout:
+            self._clock.advance(timeout)
+        return events
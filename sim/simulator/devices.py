@@ -0,0 +1,371 @@
+"""
+Virtual I2C devices that speak the same register protocols as the
+parts on the SaunaSense board. Each device implements write(data) and
+read(length); scenario code changes the physical quantities through
+plain attributes (temperature, light, turn(), press(), ...).
+"""
+import struct
+import time
+
+
+def _crc8(data):
+    """AHT20 CRC: polynomial 0x31, initial value 0xFF."""
+    crc = 0xFF
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x31) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+    return crc
+
+
+class AHT20:
+    """AHT20 temperature and humidity sensor at 0x38."""
+
+    CONVERSION_TIME = 0.08
+
+    def __init__(self, address=0x38):
+        self.address = address
+        self.temperature = 22.0
+        self.humidity = 40.0
+        self.conversions = 0
+        self.reset()
+
+    def reset(self):
+        """Power-on state: not calibrated, nothing measured."""
+        self.calibrated = False
+        self._busy_until = 0
+        self._frame = bytes(5)
+
+    @property
+    def busy(self):
+        return time.monotonic() < self._busy_until
+
+    def write(self, data):
+        if not data:
+            return
+        command = data[0]
+        if command == 0xBA:                      # Soft reset
+            self.calibrated = False
+            self._busy_until = 0
+        elif command in (0xBE, 0xE1):            # Calibrate (AHT20 / AHT10 command)
+            self.calibrated = True
+        elif command == 0xAC:                    # Trigger measurement
+            self._busy_until = time.monotonic() + self.CONVERSION_TIME
+            self._frame = self._encode()
+            self.conversions += 1
+
+    def _encode(self):
+        humidity = int(min(max(self.humidity, 0.0), 100.0) / 100 * 0x100000)
+        humidity = min(humidity, 0xFFFFF)
+        temp = int((min(max(self.temperature, -50.0), 150.0) + 50) / 200 * 0x100000)
+        temp = min(temp, 0xFFFFF)
+        return bytes((
+            humidity >> 12 & 0xFF,
+            humidity >> 4 & 0xFF,
+            (humidity & 0x0F) << 4 | temp >> 16 & 0x0F,
+            temp >> 8 & 0xFF,
+            temp & 0xFF,
+        ))
+
+    def read(self, length):
+        status = 0x18 if self.calibrated else 0x10
+        if self.busy:
+            status |= 0x80
+        frame = bytes((status,)) + self._frame
+        frame += bytes((_crc8(frame),))
+        return frame[:length].ljust(length, b"\xff")
+
+
+class TCA9548A:
+    """TCA9548A 8-channel I2C multiplexer, at 0x71 on this board (the display has 0x70)."""
+
+    def __init__(self, address=0x71):
+        self.address = address
+        self.control = 0               # Bit n connects channel n
+        self.channels = [{} for _ in range(8)]
+        self.selects = 0
+
+    def attach(self, channel, device):
+        """Connects a device to a downstream channel."""
+        self.channels[channel][device.address] = device
+
+    def detach(self, channel, address):
+        self.channels[channel].pop(address, None)
+
+    def devices_at(self, address):
+        """The devices at address on the connected channels."""
+        found = []
+        for channel in range(8):
+            if self.control & (1 << channel):
+                device = self.channels[channel].get(address)
+                if device is not None:
+                    found.append(device)
+        return found
+
+    def write(self, data):
+        if data:
+            self.control = data[-1]
+            self.selects += 1
+
+    def read(self, length):
+        return bytes((self.control,)) * length
+
+
+class APDS9960:
+    """APDS9960 light, proximity and gesture sensor at 0x39."""
+
+    _ENABLE = 0x80
+    _ID = 0x92
+    _STATUS = 0x93
+    _CDATAL = 0x94
+    _PDATA = 0x9C
+
+    def __init__(self, address=0x39):
+        self.address = address
+        self.light = (40, 60, 30, 150)       # red, green, blue, clear
+        self.proximity = 0
+        self.reset()
+
+    def reset(self):
+        """Power-on state: everything disabled."""
+        self.registers = bytearray(256)
+        self.registers[self._ID] = 0xAB
+        self._pointer = 0
+
+    def write(self, data):
+        if not data:
+            return
+        self._pointer = data[0]
+        if data[0] >= 0xE4 and len(data) == 1:   # Interrupt clear commands
+            return
+        for byte in data[1:]:
+            self.registers[self._pointer] = byte
+            self._pointer = (self._pointer + 1) & 0xFF
+
+    def _register(self, address):
+        enable = self.registers[self._ENABLE]
+        if address == self._STATUS:
+            return 0x01 if enable & 0x03 == 0x03 else 0x00
+        if self._CDATAL <= address < self._CDATAL + 8:
+            if enable & 0x03 != 0x03:
+                return 0
+            red, green, blue, clear = self.light
+            value = (clear, red, green, blue)[(address - self._CDATAL) // 2]
+            value = min(max(int(value), 0), 0xFFFF)
+            return value & 0xFF if address % 2 == 0 else value >> 8
+        if address == self._PDATA:
+            return self.proximity if enable & 0x05 == 0x05 else 0
+        return self.registers[address]
+
+    def read(self, length):
+        data = bytearray(length)
+        for i in range(length):
+            data[i] = self._register(self._pointer)
+            self._pointer = (self._pointer + 1) & 0xFF
+        return bytes(data)
+
+
+class HT16K33:
+    """HT16K33 LED backpack driving the quad 14-segment display at 0x70."""
+
+    def __init__(self, address=0x70):
+        self.address = address
+        self.reset()
+
+    def reset(self):
+        """Power-on state: oscillator off, display blank."""
+        self.ram = bytearray(16)
+        self.oscillator = False
+        self.on = False
+        self.blink_rate = 0
+        self.brightness = 15
+        self._pointer = 0
+
+    def write(self, data):
+        if not data:
+            return
+        command = data[0]
+        kind = command & 0xF0
+        if kind == 0x00:                          # Display RAM address
+            self._pointer = command & 0x0F
+            for byte in data[1:]:
+                self.ram[self._pointer] = byte
+                self._pointer = (self._pointer + 1) & 0x0F
+        elif kind == 0x20:                        # System setup
+            self.oscillator = bool(command & 0x01)
+        elif kind == 0x80:                        # Display setup
+            self.on = bool(command & 0x01)
+            self.blink_rate = command >> 1 & 0x03
+        elif kind == 0xE0:                        # Dimming
+            self.brightness = command & 0x0F
+
+    def read(self, length):
+        data = bytearray(length)
+        for i in range(length):
+            data[i] = self.ram[self._pointer]
+            self._pointer = (self._pointer + 1) & 0x0F
+        return bytes(data)
+
+    @property
+    def text(self):
+        """The four characters shown, decoded with the Seg14x4 font."""
+        font = _seg14_font()
+        chars = []
+        for i in range(0, 8, 2):
+            low, high = self.ram[i], self.ram[i + 1]
+            char = font.get((low, high & ~0x40), "?")
+            chars.append(char + "." if high & 0x40 and char != "." else char)
+        return "".join(chars)
+
+
+_font = None
+
+
+def _seg14_font():
+    global _font
+    if _font is None:
+        from adafruit_ht16k33.segments import CHARS
+        _font = {}
+        for code in range(126, 31, -1):
+            index = code * 2 - 64
+            _font[(CHARS[index + 1], CHARS[index])] = chr(code)
+    return _font
+
+
+class SeesawEncoder:
+    """Adafruit I2C rotary encoder (seesaw on ATtiny817, product 4991) at 0x36."""
+
+    HW_ID = 0x87
+    PRODUCT_ID = 4991
+    BUTTON_PIN = 24
+
+    def __init__(self, address=0x36, int_pin=None):
+        self.address = address
+        self.int_pin = int_pin        # simulator Pin the open-drain INT line is wired to
+        self.reset()
+
+    def reset(self):
+        self.position = 0
+        self.delta = 0
+        self.encoder_interrupt = False
+        self.encoder_moved = False
+        self.direction = 0
+        self.pullups = 1 << self.BUTTON_PIN   # Button input idles high
+        self.outputs = 0
+        self.gpio_interrupts = 0
+        self.gpio_flags = 0
+        self.button_pressed = False
+        self._pointer = (0, 0)
+
+    # --- Physical interaction ---
+
+    def turn(self, steps):
+        """Rotates the knob by steps detents (negative = counter-clockwise)."""
+        self.position += steps
+        self.delta += steps
+        self.encoder_moved = True
+        self._update_int()
+
+    def press(self):
+        self._set_button(True)
+
+    def release(self):
+        self._set_button(False)
+
+    def _set_button(self, pressed):
+        if pressed != self.button_pressed:
+            self.button_pressed = pressed
+            if self.gpio_interrupts & (1 << self.BUTTON_PIN):
+                self.gpio_flags |= 1 << self.BUTTON_PIN
+            self._update_int()
+
+    @property
+    def interrupt(self):
+        """True while the INT line is asserted (pulled low)."""
+        return bool(self.gpio_flags) or (self.encoder_interrupt and self.encoder_moved)
+
+    def _update_int(self):
+        """Pulls the wired INT pin low while an interrupt is pending."""
+        if self.int_pin is None:
+            return
+        level = False if self.interrupt else None
+        if level != self.int_pin.external:
+            self.int_pin.set_external(level)
+
+    @property
+    def levels(self):
+        """The GPIO port A input levels as a bitmask."""
+        levels = self.outputs & self.direction
+        inputs = ~self.direction & 0xFFFFFFFF
+        levels |= self.pullups & inputs
+        if self.button_pressed:
+            levels &= ~(1 << self.BUTTON_PIN)
+        return levels
+
+    # --- Register protocol ---
+
+    def write(self, data):
+        if len(data) < 2:
+            return
+        base, function = data[0], data[1]
+        self._pointer = (base, function)
+        payload = data[2:]
+        if base == 0x00 and function == 0x7F:
+            self.reset()
+        elif base == 0x01 and len(payload) >= 4:
+            mask = struct.unpack(">I", payload[:4])[0]
+            if function == 0x02:
+                self.direction |= mask
+            elif function == 0x03:
+                self.direction &= ~mask
+            elif function == 0x05:
+                self.outputs |= mask
+            elif function == 0x06:
+                self.outputs &= ~mask
+            elif function == 0x07:
+                self.outputs ^= mask
+            elif function == 0x08:
+                self.gpio_interrupts |= mask
+            elif function == 0x09:
+                self.gpio_interrupts &= ~mask
+            elif function == 0x0B:
+                self.pullups |= mask
+            elif function == 0x0C:
+                self.pullups &= ~mask
+        elif base == 0x11 and payload:            # No payload: register select for a read
+            if function == 0x10:
+                self.encoder_interrupt = True
+            elif function == 0x20:
+                self.encoder_interrupt = False
+            elif function == 0x30 and len(payload) >= 4:
+                self.position = struct.unpack(">i", payload[:4])[0]
+        self._update_int()
+
+    def read(self, length):
+        base, function = self._pointer
+        data = b""
+        if base == 0x00:
+            if function == 0x01:
+                data = bytes((self.HW_ID,))
+            elif function == 0x02:
+                data = struct.pack(">I", self.PRODUCT_ID << 16 | 0x1234)
+            elif function == 0x03:
+                data = struct.pack(">I", 1 << 0x00 | 1 << 0x01 | 1 << 0x11)
+        elif base == 0x01:
+            if function == 0x04:
+                data = struct.pack(">I", self.levels) + bytes(4)
+            elif function == 0x0A:
+                data = struct.pack(">I", self.gpio_flags)
+                self.gpio_flags = 0
+        elif base == 0x11:
+            if function == 0x10:
+                data = bytes((0x01 if self.encoder_interrupt else 0x00,))
+            elif function == 0x30:
+                data = struct.pack(">i", self.position)
+                self.encoder_moved = False
+            elif function == 0x40:
+                data = struct.pack(">i", self.delta)
+                self.delta = 0
+                self.encoder_moved = False
+        self._update_int()
+        return data[:length].ljust(length, b"\x00")
@@ -0,0 +1,161 @@
+"""
+I2C transaction accounting and energy estimate.
+
+EnergyMeter listens to the simulated bus and outputs. It counts I2C
+transactions and bytes per device, LED on-time, buzzer duty and time in
+light sleep, and integrates a per-device current model into charge, so
+firmware variants can be ranked by estimated mAh per hour without a
+multimeter.
+
+The currents are typical datasheet values for the SaunaSense parts at
+3.3 V; they are estimates for comparing variants, not measurements.
+"""
+import time
+
+from simulator import events
+
+# === Current Model (mA) ===
+MCU_AWAKE = 25.0            # Feather RP2040 running CircuitPython
+MCU_LIGHT_SLEEP = 7.0       # In alarm.light_sleep_until_alarms()
+AHT20_IDLE = 0.00025
+AHT20_MEASURING = 0.98      # For the 80 ms conversion
+APDS9960_ALS = 0.2          # Colour/ambient light engine running
+APDS9960_SLEEP = 0.001
+SEESAW = 3.0                # ATtiny817 on the encoder breakout
+HT16K33_BASE = 1.0          # Oscillator and driver, display dark
+HT16K33_SEGMENT = 0.6       # Per lit segment at full brightness
+LED = 8.0                   # Per indicator LED with its resistor
+BUZZER = 25.0               # Passive buzzer at 50 % duty
+I2C_BYTE_CHARGE = 0.7 * 90e-6   # mA*s: pull-up current for one byte at 100 kHz
+
+I2C_NAMES = {0x36: "seesaw", 0x38: "aht20", 0x39: "apds9960", 0x70: "ht16k33"}
+
+
+def _bit_count(value):
+    count = 0
+    while value:
+        value &= value - 1
+        count += 1
+    return count
+
+
+class EnergyMeter:
+    """
+    Integrates the current model over (virtual) time.
+    led_pins and buzzer_pins are board pins, the other outputs are ignored.
+    """
+
+    def __init__(self, hardware, led_pins, buzzer_pins):
+        self.hardware = hardware
+        self.led_pins = list(led_pins)
+        self.buzzer_pins = list(buzzer_pins)
+        self.start = time.monotonic()
+        self.charge = {}                  # Component -> mA*s
+        self.i2c = {}                     # Device name -> [transactions, bytes]
+        self.led_on_time = {pin.name: 0.0 for pin in self.led_pins}
+        self.buzzer_duty_time = 0.0       # Seconds weighted by duty / 50 %
+        self.asleep = False
+        self.asleep_time = 0.0
+        self._currents = {}
+        self._last = self.start
+        self._update_currents()
+        events.listen(self._on_event)
+
+    def close(self):
+        self._integrate()
+        events.unlisten(self._on_event)
+
+    @property
+    def elapsed(self):
+        return self._last - self.start
+
+    def _add(self, component, charge):
+        self.charge[component] = self.charge.get(component, 0.0) + charge
+
+    def _integrate(self):
+        now = time.monotonic()
+        dt = now - self._last
+        if dt <= 0:
+            return
+        for component, current in self._currents.items():
+            self._add(component, current * dt)
+        for pin in self.led_pins:
+            if pin.output:
+                self.led_on_time[pin.name] += dt
+        for pin in self.buzzer_pins:
+            self.buzzer_duty_time += dt * min(1.0, pin.pwm_duty_cycle / 32768)
+        if self.asleep:
+            self.asleep_time += dt
+        self._last = now
+
+    def _update_currents(self):
+        hw = self.hardware
+        currents = self._currents
+        currents["mcu"] = MCU_LIGHT_SLEEP if self.asleep else MCU_AWAKE
+        currents["aht20"] = AHT20_IDLE
+        enable = hw.apds.registers[0x80]
+        currents["apds9960"] = APDS9960_ALS if enable & 0x03 == 0x03 else APDS9960_SLEEP
+        currents["seesaw"] = SEESAW
+        display = hw.display
+        if display.oscillator and display.on:
+            lit = sum(_bit_count(byte) for byte in display.ram)
+            level = (display.brightness + 1) / 16
+            currents["ht16k33"] = HT16K33_BASE + lit * HT16K33_SEGMENT * level
+        else:
+            currents["ht16k33"] = 0.0
+        currents["leds"] = LED * sum(1 for pin in self.led_pins if pin.output)
+        currents["buzzer"] = sum(
+            BUZZER * min(1.0, pin.pwm_duty_cycle / 32768) for pin in self.buzzer_pins)
+
+    def _on_event(self, kind, source, value):
+        self._integrate()
+        if kind == "sleep":
+            self.asleep = value
+        elif kind == "i2c":
+            out_data, in_data = value
+            name = I2C_NAMES.get(source, hex(source))
+            count = self.i2c.setdefault(name, [0, 0])
+            count[0] += 1
+            count[1] += len(out_data) + len(in_data)
+            # One address byte per phase: a plain read has no write phase
+            addresses = (1 if out_data or not in_data else 0) + (1 if in_data else 0)
+            self._add("i2c", (addresses + len(out_data) + len(in_data)) * I2C_BYTE_CHARGE)
+            if name == "aht20" and out_data[:1] == b"\xac":
+                self._add("aht20", AHT20_MEASURING * self.hardware.aht20.CONVERSION_TIME)
+        self._update_currents()
+
+    def report(self):
+        """Returns the summary as a dict, charges in mAh."""
+        self._integrate()
+        hours = self.elapsed / 3600
+        mah = {component: charge / 3600 for component, charge in self.charge.items()}
+        total = sum(mah.values())
+        return {
+            "seconds": self.elapsed,
+            "mah": mah,
+            "total_mah": total,
+            "mah_per_hour": total / hours if hours else 0.0,
+            "i2c": {name: {"transactions": t, "bytes": b} for name, (t, b) in self.i2c.items()},
+            "led_on_seconds": self.led_on_time,
+            "buzzer_duty": self.buzzer_duty_time / self.elapsed if self.elapsed else 0.0,
+            "asleep_seconds": self.asleep_time,
+        }
+
+    def summary(self):
+        """The report as printable lines."""
+        report = self.report()
+        lines = [f"energy:   {report['mah_per_hour']:.2f} mAh per hour "
+                 f"({report['total_mah']:.3f} mAh in {report['seconds']:.0f} s)"]
+        for component, mah in sorted(report["mah"].items(), key=lambda item: -item[1]):
+            lines.append(f"{component:>10}: {mah:.4f} mAh")
+        for name, counts in sorted(report["i2c"].items()):
+            lines.append(f"{name:>10}: {counts['transactions']} transactions, "
+                         f"{counts['bytes']} bytes")
+        for name, seconds in report["led_on_seconds"].items():
+            lines.append(f"{name:>10}: LED on {seconds:.1f} s")
+        lines.append(f"{'buzzer':>10}: {100 * report['buzzer_duty']:.1f} % of full duty")
+        if report["seconds"]:
+            awake = 100 * (1 - report["asleep_seconds"] / report["seconds"])
+            lines.append(f"{'mcu':>10}: awake {awake:.1f} %, "
+                         f"light sleep {report['asleep_seconds']:.1f} s")
+        return lines
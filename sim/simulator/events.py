@@ -0,0 +1,24 @@
+"""
+Event hub of the simulated hardware.
+
+Pins, the I2C bus and the virtual devices report what happens to them
+through emit(). Tracing and instrumentation subscribe with listen().
+"""
+
+_listeners = []
+
+
+def listen(callback):
+    """Registers callback(kind, source, value) for every hardware event."""
+    _listeners.append(callback)
+
+
+def unlisten(callback):
+    """Removes a callback registered with listen()."""
+    _listeners.remove(callback)
+
+
+def emit(kind, source, value):
+    """Reports an event to every listener."""
+    for callback in tuple(_listeners):   # A callback may unlisten itself
+        callback(kind, source, value)
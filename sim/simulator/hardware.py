@@ -0,0 +1,104 @@
+"""
+The simulated SaunaSense board: one I2C bus with the four virtual
+devices, the Feather RP2040 pins, and the encoder INT line on D5. The core-module shims in sim/
+(board, busio, digitalio, ...) all talk to the `hardware` instance.
+"""
+from simulator import events
+from simulator.bus import I2CBus
+from simulator.devices import AHT20, APDS9960, HT16K33, SeesawEncoder, TCA9548A
+from simulator.pins import GPIO
+
+ENCODER_INT = 7    # The seesaw INT line is wired to D5 (GPIO7)
+SDA = 2
+SCL = 3
+
+
+class Hardware:
+    """Devices and pins a scenario can inspect and drive."""
+
+    def __init__(self):
+        self.bus = I2CBus()
+        self.aht20 = AHT20()
+        self.apds = APDS9960()
+        self.display = HT16K33()
+        self.encoder = SeesawEncoder(int_pin=GPIO[ENCODER_INT])
+        for device in (self.aht20, self.apds, self.display, self.encoder):
+            self.bus.attach(device)
+        self.pins = GPIO
+        self.pins[SDA].external = True   # Pull-ups on the breakouts
+        self.pins[SCL].external = True
+        self.mux = None
+        self.zones = []
+        self._clocks_to_release = 0
+
+    def add_zones(self, count=2, address=0x71):
+        """
+        Fits a TCA9548A with an AHT20 on channels 0 ... count - 1. The main
+        AHT20 moves to channel 0, as it has to on the real board.
+        Returns the zone AHT20s, hardware.aht20 first.
+        """
+        self.mux = TCA9548A(address)
+        self.bus.attach(self.mux)
+        self.bus.detach(self.aht20.address)
+        self.zones = [self.aht20] + [AHT20() for _ in range(count - 1)]
+        for channel, sensor in enumerate(self.zones):
+            self.mux.attach(channel, sensor)
+        return self.zones
+
+    def hold_sda(self, clocks=5):
+        """
+        A device stops halfway through a byte and holds SDA low: every
+        transfer times out until SCL has been clocked `clocks` times.
+        """
+        self.bus.stuck = True
+        self.pins[SDA].set_external(False)
+        self._clocks_to_release = clocks
+        events.listen(self._count_clock)
+
+    def _count_clock(self, kind, source, value):
+        if kind != "pin" or source is not self.pins[SCL] or value:
+            return
+        self._clocks_to_release -= 1
+        if self._clocks_to_release <= 0:
+            events.unlisten(self._count_clock)
+            self.bus.stuck = False
+            self.pins[SDA].set_external(True)
+
+    def brownout(self):
+        """The sensor supply dips: every I2C device is back in its power-on state."""
+        for device in (self.aht20, self.apds, self.display, self.encoder, *self.zones):
+            device.reset()
+
+    def reboot(self):
+        """The RP2040 resets: every pin is released, the I2C devices keep their state."""
+        for pin in self.pins:
+            if pin.owner is not None:
+                pin.release()
+                pin.pwm_frequency = 0
+
+    def press(self, pin):
+        """Presses a button wired between pin and GND."""
+        pin.set_external(False)
+
+    def release(self, pin):
+        """Releases a button wired between pin and GND."""
+        pin.set_external(None)
+
+    def summary(self):
+        """One line per output, for printing at the end of a run."""
+        lines = [f"display:  '{self.display.text}' (brightness {self.display.brightness}/15)"]
+        for pin in self.pins:
+            if pin.owner is None:
+                continue
+            if pin.pwm_frequency:
+                lines.append(f"{pin.name:>8}: PWM {pin.pwm_frequency} Hz, duty {pin.pwm_duty_cycle}")
+            elif pin.output is not None:
+                lines.append(f"{pin.name:>8}: {'on' if pin.output else 'off'}")
+        lines.append(
+            f"i2c:      {self.bus.transactions} transactions, "
+            f"{self.bus.bytes_written} bytes out, {self.bus.bytes_read} bytes in"
+        )
+        return lines
+
+
+hardware = Hardware()
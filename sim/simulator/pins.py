@@ -0,0 +1,70 @@
+"""
+GPIO pins of the simulated RP2040.
+
+A Pin holds what the firmware drives onto it (output, PWM) and what
+the outside world drives into it (button presses, analog voltages).
+Only one peripheral can claim a pin at a time, like on the device.
+"""
+from simulator import events
+
+
+class Pin:
+    """A single GPIO, shared by board and microcontroller.pin."""
+
+    def __init__(self, number):
+        self.number = number
+        self.name = f"GPIO{number}"
+        self.owner = None
+        self.output = None        # Driven level when configured as output
+        self.pull = None          # None, "up" or "down"
+        self.external = None      # Level forced from outside, None = floating
+        self.analog = 0           # Raw 16-bit value seen by AnalogIn
+        self.pwm_frequency = 0
+        self.pwm_duty_cycle = 0
+
+    def __repr__(self):
+        return f"board.{self.name}"
+
+    def claim(self, owner):
+        """Reserves the pin, raises ValueError like CircuitPython when in use."""
+        if self.owner is not None:
+            raise ValueError(f"{self.name} in use")
+        self.owner = owner
+
+    def release(self):
+        """Frees the pin and forgets the driven state."""
+        self.owner = None
+        self.output = None
+        self.pull = None
+        self.pwm_duty_cycle = 0
+
+    @property
+    def value(self):
+        """The logic level currently on the pin."""
+        if self.output is not None:
+            return self.output
+        if self.external is not None:
+            return self.external
+        return self.pull == "up"
+
+    def drive(self, value):
+        """Sets the output level, used by digitalio."""
+        value = bool(value)
+        if value != self.output:
+            self.output = value
+            events.emit("pin", self, value)
+
+    def set_pwm(self, frequency, duty_cycle):
+        """Sets the PWM output, used by pwmio."""
+        if (frequency, duty_cycle) != (self.pwm_frequency, self.pwm_duty_cycle):
+            self.pwm_frequency = frequency
+            self.pwm_duty_cycle = duty_cycle
+            events.emit("pwm", self, duty_cycle)
+
+    def set_external(self, value):
+        """Drives the pin from outside: True/False, or None to let it float."""
+        self.external = value
+        events.emit("input", self, value)
+
+
+GPIO = [Pin(number) for number in range(30)]
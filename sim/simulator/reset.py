@@ -0,0 +1,16 @@
+"""
+Simulated resets.
+
+microcontroller.reset() and an expired watchdog raise Reset. run.py
+catches it, releases the pins and runs the script again with
+microcontroller.cpu.reset_reason set, while microcontroller.nvm and
+the devices keep their contents, as on the board.
+"""
+
+
+class Reset(BaseException):
+    """Unwinds the running script; reason is a microcontroller.ResetReason."""
+
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
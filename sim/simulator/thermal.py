@@ -0,0 +1,76 @@
+"""
+Thermal model of a sauna room with an electric heater.
+
+The room is a single first-order heat store: the heater adds power,
+the walls lose heat to the ambient air in proportion to the difference.
+The heater's own thermostat switches it with a small hysteresis.
+Water thrown on the stones (loyly) adds steam and a short heat pulse.
+Humidity is tracked as absolute water content and converted to the
+relative humidity the AHT20 reports.
+"""
+import math
+import random
+
+
+def saturation_density(temp):
+    """Water vapour density at saturation in g/m3 (Magnus formula)."""
+    pressure = 611.2 * math.exp(17.62 * temp / (243.12 + temp))
+    return pressure / (461.5 * (temp + 273.15)) * 1000
+
+
+class SaunaModel:
+    """
+    Room temperature and humidity over time.
+    The defaults reach 80 °C in about 33 minutes from 20 °C.
+    """
+
+    def __init__(self, ambient=20.0, thermostat=85.0, hysteresis=2.0,
+                 max_temperature=110.0, time_constant=1800.0,
+                 ambient_humidity=50.0, ventilation=1200.0, noise=0.05, seed=1):
+        self.ambient = ambient
+        self.thermostat = thermostat
+        self.hysteresis = hysteresis
+        self.max_temperature = max_temperature   # Steady state with the heater always on
+        self.time_constant = time_constant       # Seconds, heat capacity / losses
+        self.ventilation = ventilation           # Seconds to exchange the room air
+        self.noise = noise
+        self.temperature = ambient
+        self.heater_on = True
+        self.water = saturation_density(ambient) * ambient_humidity / 100
+        self._outside_water = self.water
+        self._pulse = 0.0
+        self._random = random.Random(seed)
+
+    @property
+    def relative_humidity(self):
+        return min(100.0, 100 * self.water / saturation_density(self.temperature))
+
+    def step(self, dt):
+        """Advances the model by dt seconds."""
+        if self.temperature >= self.thermostat:
+            self.heater_on = False
+        elif self.temperature <= self.thermostat - self.hysteresis:
+            self.heater_on = True
+        target = self.max_temperature if self.heater_on else self.ambient
+        target += self._pulse
+        self.temperature += (target - self.temperature) * min(1.0, dt / self.time_constant)
+        self._pulse *= math.exp(-dt / 60)
+        self.water += (self._outside_water - self.water) * min(1.0, dt / self.ventilation)
+
+    def throw_water(self, litres=0.25):
+        """Loyly: water on the stones raises humidity and briefly the temperature."""
+        self.water += litres * 1000 / 10          # Steam spread through ~10 m3
+        self._pulse += 20 * litres / 0.25
+
+    def read(self):
+        """Returns (temperature, relative humidity) as the sensor would see them."""
+        noise = self._random.gauss(0, self.noise) if self.noise else 0.0
+        return self.temperature + noise, self.relative_humidity
+
+    def attach(self, clock, sensor, period=1.0):
+        """Steps the model on the clock and feeds its values to a virtual AHT20."""
+        def update(dt):
+            self.step(dt)
+            sensor.temperature, sensor.humidity = self.read()
+        sensor.temperature, sensor.humidity = self.read()
+        clock.call_every(period, update)
@@ -0,0 +1,50 @@
+"""
+Timeline of what the firmware shows and drives: LEDs, buzzer and
+display text, stamped with the (virtual) time they changed.
+"""
+import time
+
+from simulator import events
+
+
+def format_time(seconds):
+    """Formats seconds as H:MM:SS.s"""
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(int(minutes), 60)
+    return f"{hours}:{minutes:02}:{seconds:04.1f}"
+
+
+class Trace:
+    """Collects (time, output, value) entries for every visible change."""
+
+    def __init__(self, hardware, start=None, echo=False):
+        self.hardware = hardware
+        self.start = time.monotonic() if start is None else start
+        self.echo = echo
+        self.entries = []
+        self._text = None
+        events.listen(self._on_event)
+
+    def close(self):
+        events.unlisten(self._on_event)
+
+    def _record(self, output, value):
+        entry = (time.monotonic() - self.start, output, value)
+        self.entries.append(entry)
+        if self.echo:
+            print(f"{format_time(entry[0])}  {output}: {value}")
+
+    def _on_event(self, kind, source, value):
+        if kind == "pin":
+            self._record(source.name, "on" if value else "off")
+        elif kind == "pwm":
+            self._record(source.name, f"duty {value}")
+        elif kind == "i2c" and source == self.hardware.display.address:
+            text = self.hardware.display.text
+            if text != self._text:
+                self._text = text
+                self._record("display", f"'{text}'")
+
+    def changes(self, output):
+        """The entries of one output, e.g. trace.changes("A1")."""
+        return [entry for entry in self.entries if entry[1] == output]
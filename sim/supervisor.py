@@ -0,0 +1,16 @@
+"""Simulated `supervisor` module: ticks and a serial console nobody types into."""
+import time
+
+_TICKS_PERIOD = 1 << 29
+
+
+class _Runtime:
+    serial_connected = True
+    serial_bytes_available = 0
+
+
+runtime = _Runtime()
+
+
+def ticks_ms():
+    return int(time.monotonic() * 1000) % _TICKS_PERIOD
@@ -0,0 +1,19 @@
+"""Simulated `watchdog` module: the modes and exception of microcontroller.watchdog."""
+
+
+class WatchDogMode:
+    """What happens when the watchdog expires."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return f"watchdog.WatchDogMode.{self.name}"
+
+
+WatchDogMode.RAISE = WatchDogMode("RAISE")
+WatchDogMode.RESET = WatchDogMode("RESET")
+
+
+class WatchDogTimeout(Exception):
+    """Raised in RAISE mode when the watchdog was not fed in time."""
@@ -0,0 +1,140 @@
+"""
+Compiles the melodies in firmware/melodies.py into firmware/melodies.bin.
+
+    python tools/compile_melodies.py [melodies.py] [-o melodies.bin]
+
+Every module-level list of (note, seconds) tuples and every entry of the
+`rtttl` dict becomes one melody. The binary holds two packed uint16
+tables, frequencies in Hz (0 = rest) and durations in milliseconds, that
+melody_table.MelodyTable reads straight into array('H') on the device.
+
+Layout, little endian:
+    header  "SMEL", u16 version, u16 melody count, u16 note count
+    index   per melody: 12-byte name (NUL padded), u16 first note, u16 notes
+    tables  u16 frequencies[note count], u16 durations[note count]
+"""
+import argparse
+import os
+import runpy
+import struct
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE = os.path.join(REPO_DIR, "firmware", "melodies.py")
+OUTPUT = os.path.join(REPO_DIR, "firmware", "melodies.bin")
+
+MAGIC = b"SMEL"
+VERSION = 1
+HEADER = struct.Struct("<4sHHH")
+ENTRY = struct.Struct("<12sHH")
+NAME_LENGTH = 12
+
+SEMITONES = {"c": 0, "d": 2, "e": 4, "f": 5, "g": 7, "a": 9, "b": 11}
+
+
+def note_frequency(semitone, octave):
+    """Equal temperament, A4 = 440 Hz."""
+    return round(440 * 2 ** ((octave * 12 + semitone - 57) / 12))
+
+
+def parse_rtttl(text):
+    """Returns [(frequency, seconds)] for an RTTTL string."""
+    try:
+        _, defaults, body = text.split(":")
+    except ValueError:
+        raise ValueError(f"not an RTTTL string: {text!r}")
+    settings = {"d": 4, "o": 6, "b": 63}
+    for item in defaults.split(","):
+        if item.strip():
+            key, value = item.strip().split("=")
+            settings[key.strip().lower()] = int(value)
+    whole = 4 * 60 / settings["b"]          # Seconds per whole note
+    notes = []
+    for token in body.split(","):
+        token = token.strip().lower()
+        if not token:
+            continue
+        index = 0
+        while index < len(token) and token[index].isdigit():
+            index += 1
+        duration = int(token[:index]) if index else settings["d"]
+        letter = token[index]
+        index += 1
+        semitone = SEMITONES.get(letter)
+        if semitone is None and letter != "p":
+            raise ValueError(f"bad RTTTL note: {token!r}")
+        if index < len(token) and token[index] == "#":
+            semitone += 1
+            index += 1
+        dotted = "." in token[index:]
+        digits = token[index:].replace(".", "")
+        octave = int(digits) if digits else settings["o"]
+        seconds = whole / duration * (1.5 if dotted else 1)
+        frequency = 0 if letter == "p" else note_frequency(semitone, octave)
+        notes.append((frequency, seconds))
+    return notes
+
+
+def collect(source):
+    """Returns {name: [(frequency, seconds)]} from a melodies.py file."""
+    namespace = runpy.run_path(source)
+    table = namespace["notes"]
+    melodies = {}
+    for name, value in namespace.items():
+        if name.startswith("_") or not isinstance(value, list) or not value:
+            continue
+        if not all(isinstance(item, tuple) and len(item) == 2 and isinstance(item[0], str)
+                   for item in value):
+            continue
+        unknown = [note for note, _ in value if note not in table]
+        if unknown:
+            raise ValueError(f"{name}: unknown notes {sorted(set(unknown))}")
+        melodies[name] = [(table[note], seconds) for note, seconds in value]
+    for name, text in namespace.get("rtttl", {}).items():
+        melodies[name] = parse_rtttl(text)
+    return melodies
+
+
+def pack(melodies):
+    """Returns the melodies.bin contents."""
+    index = []
+    frequencies = []
+    durations = []
+    for name, notes in melodies.items():
+        encoded = name.encode("ascii")
+        if len(encoded) > NAME_LENGTH:
+            raise ValueError(f"melody name longer than {NAME_LENGTH} characters: {name}")
+        index.append(ENTRY.pack(encoded, len(frequencies), len(notes)))
+        for frequency, seconds in notes:
+            milliseconds = round(seconds * 1000)
+            if not 0 <= frequency <= 0xFFFF or not 0 <= milliseconds <= 0xFFFF:
+                raise ValueError(f"{name}: note out of range ({frequency} Hz, {seconds} s)")
+            frequencies.append(frequency)
+            durations.append(milliseconds)
+    count = len(frequencies)
+    return b"".join([
+        HEADER.pack(MAGIC, VERSION, len(melodies), count),
+        *index,
+        struct.pack(f"<{count}H", *frequencies),
+        struct.pack(f"<{count}H", *durations),
+    ])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("source", nargs="?", default=SOURCE, help="melody source file")
+    parser.add_argument("-o", "--output", default=OUTPUT, help="binary to write")
+    args = parser.parse_args(argv)
+
+    melodies = collect(args.source)
+    data = pack(melodies)
+    with open(args.output, "wb") as file:
+        file.write(data)
+    notes = sum(len(notes) for notes in melodies.values())
+    print(f"{os.path.relpath(args.output)}: {len(melodies)} melodies, "
+          f"{notes} notes, {len(data)} bytes")
+    for name, notes in melodies.items():
+        print(f"  {name:<12} {len(notes):>4} notes, {sum(t for _, t in notes):6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+"""
+Decodes sauna.log ring files from the device and prints per-session statistics.
+
+    python tools/saunalog.py sauna.log [more.log ...] [--csv out.csv] [--parquet out.parquet]
+
+The file is read with np.fromfile straight into a NumPy structured array,
+the record layout of firmware/session_logger.py, and the statistics come
+from the integer fields with array operations only; float columns are
+built just for the export. A year of 1 Hz raw records (31.5 million,
+315 MB) takes 1.2-1.3 s on the single-core VM this was measured on, where
+copying those 315 MB once in memory already takes 0.26 s: about five
+passes over the file, so under a second wherever memory copies at
+1.5 GB/s or more. Compressed logs (firmware/tscodec.py pages) are expanded
+into the same fields first, every page at once: the page headers say
+where the control bytes and the varints are, so nothing is walked. On
+the same VM a year of 1 Hz readings decodes in 2.9 s from a steady
+sauna and in 5.9 s from noisy readings at irregular times, against 6.1
+and 12.8 s when the control bytes were followed page by page in step,
+and 15-35 s for a Python loop over them. Files given together
+are read in order, so logs copied off the device over several weeks make
+one history.
+
+Per session (a record with the 0x80 state flag starts one):
+    zone time    time with |temperature - set-point| <= 3 (green),
+                 <= 10 (yellow) and beyond (red), like the LEDs
+    peak         highest temperature
+    heat-up      time until the temperature first came within 3 °C of the set-point
+    warnings     entries into WARNING and DANGEROUS
+
+--csv and --parquet export the decoded records (Parquet needs pyarrow).
+"""
+import argparse
+import struct
+import sys
+
+import numpy as np
+
+MAGIC = b"SLOG"
+VERSION = 1
+VERSION_PAGES = 3
+HEADER = struct.Struct("<4sBBxxI")
+HEADER_SIZE = 16
+SESSION_START = 0x80
+EMPTY_STATE = 0xFF
+
+STATE_WARNING = 1
+STATE_DANGEROUS = 2
+GREEN_ZONE = 3
+YELLOW_ZONE = 10
+
+RECORD = np.dtype([
+    ("seq", "<u2"),
+    ("dt", "<u2"),             # Tenths of a second since the previous record
+    ("temperature", "<i2"),    # °C x 10
+    ("humidity", "<u2"),       # %RH x 10
+    ("state", "u1"),
+    ("setpoint", "u1"),
+])
+
+# Compressed logs: firmware/tscodec.py pages
+PAGE_HEADER = np.dtype([
+    ("seq", "<u2"),
+    ("readings", "<u2"),
+    ("temperature", "<i2"),
+    ("humidity", "<u2"),
+    ("state", "u1"),
+    ("setpoint", "u1"),
+    ("dt", "<u2"),
+    ("controls", "u1"),
+    ("varint_bytes", "u1"),
+])
+RUN = 0x80
+CHANGED = 0x40
+SMALL_DELTAS = np.array((0, 1, -1, 0), np.int16).view(np.uint16)   # By 2-bit code, 3 = varint
+
+# What each of the 256 control bytes means, looked up instead of unpacked
+_CONTROL = np.arange(256)
+_IS_RUN = _CONTROL & RUN != 0
+COVERS = np.where(_IS_RUN, (_CONTROL & 0x7F) + 1, 1)            # Readings
+IS_CHANGED = ~_IS_RUN & (_CONTROL & CHANGED != 0)
+_CODES = [np.where(_IS_RUN, 0, _CONTROL >> shift & 3) for shift in (0, 2, 4)]
+SMALL_CHANGES = [SMALL_DELTAS[code] for code in _CODES]      # dt, temperature, humidity
+TAKES_VARINT = [code == 3 for code in _CODES]
+VARINTS = (sum(TAKES_VARINT) + IS_CHANGED * 2).astype(np.int32)
+
+
+# === Decoding ===
+
+FIELDS = ("dt", "temperature", "humidity", "state", "setpoint")
+
+
+def read_ring(path):
+    """The raw fields of one ring file, oldest reading first, as a dict of arrays."""
+    with open(path, "rb") as file:
+        magic, version, slot_size, capacity = HEADER.unpack_from(file.read(HEADER_SIZE))
+        if magic != MAGIC or (version, slot_size) != (VERSION, RECORD.itemsize) \
+                and version != VERSION_PAGES:
+            raise ValueError(f"{path}: not a session log v{VERSION} or v{VERSION_PAGES} file")
+        if version == VERSION_PAGES:
+            page = np.dtype(PAGE_HEADER.descr + [("payload", "u1", slot_size - PAGE_HEADER.itemsize)])
+            slots = np.fromfile(file, page, capacity)
+            head, count = _find_head(slots)
+            fields = decode_pages(_unroll(slots, head, count))
+        else:
+            slots = np.fromfile(file, RECORD, capacity)
+            head, count = _find_head(slots)
+            # Field by field: copying whole 10-byte records is several times slower
+            fields = {name: _unroll(slots[name], head, count) for name in FIELDS}
+    if count:
+        fields["state"][0] |= SESSION_START     # Wrapped mid-session, or the session before was lost
+    return fields
+
+
+def decode_pages(pages):
+    """
+    Expands compressed pages into raw fields, all pages at once. The
+    header counts give each page's control bytes (from the front) and
+    varint bytes (from the back), so both are cut out with one mask.
+    Each page header and control byte is then an item: its changes come
+    from lookup tables and the varints, running sums restarted at every
+    header give its values, and repeating them by the readings each
+    item covers gives the fields.
+    """
+    count = len(pages)
+    if not count:
+        return {name: np.empty(0, RECORD[name]) for name in FIELDS}
+    controls = pages["controls"].astype(np.int64)
+    varint_bytes = pages["varint_bytes"].astype(np.int64)
+    payload = pages["payload"]
+    size = payload.shape[1]
+    fits = controls + varint_bytes <= size
+    if not fits.all():
+        return decode_pages(pages[fits])       # Torn, see below
+    offsets = np.arange(size)
+    control = payload[offsets < controls[:, None]]
+    stream = payload[:, ::-1][offsets < varint_bytes[:, None]]
+    last = np.flatnonzero(stream < 0x80)       # Last byte of each varint
+    values = _varints(stream, last)
+    signed = _unzigzag(values).astype(np.uint16)
+
+    # Items in page order: a page's header, then its control bytes
+    lengths = controls + 1
+    header = np.cumsum(lengths) - lengths
+    token = np.ones(count + len(control), bool)
+    token[header] = False
+    covers = np.ones(len(token), np.int32)
+    covers[token] = COVERS[control]
+
+    varints = VARINTS[control]
+    at = np.cumsum(varints)
+
+    # A power cut while the open page was rewritten can leave its new header
+    # over older bytes. Such a page does not add up and is left out.
+    stream_ends = np.cumsum(varint_bytes)
+    whole = (np.add.reduceat(covers, header) == pages["readings"]) \
+        & (np.diff(np.append(0, at)[np.cumsum(controls)], prepend=0)
+           == np.diff(np.searchsorted(last, stream_ends), prepend=0)) \
+        & ((varint_bytes == 0) | (np.append(stream, 0)[stream_ends - 1] < 0x80))
+    if not whole.all():
+        return decode_pages(pages[whole])
+    at -= varints                              # First varint of each control byte
+    change = np.empty(len(token), np.uint16)   # Reused: fresh memory costs as much as a sum
+    fields = {}
+    for small, takes_varint, name in zip(SMALL_CHANGES, TAKES_VARINT, FIELDS[:3]):
+        delta = small[control]
+        varint = np.flatnonzero(takes_varint[control])
+        delta[varint] = signed[at[varint]]
+        at[varint] += 1
+        # 16-bit sums wrap on the way but end on the right value, as every value fits.
+        # A header's change is the jump from the end of the page before, so one sum restarts there.
+        change[token] = delta
+        change[header] = 0
+        first = pages[name].view(np.uint16)
+        jump = first.copy()
+        jump[1:] -= first[:-1] + np.add.reduceat(change, header)[:-1]
+        change[header] = jump                  # dt: a delta of delta, so one sum gives it
+        np.cumsum(change, out=change)
+        fields[name] = np.repeat(change, covers).view(RECORD[name])
+
+    # State and set-point hold from their header or changed control byte to the next
+    changed = np.flatnonzero(IS_CHANGED[control])
+    at = at[changed]
+    given = np.concatenate((header, np.flatnonzero(token)[changed]))
+    order = np.argsort(given, kind="stable")
+    states = np.concatenate((pages["state"], values[at].astype(np.uint8)))[order]
+    setpoints = np.concatenate((pages["setpoint"], values[at + 1].astype(np.uint8)))[order]
+    after = np.cumsum(covers, out=covers)      # Readings up to the end of each item
+    begins = np.append(0, after[given[order][1:] - 1])
+    held = np.diff(np.append(begins, after[-1]))
+    state = np.repeat(states & (EMPTY_STATE ^ SESSION_START), held)
+    state[np.append(0, after[header[1:] - 1])] |= pages["state"] & SESSION_START
+    fields["state"] = state
+    fields["setpoint"] = np.repeat(setpoints, held)
+    return fields
+
+
+def _varints(stream, last):
+    """
+    The values of a stream of varints, given the offset of each one's
+    last byte (the bytes below 0x80). The last byte holds the highest
+    bits, so every value starts as that byte; the few longer ones then
+    take their earlier bytes.
+    """
+    value = stream[last].astype(np.int32)
+    before = np.append(np.uint8(0), stream)    # Ends a varint before the first
+    more = np.flatnonzero(before[last] >= 0x80)
+    at = last[more] - 1
+    while len(more):
+        value[more] = value[more] << 7 | stream[at] & 0x7F
+        longer = before[at] >= 0x80
+        more = more[longer]
+        at = at[longer] - 1
+    return value
+
+
+def _unzigzag(value):
+    return (value >> 1) ^ -(value & 1)
+
+
+def _find_head(slots):
+    """
+    Same rule as SessionLogger._find_head(): the head is after the first
+    record whose successor is empty or out of sequence. Returns the head
+    and the number of records; when the slot at the head is in use the
+    ring has wrapped, every slot is a record and the oldest is at the head.
+    """
+    state = slots["state"]
+    if state[0] == EMPTY_STATE:
+        return 0, 0
+    breaks = np.flatnonzero(np.diff(slots["seq"]) != 1)     # uint16 arithmetic wraps
+    empty = np.flatnonzero(state == EMPTY_STATE)
+    if len(empty) and (not len(breaks) or empty[0] - 1 <= breaks[0]):
+        return 0, int(empty[0])
+    head = int(breaks[0]) + 1 if len(breaks) else 0
+    return head, len(slots)
+
+
+def _unroll(column, head, count):
+    if not head:
+        return column[:count]      # A view: the array is ours, not the file's
+    return np.concatenate((column[head:], column[:head]))
+
+
+def decode(fields):
+    """Columns as a dict of arrays: session, time (s), temperature, humidity, state, setpoint."""
+    state = fields["state"]
+    start_index = np.flatnonzero(state & SESSION_START)
+    lengths = np.diff(np.append(start_index, len(state)))
+    elapsed = np.cumsum(fields["dt"], dtype=np.uint32)      # A year in tenths still fits
+    elapsed -= np.repeat(elapsed[start_index], lengths)
+    return {
+        "session": np.repeat(np.arange(len(start_index), dtype=np.int32), lengths),
+        "time": elapsed * np.float32(0.1),
+        "temperature": fields["temperature"] * np.float32(0.1),
+        "humidity": fields["humidity"] * np.float32(0.1),
+        "state": state & (EMPTY_STATE ^ SESSION_START),
+        "setpoint": fields["setpoint"],
+    }
+
+
+def load(paths):
+    """Raw fields of several log files read one after the other."""
+    parts = [read_ring(path) for path in paths]
+    if len(parts) == 1:
+        return parts[0]
+    return {name: np.concatenate([part[name] for part in parts])
+            if parts else np.empty(0, RECORD[name]) for name in FIELDS}
+
+
+# === Statistics ===
+
+def session_stats(fields):
+    """
+    One row per session as a dict of arrays, from the raw fields: the
+    integer tenths are compared and summed as they are, so no float
+    column is built and no running clock is kept.
+    """
+    if not len(fields["state"]):
+        return {}
+    starts = np.flatnonzero(fields["state"] >= SESSION_START)
+    ends = np.append(starts[1:], len(fields["state"]))
+    dt = fields["dt"]
+    temperature = fields["temperature"]
+
+    # Each reading holds until the next one in its session. Float sums:
+    # NumPy adds 16-bit integers in reduceat several times slower.
+    held = np.empty(len(dt), np.float32)
+    held[:-1] = dt[1:]
+    held[ends - 1] = 0.0
+    duration = np.add.reduceat(held, starts)
+    diff = np.subtract(temperature, fields["setpoint"] * np.int16(10), dtype=np.int16)
+    np.abs(diff, out=diff)
+    green = diff <= GREEN_ZONE * 10
+    green_time = np.add.reduceat(held * green, starts)
+    red_time = np.add.reduceat(held * (diff > YELLOW_ZONE * 10), starts)
+
+    # First green reading of each session: a few thousand short scans
+    heat_up = np.full(len(starts), np.nan)
+    for i, (start, end) in enumerate(zip(starts.tolist(), ends.tolist())):
+        reached = int(green[start:end].argmax())
+        if green[start + reached]:
+            heat_up[i] = dt[start + 1:start + reached + 1].sum(dtype=np.int64) / 10
+
+    # Entries into a state: a session start or a change from the previous reading
+    state = fields["state"] & (EMPTY_STATE ^ SESSION_START)
+    changes = np.union1d(np.flatnonzero(state[1:] != state[:-1]) + 1, starts)
+    entered = state[changes]
+    entered_session = np.searchsorted(starts, changes, side="right") - 1
+    count = len(starts)
+
+    return {
+        "session": np.arange(count),
+        "records": ends - starts,
+        "duration": duration / 10,
+        "green": green_time / 10,
+        "yellow": (duration - green_time - red_time) / 10,
+        "red": red_time / 10,
+        "peak": np.maximum.reduceat(temperature, starts) / 10,
+        "heat_up": heat_up,
+        "warnings": np.bincount(entered_session[entered == STATE_WARNING], minlength=count),
+        "dangers": np.bincount(entered_session[entered == STATE_DANGEROUS], minlength=count),
+    }
+
+
+def _minutes(seconds):
+    return "   -" if np.isnan(seconds) else f"{seconds / 60:4.0f}"
+
+
+def print_stats(stats):
+    if not stats:
+        print("No records")
+        return
+    print("session records  min  green yellow   red  peak  heat-up  warn  danger")
+    for i in range(len(stats["session"])):
+        print(f"{i:7} {stats['records'][i]:7} {_minutes(stats['duration'][i])}"
+              f"  {_minutes(stats['green'][i])}   {_minutes(stats['yellow'][i])}"
+              f"  {_minutes(stats['red'][i])} {stats['peak'][i]:5.1f}     {_minutes(stats['heat_up'][i])}"
+              f"  {stats['warnings'][i]:4}  {stats['dangers'][i]:6}")
+    print("(times in minutes)")
+
+
+# === Export ===
+
+def write_csv(columns, path):
+    names = list(columns)
+    table = np.column_stack([columns[name] for name in names])
+    formats = ["%d", "%.1f", "%.1f", "%.1f", "%d", "%d"]
+    np.savetxt(path, table, fmt=formats, delimiter=",", header=",".join(names), comments="")
+
+
+def write_parquet(columns, path):
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        sys.exit("Parquet export needs pyarrow: pip install pyarrow")
+    pyarrow.parquet.write_table(pyarrow.table(columns), path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("logs", nargs="+", help="sauna.log files, oldest first")
+    parser.add_argument("--csv", help="write the decoded records to this CSV file")
+    parser.add_argument("--parquet", help="write the decoded records to this Parquet file")
+    args = parser.parse_args(argv)
+
+    fields = load(args.logs)
+    print_stats(session_stats(fields))
+    if args.csv or args.parquet:
+        columns = decode(fields)       # Float columns only for the export
+        if args.csv:
+            write_csv(columns, args.csv)
+        if args.parquet:
+            write_parquet(columns, args.parquet)
+
+
+if __name__ == "__main__":
+    main()